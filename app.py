@@ -1,98 +1,263 @@
 import os
-import threading
-import pandas as pd
-from flask import Flask, render_template, request, redirect, url_for, send_file
+import json
+from flask import Flask, Response, render_template, request, redirect, url_for, send_file, jsonify, abort
 from werkzeug.utils import secure_filename
-from graph import create_job_bot_graph, load_config, create_initial_state
-import yaml
+from graph import load_config, start_llm_warm_up
+from runs import RunQueue, QueueFull
+from results_cache import ResultsCache, paginate
+from tools.events import get_channel
+from tools import metrics
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['Result_FOLDER'] = 'results'
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-job_status = "Idle"
-job_results = {}
+config = load_config()
+web_config = config.get("web", {})
+metrics.configure(config)
+results_cache = ResultsCache()
+# Runs are only accepted once the model is loaded (see llm_ready).
+llm_client = start_llm_warm_up(config)
 
 
-def run_pipeline(resume_path):
-    global job_status, job_results
-    job_status = "Running"
-    
-    try:
-        config = load_config()
-        bot_graph = create_job_bot_graph()
-        initial_state = create_initial_state(config, resume_path)
+def llm_ready():
+    return llm_client is None or llm_client.ready()
+
+
+MODEL_LOADING = "The language model is still loading. Please try again in a minute.", 503, {"Retry-After": "30"}
+
+
+def invalidate_results(run):
+    results_cache.invalidate(run.output_dir)
+    for candidate in run.candidates:
+        results_cache.invalidate(candidate["output_dir"])
+
+
+run_queue = RunQueue(
+    runs_dir=app.config['Result_FOLDER'],
+    workers=web_config.get("max_concurrent_runs", 2),
+    max_queued=web_config.get("max_queued_runs", 10),
+    on_finish=invalidate_results,
+)
 
-        final_state = bot_graph.invoke(initial_state)
-        
-        job_results = final_state
-        job_status = "Completed"
-        print("✅ Background job completed successfully.")
-        
-    except Exception as e:
-        job_status = f"Failed: {str(e)}"
-        print(f"❌ Background job failed: {e}")
+
+def get_run_or_404(run_id):
+    run = run_queue.get(run_id)
+    if run is None:
+        abort(404)
+    return run
+
+
+def get_candidate(run):
+    """The batch candidate picked with ?candidate=N, or None for the run
+    itself."""
+    number = request.args.get("candidate", type=int)
+    if number is None:
+        return None
+    if not 0 <= number < len(run.candidates):
+        abort(404)
+    return run.candidates[number]
+
+
+def results_dir(run):
+    candidate = get_candidate(run)
+    return candidate["output_dir"] if candidate else run.output_dir
 
 
 @app.route('/')
 def index():
-    return render_template('index.html', status=job_status)
+    latest = run_queue.latest()
+    status = latest.status if latest else "Idle"
+    return render_template('index.html', status=status, run=latest, queue=run_queue.stats(), llm_ready=llm_ready())
 
 
 @app.route('/upload', methods=['POST'])
 def upload_file():
-    global job_status
-    
+    if not llm_ready():
+        return MODEL_LOADING
     if 'resume' not in request.files:
         return redirect(request.url)
-        
+
     file = request.files['resume']
-    
+
     if file.filename == '':
         return redirect(request.url)
-        
+
     if file:
-        filename = "resume.pdf"
-        file_path = os.path.join(os.getcwd(), filename)
-        file.save(file_path)
+        run = run_queue.new_run()
+        filename = f"{run.id}_{secure_filename(file.filename) or 'resume.pdf'}"
+        run.resume_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        file.save(run.resume_path)
+
+        try:
+            run_queue.submit(run)
+        except QueueFull:
+            os.remove(run.resume_path)
+            os.rmdir(run.output_dir)
+            return "Too many searches are waiting. Please try again in a few minutes.", 503, {"Retry-After": "60"}
+
+        return redirect(url_for('run_results', run_id=run.id))
+
+
+@app.route('/batch', methods=['POST'])
+def upload_batch():
+    """Several resumes for one job search: jobs are scraped once and every
+    candidate gets their own letters and PDF."""
+    if not llm_ready():
+        return MODEL_LOADING
+    files = [f for f in request.files.getlist('resumes') if f.filename]
+    if not files:
+        return redirect(url_for('index'))
+
+    run = run_queue.new_run()
+    names, paths = [], []
+    for number, file in enumerate(files, 1):
+        names.append(secure_filename(file.filename) or 'resume.pdf')
+        paths.append(os.path.join(app.config['UPLOAD_FOLDER'], f"{run.id}_{number:02d}_{names[-1]}"))
+        file.save(paths[-1])
+    run_queue.set_batch(run, paths, names)
+
+    try:
+        run_queue.submit(run)
+    except QueueFull:
+        for path in paths:
+            os.remove(path)
+        os.rmdir(run.output_dir)
+        return "Too many searches are waiting. Please try again in a few minutes.", 503, {"Retry-After": "60"}
+
+    return redirect(url_for('run_results', run_id=run.id))
+
+
+@app.route('/runs')
+def list_runs():
+    return jsonify({
+        "queue": run_queue.stats(),
+        "runs": [run.to_dict() for run in reversed(run_queue.runs())],
+    })
 
-        thread = threading.Thread(target=run_pipeline, args=(file_path,))
-        thread.start()
-        
-        return redirect(url_for('results'))
+
+@app.route('/runs/<run_id>')
+def run_results(run_id):
+    run = get_run_or_404(run_id)
+    return render_template('results.html', status=run.status, run=run)
+
+
+@app.route('/runs/<run_id>/api/results')
+def run_results_api(run_id):
+    """One page of a run's jobs with their letters.
+    ?page=1&per_page=25&fields=job_title,company,has_letter (&candidate=N
+    for a batch run's candidate)"""
+    run = get_run_or_404(run_id)
+    fields = request.args.get("fields")
+    return jsonify(paginate(
+        results_cache.get(results_dir(run)),
+        page=request.args.get("page", 1, type=int),
+        per_page=request.args.get("per_page", 25, type=int),
+        fields=fields.split(",") if fields else None,
+    ))
+
+
+@app.route('/runs/<run_id>/api/results/<int:index>')
+def run_result_api(run_id, index):
+    run = get_run_or_404(run_id)
+    records = results_cache.get(results_dir(run))["records"]
+    if index >= len(records):
+        abort(404)
+    fields = request.args.get("fields")
+    record = records[index]
+    if fields:
+        record = {field: record[field] for field in fields.split(",") if field in record}
+    return jsonify(record)
+
+
+@app.route('/runs/<run_id>/status')
+def run_status(run_id):
+    run = get_run_or_404(run_id)
+    return jsonify({**run.to_dict(), "queue": run_queue.stats()})
+
+
+@app.route('/runs/<run_id>/events')
+def run_events(run_id):
+    """Server-sent events: status, node_start/node_end, job, letter,
+    letter_failed and (with web.stream_tokens) token."""
+    get_run_or_404(run_id)
+    channel = get_channel(run_id)
+    if channel is None:
+        abort(404)
+    after = request.headers.get("Last-Event-ID", type=int) or request.args.get("after", 0, type=int)
+
+    def stream():
+        yield "retry: 3000\n\n"
+        for event in channel.listen(after=after):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            event_id, event_type, data = event
+            yield f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    return Response(stream(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+
+@app.route('/runs/<run_id>/cancel', methods=['POST'])
+def cancel_run(run_id):
+    get_run_or_404(run_id)
+    run_queue.cancel(run_id)
+    return redirect(url_for('run_results', run_id=run_id))
+
+
+@app.route('/runs/<run_id>/resume', methods=['POST'])
+def resume_run(run_id):
+    """Continue a failed or cancelled run from its last checkpoint."""
+    try:
+        run = run_queue.resume(run_id)
+    except QueueFull:
+        return "Too many searches are waiting. Please try again in a few minutes.", 503, {"Retry-After": "60"}
+    if run is None:
+        abort(404)
+    return redirect(url_for('run_results', run_id=run.id))
+
+
+@app.route('/runs/<run_id>/download_pdf')
+def download_run_pdf(run_id):
+    run = get_run_or_404(run_id)
+    candidate = get_candidate(run)
+    final_pdf = candidate["final_pdf"] if candidate else run.final_pdf
+    if final_pdf and os.path.exists(final_pdf):
+        return send_file(os.path.abspath(final_pdf), as_attachment=True)
+    return "File not found", 404
+
+
+@app.route('/ready')
+def ready():
+    """200 once the model is loaded and runs are accepted, 503 before."""
+    status = llm_client.status() if llm_client is not None else {"ready": True, "models": {}}
+    return jsonify(status), 200 if status["ready"] else 503
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
 
 
 @app.route('/results')
 def results():
-    global job_status, job_results
-    
-    jobs = []
-    cover_letters = []
-    
-    if os.path.exists("jobs.csv"):
-        try:
-            jobs_df = pd.read_csv("jobs.csv")
-            jobs = jobs_df.to_dict(orient='records')
-        except:
-            pass
-            
-    if os.path.exists("cover_letters.csv"):
-        try:
-            cl_df = pd.read_csv("cover_letters.csv")
-            cover_letters = cl_df.to_dict(orient='records')
-        except:
-            pass
-    
-    return render_template('results.html', status=job_status, jobs=jobs, cover_letters=cover_letters)
+    latest = run_queue.latest()
+    if latest is None:
+        return render_template('results.html', status="Idle", run=None)
+    return redirect(url_for('run_results', run_id=latest.id))
 
 
 @app.route('/download_pdf')
 def download_pdf():
-    if os.path.exists("final_applications.pdf"):
-        return send_file("final_applications.pdf", as_attachment=True)
-    return "File not found", 404
+    latest = run_queue.latest()
+    if latest is None:
+        return "File not found", 404
+    return redirect(url_for('download_run_pdf', run_id=latest.id))
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=5000, debug=False)
@@ -0,0 +1,101 @@
+# batch.py
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from graph import (
+    create_initial_state, generate_cover_letters_node, generate_pdf_node, ollama_client, parse_resume_node,
+    search_jobs_node, with_progress,
+)
+from tools.events import publish
+from tools.records import JOB_FIELDS, write_records
+
+
+def candidate_dirs(names, output_dir="."):
+    """One folder per candidate under output_dir/candidates, named after
+    their resume's file name and numbered so that two resumes with the
+    same name do not share one."""
+    dirs = []
+    for number, name in enumerate(names, 1):
+        stem = os.path.splitext(name)[0]
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", stem).strip("_")[:40] or "resume"
+        dirs.append(os.path.join(output_dir, "candidates", f"{number:02d}_{slug}"))
+    return dirs
+
+
+def run_batch(config, resume_paths, output_dir=".", bypass_cache=False, run_id=None,
+              should_stop=None, on_candidate=None, names=None):
+    """
+    Write applications for several candidates from one scrape. The jobs
+    are searched once while every resume is parsed, then all candidates'
+    letters go through one pool of llm.concurrency workers per Ollama
+    endpoint, and each candidate gets a PDF in its own folder (see
+    candidate_dirs).
+
+    names label the candidates (the resumes' file names by default). run_id
+    only names the web run to publish progress to; the nodes run without
+    it, from what is in their state. Returns the shared jobs and one dict
+    per candidate with its folder, letters, PDF and error.
+    """
+    should_stop = should_stop or (lambda: False)
+    os.makedirs(output_dir, exist_ok=True)
+    base = create_initial_state(config, output_dir=output_dir)
+    base.update(run_id=None, bypass_cache=bypass_cache)
+    names = names or [os.path.basename(path) for path in resume_paths]
+    candidates = [
+        {"name": name, "resume_path": path, "output_dir": directory, "letters": 0, "final_pdf": "", "error": ""}
+        for name, path, directory in zip(names, resume_paths, candidate_dirs(names, output_dir))
+    ]
+
+    publish(run_id, "node_start", node="search_jobs")
+    with ThreadPoolExecutor(max_workers=1 + len(resume_paths)) as branches:
+        search = branches.submit(with_progress("search_jobs", search_jobs_node), base)
+        parse = with_progress("parse_resume", parse_resume_node)
+        parsed = [branches.submit(parse, {**base, "resume_path": path}) for path in resume_paths]
+        found = search.result()
+        parsed = [future.result() for future in parsed]
+
+    jobs = found.get("jobs") or []
+    if not jobs or should_stop():
+        return {"jobs": jobs, "candidates": candidates, "error": found.get("error", "")}
+    print(f"📦 {len(jobs)} jobs for {len(resume_paths)} candidates")
+
+    def write_applications(candidate, resume_result, pool):
+        if resume_result.get("error"):
+            candidate["error"] = resume_result["error"]
+        else:
+            os.makedirs(candidate["output_dir"], exist_ok=True)
+            # Each candidate folder is laid out like a single run's, so the
+            # results page can show it; ranking rewrites jobs.csv with scores.
+            write_records(os.path.join(candidate["output_dir"], "jobs.csv"), jobs, JOB_FIELDS)
+            state = {**base, "jobs": jobs, "resume_data": resume_result["resume_data"],
+                     "output_dir": candidate["output_dir"]}
+            letters = with_progress("generate_cover_letters", partial(generate_cover_letters_node, pool=pool))(state)
+            candidate["letters"] = len(letters.get("cover_letters") or [])
+            candidate["error"] = letters.get("error", "")
+            if candidate["letters"] and not should_stop():
+                result = with_progress("generate_pdf", generate_pdf_node)({**state, **letters})
+                candidate["final_pdf"] = result.get("final_pdf", "")
+                candidate["error"] = result.get("error", "")
+        print(f"👤 {candidate['name']}: {candidate['letters']} letters {candidate['error']}".rstrip())
+        publish(
+            run_id, "candidate", index=candidates.index(candidate), name=candidate["name"],
+            letters=candidate["letters"], has_pdf=bool(candidate["final_pdf"]), error=candidate["error"],
+        )
+        if on_candidate:
+            on_candidate(candidate)
+
+    # Letters of every candidate share one pool, so the LLM sees the same
+    # number of requests at a time as in a single run. Each candidate is
+    # driven from its own thread outside that pool.
+    publish(run_id, "node_start", node="generate_cover_letters")
+    concurrency = max(1, base.get("llm_concurrency", 1)) * len(ollama_client(config).endpoints)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        with ThreadPoolExecutor(max_workers=len(candidates)) as drivers:
+            list(drivers.map(write_applications, candidates, parsed, [pool] * len(candidates)))
+
+    failed = [c for c in candidates if c["error"]]
+    error = "" if len(failed) < len(candidates) else failed[0]["error"]
+    return {"jobs": jobs, "candidates": candidates, "error": error}
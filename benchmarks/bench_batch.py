@@ -0,0 +1,112 @@
+# benchmarks/bench_batch.py
+#
+# Writes applications for N candidates twice against the fixture site (HTTP
+# backend) and the fake Ollama server: once as N separate graph runs, each
+# scraping the same searches again, and once as a single batch
+# (batch.run_batch) that scrapes them once. Reports wall time, requests to
+# the site and to the LLM, and letters written. No Chrome needed.
+#
+#   python -m benchmarks.bench_batch --candidates 4 --site-latency 0.2
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import yaml
+
+from benchmarks.fake_ollama import start_server
+from benchmarks.fixture_site import start_site
+from benchmarks.resumes import make_resumes
+
+
+def batch_config(site_url, args):
+    return {
+        "job_search": {
+            "keywords": [f"Data Analyst {i}" for i in range(args.searches)],
+            "locations": ["Dubai"],
+            "max_jobs_per_search": args.jobs,
+        },
+        "llm": {"model": "mistral", "concurrency": args.concurrency},
+        "llm_cache": {"enabled": False},
+        "job_index": {"enabled": False},
+        "checkpoints": {"enabled": False},
+        "dedup": {"enabled": False},
+        "pdf": {"cache_dir": "cache/pdf", "per_job_dir": "applications"},
+        "scraping": {
+            "backend": "http",
+            "base_url": site_url,
+            "min_delay_seconds": args.min_delay,
+            "max_delay_seconds": args.min_delay,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=4)
+    parser.add_argument("--searches", type=int, default=2)
+    parser.add_argument("--jobs", type=int, default=10, help="jobs per search")
+    parser.add_argument("--concurrency", type=int, default=4, help="llm.concurrency")
+    parser.add_argument("--site-latency", type=float, default=0.2, help="fixture seconds per response")
+    parser.add_argument("--min-delay", type=float, default=0.05, help="seconds between site requests")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake Ollama seconds per request")
+    parser.add_argument("--tokens-per-sec", type=float, default=400.0)
+    args = parser.parse_args()
+
+    ollama, ollama_url = start_server(latency=args.latency, tokens_per_sec=args.tokens_per_sec)
+    server, site_url = start_site(jobs_per_search=args.jobs, latency=args.site_latency)
+    site = server.site
+
+    workdir = tempfile.mkdtemp(prefix="bench_batch_")
+    config = batch_config(site_url, args)
+    config_path = os.path.join(workdir, "config.yaml")
+    with open(config_path, "w") as f:
+        yaml.safe_dump(config, f)
+    resume = make_resumes(os.path.join(workdir, "resumes"), pages=(1,), formats=("pdf",))["pdf-1p"]
+    resumes = []
+    for number in range(args.candidates):
+        resumes.append(os.path.join(workdir, "resumes", f"candidate_{number}.pdf"))
+        shutil.copyfile(resume, resumes[-1])
+
+    import graph
+    from batch import run_batch
+    graph.OLLAMA_HOST = ollama_url
+    graph.CONFIG_PATH = config_path
+
+    def separate():
+        letters = 0
+        for number, path in enumerate(resumes):
+            output_dir = os.path.join(workdir, "separate", str(number))
+            os.makedirs(output_dir, exist_ok=True)
+            final = graph.create_job_bot_graph().invoke(graph.create_initial_state(config, path, output_dir))
+            letters += len(final.get("cover_letters") or [])
+        return letters
+
+    def batch():
+        result = run_batch(config, resumes, os.path.join(workdir, "batch"))
+        return sum(candidate["letters"] for candidate in result["candidates"])
+
+    rows = []
+    for label, run in (("separate runs", separate), ("batch", batch)):
+        with site.lock:
+            site.requests = 0
+        with ollama.fake.lock:
+            ollama.fake.stats["requests"] = 0
+        start = time.perf_counter()
+        letters = run()
+        rows.append((label, time.perf_counter() - start, site.requests, ollama.fake.stats["requests"], letters))
+
+    print(f"\n{'mode':<14} {'seconds':>9} {'site req':>9} {'llm req':>8} {'letters':>8}")
+    for label, seconds, site_requests, llm_requests, letters in rows:
+        print(f"{label:<14} {seconds:>9.2f} {site_requests:>9} {llm_requests:>8} {letters:>8}")
+    print(f"\n{args.candidates} candidates; batch speedup {rows[0][1] / rows[1][1]:.1f}x")
+
+    ollama.shutdown()
+    server.shutdown()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
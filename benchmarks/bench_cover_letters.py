@@ -0,0 +1,71 @@
+# benchmarks/bench_cover_letters.py
+#
+# Times generate_cover_letters_node against the fake Ollama server at
+# increasing concurrency levels.
+#
+#   python -m benchmarks.bench_cover_letters --jobs 40 --latency 0.5
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.fake_ollama import start_server, RESUME_JSON
+
+
+def make_jobs(n):
+    return [
+        {
+            "job_title": f"Data Analyst {i}",
+            "company": f"Company {i}",
+            "job_link": f"https://www.linkedin.com/jobs/view/{1000 + i}/",
+            "job_description": "Analyse data with Python and SQL.",
+            "date_applied": "2024-01-01",
+            "status": "pending",
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0)
+    parser.add_argument("--levels", default="1,2,4,8,16")
+    args = parser.parse_args()
+
+    server, url = start_server(latency=args.latency, tokens_per_sec=args.tokens_per_sec)
+    os.environ["OLLAMA_HOST"] = url
+
+    import graph
+    graph.OLLAMA_HOST = url
+
+    jobs = make_jobs(args.jobs)
+    state = {
+        "jobs": jobs,
+        "resume_data": {"structured_resume": RESUME_JSON},
+        "llm_model": "mistral",
+        # Every level must pay for real calls, not read the previous level's letters.
+        "bypass_cache": True,
+    }
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_letters_"))
+    baseline = None
+    print(f"{'concurrency':>12} {'seconds':>9} {'letters':>8} {'speedup':>8}")
+    for level in [int(x) for x in args.levels.split(",")]:
+        state["llm_concurrency"] = level
+        start = time.perf_counter()
+        result = graph.generate_cover_letters_node(state)
+        elapsed = time.perf_counter() - start
+
+        letters = result["cover_letters"]
+        assert [l.job_link for l in letters] == [j["job_link"] for j in jobs], "order changed"
+        baseline = baseline or elapsed
+        print(f"{level:>12} {elapsed:>9.2f} {len(letters):>8} {baseline / elapsed:>7.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
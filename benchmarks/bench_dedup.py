@@ -0,0 +1,92 @@
+# benchmarks/bench_dedup.py
+#
+# Builds postings where about a fifth are lightly edited reposts of earlier
+# ones, then finds them with the MinHash/LSH index and with an exact
+# all-pairs Jaccard comparison. Reports time, precision and recall.
+#
+#   python -m benchmarks.bench_dedup --sizes 500,2000,10000 --exact-up-to 2000
+
+import argparse
+import random
+import time
+
+from benchmarks.fixture_site import COMPANIES, SKILL_LINES
+from tools.near_duplicates import NearDuplicateIndex, posting_text
+
+WORDS = (
+    "team data product customer growth platform remote hybrid senior junior "
+    "reporting cloud pipeline stakeholder analytics insight quality strategy "
+    "python sql spark airflow dbt looker tableau excel finance marketing"
+).split()
+
+
+def make_postings(n, repost_share=0.2, seed=0):
+    """Return (jobs, original_of) where original_of maps a repost's link to
+    the link of the posting it copies."""
+    rng = random.Random(seed)
+    jobs, original_of = [], {}
+    for i in range(n):
+        link = f"https://www.linkedin.com/jobs/view/{i}/"
+        if jobs and rng.random() < repost_share:
+            source = rng.choice([j for j in jobs[-200:] if j["job_link"] not in original_of] or jobs[-1:])
+            words = source["job_description"].split()
+            # A repost: same role, a couple of words changed.
+            for _ in range(2):
+                words[rng.randrange(len(words))] = rng.choice(WORDS)
+            jobs.append({**source, "job_link": link, "job_description": " ".join(words)})
+            original_of[link] = source["job_link"]
+            continue
+        lines = [rng.choice(SKILL_LINES)] + [" ".join(rng.choices(WORDS, k=12)) for _ in range(6)]
+        jobs.append({
+            "job_title": f"Data Analyst {rng.randrange(1000)}",
+            "company": rng.choice(COMPANIES),
+            "job_link": link,
+            "job_description": " ".join(lines),
+        })
+    return jobs, original_of
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def exact_duplicates(jobs, threshold):
+    sets = [set(zip(*[posting_text(j).lower().split()[k:] for k in range(3)])) for j in jobs]
+    found = set()
+    for i in range(len(jobs)):
+        for k in range(i):
+            if jobs[k]["job_link"] not in found and jaccard(sets[i], sets[k]) >= threshold:
+                found.add(jobs[i]["job_link"])
+                break
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="500,2000,10000")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--exact-up-to", type=int, default=2000, help="skip the O(n^2) baseline above this")
+    args = parser.parse_args()
+
+    print(f"{'postings':>9} {'reposts':>8} {'lsh s':>8} {'found':>6} {'precision':>10} {'recall':>7} {'exact s':>8}")
+    for n in [int(x) for x in args.sizes.split(",")]:
+        jobs, original_of = make_postings(n)
+        index = NearDuplicateIndex(threshold=args.threshold)
+        start = time.perf_counter()
+        found = {job["job_link"] for job in jobs if index.add_job(job) is not None}
+        lsh_seconds = time.perf_counter() - start
+
+        true_found = len(found & set(original_of))
+        precision = true_found / len(found) if found else 1.0
+        recall = true_found / len(original_of) if original_of else 1.0
+
+        exact = "-"
+        if n <= args.exact_up_to:
+            start = time.perf_counter()
+            exact_duplicates(jobs, args.threshold)
+            exact = f"{time.perf_counter() - start:.2f}"
+        print(f"{n:>9} {len(original_of):>8} {lsh_seconds:>8.2f} {len(found):>6} {precision:>10.3f} {recall:>7.3f} {exact:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/bench_endpoints.py
+#
+# Writes letters with generate_cover_letters_node spread over 1, 2, 4...
+# fake Ollama servers, each its own process on its own port and limited to
+# --parallel requests at a time like one GPU box. llm.concurrency is per
+# endpoint, so every endpoint added brings its own workers. With --kill-after
+# one server is killed that many seconds into the largest run: its letters
+# must be retried on the others and none may go missing.
+#
+#   python -m benchmarks.bench_endpoints --endpoints 1,2,4 --jobs 32 --kill-after 2
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+import yaml
+
+from benchmarks.bench_cover_letters import make_jobs
+from benchmarks.fake_ollama import RESUME_JSON
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_fake_ollama(args):
+    port = free_port()
+    process = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.fake_ollama", "--port", str(port),
+        "--latency", str(args.latency), "--tokens-per-sec", str(args.tokens_per_sec),
+        "--parallel", str(args.parallel),
+    ], cwd=ROOT, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(url, timeout=1)
+            return process, url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError(f"fake Ollama on {url} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--endpoints", default="1,2,4")
+    parser.add_argument("--jobs", type=int, default=32)
+    parser.add_argument("--parallel", type=int, default=2, help="requests each server runs at once")
+    parser.add_argument("--latency", type=float, default=0.3, help="fake Ollama seconds per request")
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0)
+    parser.add_argument("--kill-after", type=float, default=0.0,
+                        help="kill one server this many seconds into the largest run (0 = never)")
+    args = parser.parse_args()
+
+    import graph
+
+    workdir = tempfile.mkdtemp(prefix="bench_endpoints_")
+    graph.CONFIG_PATH = os.path.join(workdir, "config.yaml")
+    with open(graph.CONFIG_PATH, "w") as f:
+        yaml.safe_dump({
+            "llm": {"model": "mistral", "concurrency": args.parallel, "health_check_seconds": 1},
+            "llm_cache": {"enabled": False},
+            "job_index": {"enabled": False},
+            "checkpoints": {"enabled": False},
+        }, f)
+    os.chdir(workdir)
+
+    jobs = make_jobs(args.jobs)
+    counts = [int(x) for x in args.endpoints.split(",")]
+    baseline = None
+    print(f"{'endpoints':>10} {'seconds':>9} {'letters':>8} {'letters/s':>10} {'speedup':>8}  requests per endpoint")
+    for count in counts:
+        servers = [start_fake_ollama(args) for _ in range(count)]
+        graph.OLLAMA_HOST = ",".join(url for _, url in servers)
+        state = {
+            "jobs": jobs,
+            "resume_data": {"structured_resume": RESUME_JSON},
+            "llm_model": "mistral",
+            "llm_concurrency": args.parallel,
+            "output_dir": workdir,
+        }
+        if args.kill_after and count == counts[-1] and count > 1:
+            threading.Timer(args.kill_after, servers[0][0].kill).start()
+
+        start = time.perf_counter()
+        result = graph.generate_cover_letters_node(state)
+        elapsed = time.perf_counter() - start
+
+        letters = result.get("cover_letters") or []
+        baseline = baseline or elapsed
+        status = graph.ollama_client({}).status()
+        spread = " ".join(
+            f"{e['requests']}{'(ejected)' if e['ejected'] else ''}" for e in status["endpoints"]
+        )
+        print(f"{count:>10} {elapsed:>9.2f} {len(letters):>8} {len(letters) / elapsed:>10.2f} "
+              f"{baseline / elapsed:>7.1f}x  {spread}")
+        graph.ollama_client({}).close()
+        for process, _ in servers:
+            process.kill()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_http_scraper.py
+#
+# Scrapes the fixture site's public job pages with the HTTP backend at
+# several description concurrencies. Each row reports wall time, requests,
+# and the smallest gap between two requests seen by the server, which stays
+# at scraping.min_delay_seconds (less network jitter) however many requests
+# are in flight. No Chrome needed.
+#
+#   python -m benchmarks.bench_http_scraper --jobs 50 --latency 0.2 --concurrency 1,4,8
+
+import argparse
+import resource
+import time
+
+from benchmarks.fixture_site import start_site
+
+
+def http_config(url, concurrency, min_delay, max_delay):
+    return {
+        "scraping": {
+            "backend": "http",
+            "base_url": url,
+            "http_concurrency": concurrency,
+            "min_delay_seconds": min_delay,
+            "max_delay_seconds": max_delay,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--searches", type=int, default=2)
+    parser.add_argument("--jobs", type=int, default=50, help="jobs per search (pages of 25)")
+    parser.add_argument("--latency", type=float, default=0.2, help="fixture seconds per response")
+    parser.add_argument("--concurrency", default="1,4,8")
+    parser.add_argument("--min-delay", type=float, default=0.05)
+    parser.add_argument("--max-delay", type=float, default=0.1)
+    args = parser.parse_args()
+
+    server, url = start_site(jobs_per_search=args.jobs, latency=args.latency)
+    site = server.site
+
+    from tools.linkedin_scraper import scrape_jobs
+
+    print(f"{'concurrency':>11} {'seconds':>9} {'jobs':>6} {'requests':>9} {'min gap s':>10} {'speedup':>8}")
+    baseline = None
+    for concurrency in [int(x) for x in args.concurrency.split(",")]:
+        config = http_config(url, concurrency, args.min_delay, args.max_delay)
+        with site.lock:
+            site.requests = 0
+            site.request_times = []
+        start = time.perf_counter()
+        found = sum(len(scrape_jobs(f"Keyword {i}", "Dubai", args.jobs, config)) for i in range(args.searches))
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        times = sorted(site.request_times)
+        gap = min((b - a for a, b in zip(times, times[1:])), default=0.0)
+        print(f"{concurrency:>11} {elapsed:>9.2f} {found:>6} {site.requests:>9} {gap:>10.3f} {baseline / elapsed:>7.1f}x")
+
+    # ru_maxrss is in kilobytes on Linux.
+    print(f"\nPeak RSS of this process: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
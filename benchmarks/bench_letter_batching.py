@@ -0,0 +1,91 @@
+# benchmarks/bench_letter_batching.py
+#
+# Writes letters for the same jobs one per request and in batches, against
+# a fake Ollama that charges for prompt processing (prefill) as well as
+# generation and, like a single-GPU server, handles one request at a time.
+# Reports requests, prompt tokens processed and wall time per batch size.
+#
+#   python -m benchmarks.bench_letter_batching --jobs 16 --batch-sizes 1,2,4,8
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.fake_ollama import start_server, RESUME_JSON
+from benchmarks.bench_cover_letters import make_jobs
+
+
+def long_resume(entries):
+    # Real structured resumes run to several hundred tokens.
+    data = json.loads(RESUME_JSON)
+    data["experience"] = [
+        f"Data Analyst at Company {i}: built reporting pipelines in Python and SQL, "
+        f"owned dashboards for sales and finance, mentored two junior analysts."
+        for i in range(entries)
+    ]
+    return json.dumps(data)
+
+
+def stats(url):
+    with urllib.request.urlopen(f"{url}/_stats") as response:
+        return json.load(response)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=16)
+    parser.add_argument("--batch-sizes", default="1,2,4,8")
+    parser.add_argument("--resume-entries", type=int, default=20, help="experience entries in the resume")
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--tokens-per-sec", type=float, default=400.0)
+    parser.add_argument("--prompt-tokens-per-sec", type=float, default=500.0)
+    parser.add_argument("--parallel", type=int, default=1, help="requests the fake server runs at once")
+    args = parser.parse_args()
+
+    server, url = start_server(
+        latency=args.latency,
+        tokens_per_sec=args.tokens_per_sec,
+        prompt_tokens_per_sec=args.prompt_tokens_per_sec,
+        parallel=args.parallel,
+    )
+
+    import graph
+    graph.OLLAMA_HOST = url
+
+    state = {
+        "jobs": make_jobs(args.jobs),
+        "resume_data": {"structured_resume": long_resume(args.resume_entries)},
+        "llm_model": "mistral",
+        "llm_concurrency": args.parallel,
+        "bypass_cache": True,
+    }
+    os.chdir(tempfile.mkdtemp(prefix="bench_batching_"))
+
+    print(f"{'batch':>6} {'requests':>9} {'prompt tok':>11} {'seconds':>8} {'letters':>8} {'tokens saved':>13} {'speedup':>8}")
+    baseline = None
+    for size in [int(x) for x in args.batch_sizes.split(",")]:
+        state["llm_batch_size"] = size
+        before = stats(url)
+        start = time.perf_counter()
+        result = graph.generate_cover_letters_node(state)
+        elapsed = time.perf_counter() - start
+        after = stats(url)
+
+        requests = after["requests"] - before["requests"]
+        prompt_tokens = after["prompt_tokens"] - before["prompt_tokens"]
+        if baseline is None:
+            baseline = (prompt_tokens, elapsed)
+        saved = 1 - prompt_tokens / baseline[0]
+        print(
+            f"{size:>6} {requests:>9} {prompt_tokens:>11} {elapsed:>8.2f} "
+            f"{len(result.get('cover_letters', [])):>8} {saved:>12.0%} {baseline[1] / elapsed:>7.2f}x"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
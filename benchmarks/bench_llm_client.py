@@ -0,0 +1,89 @@
+# benchmarks/bench_llm_client.py
+#
+# Runs the graph a few times in a row against the fixture site (HTTP
+# backend) and a fake Ollama server that takes --load-seconds to load a
+# model on its first request, like a cold Ollama in Docker. Two modes:
+#   cold     - llm.warm_up off: the first run waits for the model load
+#   warm-up  - the model is loaded when the process starts (as app.py and
+#              main.py do), --idle seconds before the first run comes in
+# Reports each run's wall time and the connections it opened to Ollama;
+# the shared client keeps them open between nodes and runs. --idle 0 is the
+# CLI case, where the load overlaps scraping. No Chrome needed.
+#
+#   python -m benchmarks.bench_llm_client --load-seconds 5 --idle 5 --runs 3
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import yaml
+
+from benchmarks.bench_batch import batch_config
+from benchmarks.fake_ollama import start_server
+from benchmarks.fixture_site import start_site
+from benchmarks.resumes import make_resumes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--load-seconds", type=float, default=5.0, help="fake Ollama model load time")
+    parser.add_argument("--idle", type=float, default=5.0, help="seconds from start-up to the first run")
+    parser.add_argument("--searches", type=int, default=1)
+    parser.add_argument("--jobs", type=int, default=8, help="jobs per search")
+    parser.add_argument("--concurrency", type=int, default=4, help="llm.concurrency")
+    parser.add_argument("--site-latency", type=float, default=0.05, help="fixture seconds per response")
+    parser.add_argument("--min-delay", type=float, default=0.05, help="seconds between site requests")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake Ollama seconds per request")
+    parser.add_argument("--tokens-per-sec", type=float, default=400.0)
+    args = parser.parse_args()
+
+    import graph
+
+    workdir = tempfile.mkdtemp(prefix="bench_llm_client_")
+    resume = make_resumes(os.path.join(workdir, "resumes"), pages=(1,), formats=("pdf",))["pdf-1p"]
+
+    rows = []
+    for mode in ("cold", "warm-up"):
+        # A fresh server (nothing loaded) per mode; its new URL also gets
+        # a fresh client.
+        ollama, ollama_url = start_server(
+            latency=args.latency, tokens_per_sec=args.tokens_per_sec, load_seconds=args.load_seconds,
+        )
+        server, site_url = start_site(jobs_per_search=args.jobs, latency=args.site_latency)
+        graph.OLLAMA_HOST = ollama_url
+
+        config = batch_config(site_url, args)
+        config["llm"]["warm_up"] = mode == "warm-up"
+        graph.CONFIG_PATH = os.path.join(workdir, f"{mode}.yaml")
+        with open(graph.CONFIG_PATH, "w") as f:
+            yaml.safe_dump(config, f)
+        graph.start_llm_warm_up(config)
+        time.sleep(args.idle)
+
+        for number in range(1, args.runs + 1):
+            output_dir = os.path.join(workdir, mode, str(number))
+            os.makedirs(output_dir, exist_ok=True)
+            connections = ollama.fake.stats["connections"]
+            start = time.perf_counter()
+            final = graph.create_job_bot_graph().invoke(graph.create_initial_state(config, resume, output_dir))
+            rows.append((
+                mode, number, time.perf_counter() - start,
+                ollama.fake.stats["connections"] - connections, len(final.get("cover_letters") or []),
+            ))
+
+        ollama.shutdown()
+        server.shutdown()
+
+    print(f"\n{'mode':<8} {'run':>4} {'seconds':>9} {'new conns':>10} {'letters':>8}")
+    for mode, number, seconds, connections, letters in rows:
+        print(f"{mode:<8} {number:>4} {seconds:>9.2f} {connections:>10} {letters:>8}")
+    print(f"\nModel load {args.load_seconds:.1f}s; first run came {args.idle:.1f}s after start-up")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_pdf.py
+#
+# Renders 10, 100 and 1000 synthetic applications three times each: cold
+# (empty render cache), warm (nothing changed) and with one letter edited.
+# Reports wall time and peak RSS of this process and of the render workers.
+#
+#   python -m benchmarks.bench_pdf --sizes 10,100,1000
+
+import argparse
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+from benchmarks.fake_ollama import LETTER_TEXT
+from tools.records import Application
+
+
+def peak_rss_mb():
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux.
+    return own / 1024, children / 1024
+
+
+def make_records(n):
+    return [
+        Application(
+            job_title=f"Data Analyst {i}",
+            company=f"Company {i}",
+            cover_letter=f"{LETTER_TEXT}\n\nReference {i}",
+            date_applied="2024-01-01",
+        )
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    from tools.pdf_generator import render_applications
+
+    workdir = tempfile.mkdtemp(prefix="bench_pdf_")
+    print(f"{'letters':>8} {'run':>12} {'seconds':>9} {'rss MB':>8} {'worker MB':>10}")
+    for size in [int(x) for x in args.sizes.split(",")]:
+        cache_dir = os.path.join(workdir, f"cache_{size}")
+        output = os.path.join(workdir, f"out_{size}.pdf")
+        records = make_records(size)
+
+        for label in ("cold", "warm", "one changed"):
+            if label == "one changed":
+                records[size // 2].cover_letter += "\nP.S. Updated."
+            start = time.perf_counter()
+            render_applications(records, output, cache_dir=cache_dir, workers=args.workers)
+            elapsed = time.perf_counter() - start
+            own, children = peak_rss_mb()
+            print(f"{size:>8} {label:>12} {elapsed:>9.2f} {own:>8.0f} {children:>10.0f}")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
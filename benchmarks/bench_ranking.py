@@ -0,0 +1,61 @@
+# benchmarks/bench_ranking.py
+#
+# Scores synthetic job descriptions against a resume's skills with the
+# NumPy TF-IDF ranker and reports how long ranking takes and how many LLM
+# calls a top-K or threshold cut saves, against the fake Ollama latency.
+#
+#   python -m benchmarks.bench_ranking --jobs 100,1000,10000 --top-k 20
+
+import argparse
+import random
+import time
+
+from benchmarks.fake_ollama import RESUME_JSON
+from benchmarks.fixture_site import SKILL_LINES
+
+OTHER_LINES = [
+    "Manage a team of nurses across two hospital wards.",
+    "Negotiate supplier contracts and track procurement budgets.",
+    "Plan store layouts and train retail staff on customer service.",
+    "Maintain HVAC systems and respond to facility work orders.",
+]
+
+
+def make_jobs(n, seed=0):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(n):
+        # About a third of the postings are relevant to a data resume.
+        lines = SKILL_LINES if i % 3 == 0 else OTHER_LINES
+        jobs.append({
+            "job_title": f"Job {i}",
+            "company": f"Company {i}",
+            "job_link": f"https://www.linkedin.com/jobs/view/{i}/",
+            "job_description": " ".join(rng.choice(lines) for _ in range(6)),
+        })
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", default="100,1000,10000")
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--letter-seconds", type=float, default=20.0, help="time of one real letter")
+    args = parser.parse_args()
+
+    from tools.job_ranker import rank_jobs
+
+    print(f"{'jobs':>7} {'rank ms':>9} {'top-k kept':>11} {'threshold kept':>15} {'LLM time saved (top-k)':>23}")
+    for n in [int(x) for x in args.jobs.split(",")]:
+        jobs = make_jobs(n)
+        start = time.perf_counter()
+        _, top = rank_jobs(jobs, RESUME_JSON, top_k=args.top_k)
+        elapsed = time.perf_counter() - start
+        _, above = rank_jobs(jobs, RESUME_JSON, threshold=args.threshold)
+        saved = (n - len(top)) * args.letter_seconds
+        print(f"{n:>7} {elapsed * 1000:>9.1f} {len(top):>11} {len(above):>15} {saved / 60:>19.0f} min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/bench_rate_limit.py
+#
+# Simulated scrape workers, each making requests that take --latency
+# seconds (a page load or card click), paced two ways:
+#   sleep    - the old human_delay: every worker sleeps min..max seconds
+#              after each request, whatever the other workers do
+#   limiter  - the shared token bucket (tools.rate_limiter)
+# Reports wall time, the average request rate reached and the most
+# requests started within any min_delay window, which the limit keeps at
+# `burst`. No network or browser needed.
+#
+#   python -m benchmarks.bench_rate_limit --requests 40 --workers 1,4 --latency 1.0
+
+import argparse
+import random
+import threading
+import time
+
+from tools.rate_limiter import RateLimiter, limiter_settings
+
+
+def run_workers(workers, requests, latency, pace):
+    starts = []
+    lock = threading.Lock()
+    remaining = [requests]
+
+    def worker():
+        while True:
+            with lock:
+                if not remaining[0]:
+                    return
+                remaining[0] -= 1
+            pace("before")
+            with lock:
+                starts.append(time.monotonic())
+            time.sleep(latency)
+            pace("after")
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    begin = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.monotonic() - begin, sorted(starts)
+
+
+def busiest_window(starts, window):
+    most, first = 0, 0
+    for last, start in enumerate(starts):
+        while start - starts[first] >= window:
+            first += 1
+        most = max(most, last - first + 1)
+    return most
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--workers", default="1,4")
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds per request")
+    parser.add_argument("--min-delay", type=float, default=0.5)
+    parser.add_argument("--max-delay", type=float, default=1.0)
+    parser.add_argument("--burst", type=int, default=1)
+    args = parser.parse_args()
+
+    config = {"scraping": {"min_delay_seconds": args.min_delay, "max_delay_seconds": args.max_delay, "burst": args.burst}}
+    interval, burst, jitter = limiter_settings(config)
+    window = interval * (1 - jitter)
+    allowed = 60 / interval
+    print(f"Allowed: {allowed:.0f} requests/min (one per {interval:.2f}s), {args.latency:.2f}s per request\n")
+    print(f"{'pacing':>8} {'workers':>8} {'seconds':>9} {'req/min':>8} {'max/window':>11} {'queued s':>9}")
+
+    for workers in [int(x) for x in args.workers.split(",")]:
+        def sleep_after(when):
+            if when == "after":
+                time.sleep(random.uniform(args.min_delay, args.max_delay))
+
+        limiter = RateLimiter(interval, burst, jitter)
+
+        def take_slot(when):
+            if when == "before":
+                limiter.acquire()
+
+        for label, pace in (("sleep", sleep_after), ("limiter", take_slot)):
+            seconds, starts = run_workers(workers, args.requests, args.latency, pace)
+            rate = 60 * (len(starts) - 1) / (starts[-1] - starts[0]) if len(starts) > 1 else 0.0
+            queued = limiter.stats()["waited_seconds"] if label == "limiter" else 0.0
+            print(f"{label:>8} {workers:>8} {seconds:>9.2f} {rate:>8.0f} "
+                  f"{busiest_window(starts, window):>11} {queued:>9.2f}")
+
+    print(f"\nmax/window: most requests started within {window:.2f}s; the limit allows {burst}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/bench_resume_parser.py
+#
+# Extracts text from synthetic 1-, 10- and 50-page PDF resumes: page by page
+# in one process, across a process pool, and from the parse cache. Also
+# checks that every mode returns the same text.
+#
+#   python -m benchmarks.bench_resume_parser --pages 1,10,50 --workers 4
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.resumes import write_pdf
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", default="1,10,50")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per CPU")
+    args = parser.parse_args()
+
+    from tools.resume_parser import parse_resume
+
+    workdir = tempfile.mkdtemp(prefix="bench_resume_")
+    print(f"CPUs: {os.cpu_count()}")
+    print(f"{'pages':>6} {'sequential':>11} {'pool':>9} {'cached':>9} {'pool x':>7} {'cache x':>8} {'same text':>10}")
+    for pages in [int(x) for x in args.pages.split(",")]:
+        path = write_pdf(os.path.join(workdir, f"resume_{pages}p.pdf"), pages)
+        cache_dir = os.path.join(workdir, f"cache_{pages}")
+
+        sequential, plain = timed(lambda: parse_resume(path, workers=1))
+        pooled, pooled_result = timed(lambda: parse_resume(path, workers=args.workers, parallel_min_pages=2))
+        parse_resume(path, cache_dir=cache_dir, workers=1)
+        cached, cached_result = timed(lambda: parse_resume(path, cache_dir=cache_dir))
+
+        same = plain == pooled_result == cached_result
+        print(
+            f"{pages:>6} {sequential:>10.3f}s {pooled:>8.3f}s {cached:>8.4f}s "
+            f"{sequential / pooled:>6.1f}x {sequential / cached:>7.0f}x {str(same):>10}"
+        )
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
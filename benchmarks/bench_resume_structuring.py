@@ -0,0 +1,80 @@
+# benchmarks/bench_resume_structuring.py
+#
+# Structures synthetic resumes of increasing length with parse_resume_node
+# against the fake Ollama server, in one request (resume_parser.chunk_chars
+# 0) and split by section into requests of at most --chunk-chars, sent
+# --parallel at a time. The fake server spends time on every prompt token
+# (--prompt-tokens-per-sec) and serves --parallel requests at once.
+# Reports wall time, requests and the largest prompt sent, which must stay
+# within the model's context window.
+#
+#   python -m benchmarks.bench_resume_structuring --pages 1,5,20 --chunk-chars 6000
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import yaml
+
+from benchmarks.fake_ollama import start_server
+from benchmarks.resumes import write_pdf
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", default="1,5,20")
+    parser.add_argument("--chunk-chars", type=int, default=6000)
+    parser.add_argument("--parallel", type=int, default=4, help="llm.concurrency and fake server slots")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake Ollama seconds per request")
+    parser.add_argument("--prompt-tokens-per-sec", type=float, default=1000.0)
+    parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+    args = parser.parse_args()
+
+    server, url = start_server(
+        latency=args.latency, tokens_per_sec=args.tokens_per_sec,
+        prompt_tokens_per_sec=args.prompt_tokens_per_sec, parallel=args.parallel,
+    )
+    import graph
+    graph.OLLAMA_HOST = url
+
+    workdir = tempfile.mkdtemp(prefix="bench_structuring_")
+
+    def structure(path, mode, chunk_chars):
+        graph.CONFIG_PATH = os.path.join(workdir, f"{mode}.yaml")
+        with open(graph.CONFIG_PATH, "w") as f:
+            yaml.safe_dump({
+                "llm": {"model": "mistral", "concurrency": args.parallel, "warm_up": False},
+                "llm_cache": {"enabled": False},
+                "resume_parser": {"cache_dir": os.path.join(workdir, "cache"), "chunk_chars": chunk_chars},
+            }, f)
+        with server.fake.lock:
+            server.fake.stats.update(requests=0, max_prompt_tokens=0)
+        start = time.perf_counter()
+        result = graph.parse_resume_node({
+            "resume_path": path, "llm_model": "mistral", "llm_concurrency": args.parallel,
+        })
+        return time.perf_counter() - start, result["resume_data"]
+
+    paths = {pages: write_pdf(os.path.join(workdir, f"resume_{pages}p.pdf"), pages)
+             for pages in [int(x) for x in args.pages.split(",")]}
+    # The first call pays for imports and the text extraction cache; keep it out of the table.
+    for path in paths.values():
+        structure(path, "single", 0)
+
+    print(f"{'pages':>6} {'chars':>7} {'mode':>8} {'seconds':>9} {'requests':>9} {'max prompt tok':>15} {'skills':>7}")
+    for pages, path in paths.items():
+        for mode, chunk_chars in (("single", 0), ("chunked", args.chunk_chars)):
+            elapsed, resume = structure(path, mode, chunk_chars)
+            skills = len(json.loads(resume["structured_resume"]).get("skills", []))
+            print(f"{pages:>6} {resume['text_length']:>7} {mode:>8} {elapsed:>9.2f} "
+                  f"{server.fake.stats['requests']:>9} {server.fake.stats['max_prompt_tokens']:>15} {skills:>7}")
+
+    server.shutdown()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
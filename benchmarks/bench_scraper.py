@@ -0,0 +1,72 @@
+# benchmarks/bench_scraper.py
+#
+# Scrapes the local fixture site with headless Chrome, first with a fresh
+# browser per search (the old behaviour) reading cards one WebDriver call at
+# a time and then with bulk extraction, then through a BrowserPool of
+# increasing size. Needs Chrome and chromedriver on PATH.
+#
+#   python -m benchmarks.bench_scraper --searches 8 --jobs 10 --pool-sizes 1,2,4
+
+import argparse
+import os
+import tempfile
+import time
+
+import yaml
+
+from benchmarks.fixture_site import start_site
+
+
+def fixture_config(url, pool_size, bulk=True):
+    return {
+        "selenium": {"headless": True, "pool_size": pool_size},
+        "scraping": {
+            "base_url": url,
+            "min_delay_seconds": 0.1,
+            "max_delay_seconds": 0.2,
+            "login_wait_seconds": 0,
+            "anti_detection": True,
+            "bulk_extract": bulk,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--searches", type=int, default=8)
+    parser.add_argument("--jobs", type=int, default=10)
+    parser.add_argument("--pool-sizes", default="1,2,4")
+    args = parser.parse_args()
+
+    server, url = start_site(jobs_per_search=max(args.jobs, 25))
+
+    import graph
+    from tools.linkedin_scraper import scrape_jobs
+
+    keywords = [f"Keyword {i}" for i in range(args.searches)]
+    os.chdir(tempfile.mkdtemp(prefix="bench_scraper_"))
+
+    print(f"{'mode':>22} {'seconds':>9} {'jobs':>6} {'speedup':>8}")
+    baseline = None
+    for label, bulk in (("per-card", False), ("bulk", True)):
+        start = time.perf_counter()
+        found = sum(len(scrape_jobs(k, "Dubai", args.jobs, fixture_config(url, 1, bulk))) for k in keywords)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{label + ', own browser':>22} {elapsed:>9.2f} {found:>6} {baseline / elapsed:>7.1f}x")
+
+    for size in [int(x) for x in args.pool_sizes.split(",")]:
+        with open("config.yaml", "w") as f:
+            yaml.safe_dump(fixture_config(url, size), f)
+        graph.CONFIG_PATH = os.path.abspath("config.yaml")
+        state = {"keywords": keywords, "locations": ["Dubai"], "max_jobs": args.jobs, "jobs": []}
+        start = time.perf_counter()
+        result = graph.search_jobs_node(state)
+        elapsed = time.perf_counter() - start
+        print(f"{f'pool of {size}':>22} {elapsed:>9.2f} {len(result.get('jobs', [])):>6} {baseline / elapsed:>7.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
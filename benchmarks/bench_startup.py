@@ -0,0 +1,89 @@
+# benchmarks/bench_startup.py
+#
+# Cold-start cost of the entry points and tools. Each module is imported in
+# a fresh interpreter --repeat times and the median wall time is reported,
+# plus one `python -X importtime` run broken down by top-level package, so
+# a heavy library that slipped back into a module-level import is easy to
+# spot. `import app` must stay within --budget seconds; the script exits
+# with status 1 when it does not.
+#
+#   python -m benchmarks.bench_startup --repeat 5
+#   python -m benchmarks.bench_startup --modules app --budget 0.8
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "app", "main", "graph", "runs", "results_cache",
+    "tools.linkedin_scraper", "tools.http_scraper", "tools.browser_pool",
+    "tools.resume_parser", "tools.pdf_generator", "tools.checkpoints",
+    "tools.job_ranker", "tools.near_duplicates",
+]
+
+# Seconds for `python -c "import app"`, interpreter start included. It took
+# about 4.4 s while graph.py imported every tool and library up front, and
+# about 0.6 s after they were made lazy.
+APP_IMPORT_BUDGET = 1.0
+
+
+def run_import(module, workdir, importtime=False):
+    """Wall seconds of importing module in a new interpreter, and stderr."""
+    env = {**os.environ, "PYTHONPATH": ROOT, "CONFIG_PATH": os.path.join(ROOT, "config", "config.yaml")}
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", f"import {module}"]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return seconds, result.stderr
+
+
+def packages_by_time(importtime_output, top=4):
+    """Self import time in ms summed per top-level package, heaviest first."""
+    totals = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + int(self_us) / 1000
+    return sorted(totals.items(), key=lambda item: -item[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modules", default=",".join(MODULES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=APP_IMPORT_BUDGET, help="seconds allowed for `import app`")
+    args = parser.parse_args()
+
+    # app creates its upload and results folders in the working directory.
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    baseline, _ = run_import("sys", workdir)
+
+    print(f"{'module':<24} {'median s':>9} {'min s':>7}  heaviest packages (ms)")
+    medians = {}
+    for module in args.modules.split(","):
+        times = [run_import(module, workdir)[0] for _ in range(args.repeat)]
+        _, importtime = run_import(module, workdir, importtime=True)
+        medians[module] = statistics.median(times)
+        heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in packages_by_time(importtime))
+        print(f"{module:<24} {medians[module]:>9.3f} {min(times):>7.3f}  {heaviest}")
+    print(f"\nInterpreter start alone: {baseline:.3f} s")
+
+    if "app" in medians:
+        verdict = "within" if medians["app"] <= args.budget else "OVER"
+        print(f"import app: {medians['app']:.3f} s, {verdict} the {args.budget:.2f} s budget")
+        if medians["app"] > args.budget:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# benchmarks/fake_ollama.py
+#
+# A stand-in for the Ollama HTTP API that answers /api/chat and /api/generate
+# with canned text after a configurable delay, and /api/embed with
+# bag-of-words vectors, so the pipeline can be timed without a GPU or a
+# downloaded model. With --load-seconds the first request for each model
+# waits that long, like Ollama loading it into memory.
+#
+#   python -m benchmarks.fake_ollama --port 11434 --latency 0.5 --tokens-per-sec 40
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LETTER_TEXT = (
+    "Dear Hiring Manager,\n\n"
+    "I am writing to express my interest in this position. My background in "
+    "data analysis, Python and machine learning matches the requirements of the "
+    "role, and I have delivered dashboards and models used by business teams.\n\n"
+    "I would welcome the opportunity to discuss how I can contribute to your team.\n\n"
+    "Sincerely,\nJane Doe"
+)
+
+RESUME_JSON = json.dumps({
+    "name": "Jane Doe",
+    "education": ["BSc Computer Science"],
+    "skills": ["Python", "SQL", "Pandas", "Machine Learning", "Tableau"],
+    "projects": ["Sales forecasting dashboard"],
+    "experience": ["Data Analyst Intern, Acme Corp"],
+    "summary": "Analyst with hands-on experience in Python and SQL."
+})
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+class FakeOllama:
+    def __init__(self, latency=0.5, tokens_per_sec=40.0, prompt_tokens_per_sec=0.0,
+                 parallel=0, load_seconds=0.0):
+        self.latency = latency
+        self.load_seconds = load_seconds
+        self.loaded = set()
+        self.load_lock = threading.Lock()
+        self.tokens_per_sec = tokens_per_sec
+        self.prompt_tokens_per_sec = prompt_tokens_per_sec
+        self.slots = threading.Semaphore(parallel) if parallel else None
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "connections": 0, "loads": 0,
+                      "max_prompt_tokens": 0}
+
+    def ensure_loaded(self, model):
+        # Requests for a model that is still loading wait for the load.
+        with self.load_lock:
+            if model in self.loaded:
+                return
+            time.sleep(self.load_seconds)
+            self.loaded.add(model)
+            with self.lock:
+                self.stats["loads"] += 1
+
+    def reply_for(self, body):
+        # Batched letter requests get one letter per "[job N]" line, other
+        # structured-output requests (resume parsing) get JSON back,
+        # everything else gets a cover letter.
+        text = self.prompt_text(body)
+        schema = body.get("format")
+        if isinstance(schema, dict) and "letters" in schema.get("properties", {}):
+            numbers = re.findall(r"\[job (\d+)\]", text)
+            return json.dumps({"letters": [{"job": int(n), "cover_letter": LETTER_TEXT} for n in numbers]})
+        if schema or "JSON" in text:
+            return RESUME_JSON
+        return LETTER_TEXT
+
+    def prompt_text(self, body):
+        if "messages" in body:
+            return "".join(m.get("content", "") for m in body["messages"])
+        return (body.get("system") or "") + (body.get("prompt") or "")
+
+    def record(self, prompt_tokens, completion_tokens):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["max_prompt_tokens"] = max(self.stats["max_prompt_tokens"], prompt_tokens)
+            self.stats["completion_tokens"] += completion_tokens
+
+
+def make_handler(fake):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            with fake.lock:
+                fake.stats["connections"] += 1
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_json(self, payload, status=200):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def read_body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self):
+            if self.path == "/api/tags":
+                self.send_json({"models": [{"name": "mistral:latest", "model": "mistral:latest"}]})
+            elif self.path == "/api/ps":
+                self.send_json({"models": []})
+            elif self.path == "/_stats":
+                with fake.lock:
+                    self.send_json(dict(fake.stats))
+            elif self.path == "/":
+                self.send_json({"status": "Ollama is running"})
+            else:
+                self.send_json({"error": "not found"}, status=404)
+
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_POST(self):
+            body = self.read_body()
+            if self.path in ("/api/chat", "/api/generate"):
+                self.generate(body, chat=self.path == "/api/chat")
+            elif self.path in ("/api/embed", "/api/embeddings"):
+                self.embed(body)
+            elif self.path == "/api/show":
+                self.send_json({"modelfile": "", "parameters": "", "details": {}})
+            elif self.path == "/api/pull":
+                self.send_json({"status": "success"})
+            else:
+                self.send_json({"error": "not found"}, status=404)
+
+        def embed(self, body):
+            # Bag-of-words hashed into a small vector: texts that share words
+            # get similar embeddings, which is all ranking needs.
+            texts = body.get("input") or body.get("prompt") or ""
+            if isinstance(texts, str):
+                texts = [texts]
+            fake.ensure_loaded(body.get("model", "nomic-embed-text"))
+            time.sleep(fake.latency / 10)
+            vectors = []
+            for text in texts:
+                vector = [0.0] * 64
+                for word in text.lower().split():
+                    vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1.0
+                vectors.append(vector)
+            fake.record(sum(estimate_tokens(t) for t in texts), 0)
+            self.send_json({"model": body.get("model", "nomic-embed-text"), "embeddings": vectors})
+
+        def generate(self, body, chat):
+            if fake.slots:
+                fake.slots.acquire()
+            try:
+                self._generate(body, chat)
+            finally:
+                if fake.slots:
+                    fake.slots.release()
+
+        def _generate(self, body, chat):
+            model = body.get("model", "mistral")
+            prompt_tokens = estimate_tokens(fake.prompt_text(body))
+            fake.ensure_loaded(model)
+
+            # An empty prompt is how Ollama clients ask for a model (pre)load.
+            if not body.get("messages") and not body.get("prompt"):
+                self.send_json({"model": model, "response": "", "done": True, "done_reason": "load"})
+                return
+
+            delay = fake.latency
+            if fake.prompt_tokens_per_sec:
+                delay += prompt_tokens / fake.prompt_tokens_per_sec
+            time.sleep(delay)
+
+            text = fake.reply_for(body)
+            tokens = [text[i:i + 4] for i in range(0, len(text), 4)]
+            per_token = 1.0 / fake.tokens_per_sec if fake.tokens_per_sec else 0.0
+            fake.record(prompt_tokens, len(tokens))
+
+            def chunk(piece, done):
+                payload = {"model": model, "created_at": "2024-01-01T00:00:00Z", "done": done}
+                if chat:
+                    payload["message"] = {"role": "assistant", "content": piece}
+                else:
+                    payload["response"] = piece
+                if done:
+                    payload.update({
+                        "done_reason": "stop",
+                        "prompt_eval_count": prompt_tokens,
+                        "eval_count": len(tokens),
+                        "total_duration": int((delay + per_token * len(tokens)) * 1e9),
+                        "eval_duration": int(per_token * len(tokens) * 1e9),
+                    })
+                return payload
+
+            if body.get("stream", True) is False:
+                time.sleep(per_token * len(tokens))
+                self.send_json(chunk(text, True))
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for piece in tokens:
+                time.sleep(per_token)
+                self.write_chunk(chunk(piece, False))
+            self.write_chunk(chunk("", True))
+            self.wfile.write(b"0\r\n\r\n")
+
+        def write_chunk(self, payload):
+            data = (json.dumps(payload) + "\n").encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def start_server(port=0, **kwargs):
+    """Start a fake Ollama server in a daemon thread and return (server, url)."""
+    fake = FakeOllama(**kwargs)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(fake))
+    server.daemon_threads = True
+    server.fake = fake
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Ollama server for benchmarks")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds before the first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=40.0)
+    parser.add_argument("--prompt-tokens-per-sec", type=float, default=0.0)
+    parser.add_argument("--parallel", type=int, default=0, help="max concurrent requests (0 = unlimited)")
+    parser.add_argument("--load-seconds", type=float, default=0.0, help="first request per model waits this long")
+    args = parser.parse_args()
+
+    server, url = start_server(
+        args.port,
+        latency=args.latency,
+        tokens_per_sec=args.tokens_per_sec,
+        prompt_tokens_per_sec=args.prompt_tokens_per_sec,
+        parallel=args.parallel,
+        load_seconds=args.load_seconds,
+    )
+    print(f"Fake Ollama listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,237 @@
+# benchmarks/fixture_site.py
+#
+# A local site shaped like the LinkedIn pages scrape_jobs reads: a home page,
+# a job search page with clickable job cards and a description panel, a
+# detail page per job, and the public (logged-out) job list and posting
+# endpoints read by the HTTP backend. Point the scraper at it with
+# scraping.base_url.
+#
+#   python -m benchmarks.fixture_site --port 8800 --jobs-per-search 25
+
+import argparse
+import hashlib
+import html
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PAGE_SIZE = 25
+
+COMPANIES = [
+    "Acme Analytics", "Globex", "Initech", "Umbrella Data", "Stark Industries",
+    "Wayne Enterprises", "Hooli", "Pied Piper", "Soylent Labs", "Vandelay Imports",
+]
+
+SKILL_LINES = [
+    "Build dashboards in Tableau and Power BI for business stakeholders.",
+    "Write production SQL and Python (pandas, NumPy) for data pipelines.",
+    "Train and evaluate machine learning models with scikit-learn.",
+    "Deploy LLM-based services and evaluate prompt quality.",
+    "Gather requirements and translate them into analytical reports.",
+    "Run A/B tests and communicate statistical results.",
+]
+
+
+def job_id_for(keyword, location, index):
+    # Related keywords ("Data Analyst", "Junior Data Analyst") share most of
+    # their postings, like on the real site.
+    base = keyword.lower().replace("junior ", "")
+    digest = hashlib.md5(f"{base}|{location}".encode()).hexdigest()
+    offset = 2 if "junior" in keyword.lower() else 0
+    return 100000 + int(digest[:6], 16) % 800000 + index + offset
+
+
+def job_for(job_id, keyword="Data Analyst"):
+    company = COMPANIES[job_id % len(COMPANIES)]
+    lines = [SKILL_LINES[(job_id + i) % len(SKILL_LINES)] for i in range(4)]
+    return {
+        "id": job_id,
+        "title": f"{keyword} ({job_id % 97})",
+        "company": company,
+        "description": f"{company} is hiring.\n" + "\n".join(lines),
+    }
+
+
+def page(title, body):
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>{html.escape(title)}</title></head>
+<body>{body}</body></html>"""
+
+
+def search_page(keyword, location, start, total):
+    cards = []
+    for index in range(start, min(start + PAGE_SIZE, total)):
+        job = job_for(job_id_for(keyword, location, index), keyword)
+        cards.append(f"""
+<div class="job-card-container" data-job-id="{job['id']}"
+     data-description="{html.escape(job['description'])}">
+  <a class="job-card-list__title" href="/jobs/view/{job['id']}/">{html.escape(job['title'])}
+  <span class="visually-hidden">with verification</span></a>
+  <h4><a href="/company/{job['id'] % len(COMPANIES)}/">{html.escape(job['company'])}</a></h4>
+</div>""")
+
+    next_link = ""
+    if start + PAGE_SIZE < total:
+        next_link = (
+            f'<button class="jobs-search-pagination__button--next" '
+            f'data-start="{start + PAGE_SIZE}">Next</button>'
+        )
+
+    body = f"""
+<h1>{html.escape(keyword)} jobs in {html.escape(location)}</h1>
+<div class="jobs-search-results-list">{''.join(cards)}</div>
+<div class="jobs-search-pagination">{next_link}</div>
+<div id="job-details"></div>
+<script>
+document.querySelectorAll('div.job-card-container').forEach(function (card) {{
+  card.addEventListener('click', function (event) {{
+    event.preventDefault();
+    var panel = document.getElementById('job-details');
+    panel.innerHTML = '';
+    setTimeout(function () {{
+      var desc = document.createElement('div');
+      desc.className = 'jobs-description-content__text';
+      desc.textContent = card.dataset.description;
+      panel.appendChild(desc);
+    }}, 50);
+  }});
+}});
+document.querySelectorAll('.jobs-search-pagination__button--next').forEach(function (button) {{
+  button.addEventListener('click', function () {{
+    var url = new URL(window.location.href);
+    url.searchParams.set('start', button.dataset.start);
+    window.location.href = url.toString();
+  }});
+}});
+</script>"""
+    return page(f"{keyword} jobs", body)
+
+
+def detail_page(job):
+    body = f"""
+<h1 class="top-card-layout__title">{html.escape(job['title'])}</h1>
+<a class="topcard__org-name-link" href="/company/">{html.escape(job['company'])}</a>
+<div class="show-more-less-html__markup">{html.escape(job['description'])}</div>"""
+    return page(job["title"], body)
+
+
+def guest_search_fragment(keyword, location, start, total):
+    # /jobs-guest/jobs/api/seeMoreJobPostings/search returns bare <li> cards
+    # and an empty body past the last one.
+    cards = []
+    for index in range(start, min(start + PAGE_SIZE, total)):
+        job = job_for(job_id_for(keyword, location, index), keyword)
+        slug = job["title"].lower().replace(" ", "-").replace("(", "").replace(")", "")
+        cards.append(f"""
+<li>
+  <div class="base-card base-search-card job-search-card" data-entity-urn="urn:li:jobPosting:{job['id']}">
+    <a class="base-card__full-link" href="/jobs/view/{slug}-{job['id']}?refId=abc&amp;trackingId=xyz">
+      <span class="sr-only">{html.escape(job['title'])}</span>
+    </a>
+    <div class="base-search-card__info">
+      <h3 class="base-search-card__title">{html.escape(job['title'])}</h3>
+      <h4 class="base-search-card__subtitle">
+        <a class="hidden-nested-link" href="/company/{job['id'] % len(COMPANIES)}/">{html.escape(job['company'])}</a>
+      </h4>
+    </div>
+  </div>
+</li>""")
+    return "".join(cards)
+
+
+def guest_posting_fragment(job):
+    lines = "<br>".join(html.escape(line) for line in job["description"].split("\n"))
+    return f"""
+<section class="top-card-layout">
+  <h2 class="top-card-layout__title">{html.escape(job['title'])}</h2>
+  <a class="topcard__org-name-link" href="/company/">{html.escape(job['company'])}</a>
+</section>
+<div class="show-more-less-html__markup">{lines}</div>"""
+
+
+def make_handler(site):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_html(self, text, status=200):
+            data = text.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            with site.lock:
+                site.requests += 1
+                site.request_times.append(time.monotonic())
+            if site.latency:
+                time.sleep(site.latency)
+
+            if url.path == "/":
+                self.send_html(page("LinkedIn", "<h1>Welcome back</h1>"))
+            elif url.path == "/jobs/search/":
+                self.send_html(search_page(
+                    query.get("keywords", "Data Analyst"),
+                    query.get("location", "Dubai"),
+                    int(query.get("start", 0)),
+                    site.jobs_per_search,
+                ))
+            elif url.path == "/jobs-guest/jobs/api/seeMoreJobPostings/search":
+                self.send_html(guest_search_fragment(
+                    query.get("keywords", "Data Analyst"),
+                    query.get("location", "Dubai"),
+                    int(query.get("start", 0)),
+                    site.jobs_per_search,
+                ))
+            elif url.path.startswith("/jobs-guest/jobs/api/jobPosting/"):
+                job_id = int(url.path.strip("/").split("/")[-1])
+                self.send_html(guest_posting_fragment(job_for(job_id)))
+            elif url.path.startswith("/jobs/view/"):
+                job_id = int(url.path.strip("/").split("/")[-1].split("-")[-1])
+                self.send_html(detail_page(job_for(job_id)))
+            else:
+                self.send_html(page("Not found", "<h1>404</h1>"), status=404)
+
+    return Handler
+
+
+class FixtureSite:
+    def __init__(self, jobs_per_search=25, latency=0.0):
+        self.jobs_per_search = jobs_per_search
+        self.latency = latency
+        self.requests = 0
+        self.request_times = []
+        self.lock = threading.Lock()
+
+
+def start_site(port=0, **kwargs):
+    """Start the fixture site in a daemon thread and return (server, url)."""
+    site = FixtureSite(**kwargs)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(site))
+    server.daemon_threads = True
+    server.site = site
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LinkedIn-shaped fixture site for benchmarks")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--jobs-per-search", type=int, default=25)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+
+    server, url = start_site(args.port, jobs_per_search=args.jobs_per_search, latency=args.latency)
+    print(f"Fixture site listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
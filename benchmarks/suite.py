@@ -0,0 +1,280 @@
+# benchmarks/suite.py
+#
+# Offline end-to-end benchmark. Starts the fake Ollama server and the fixture
+# site, writes synthetic resumes, then times each graph node on its own and
+# the whole graph. For every scenario it reports wall time, throughput, peak
+# Python memory and per-call latency percentiles (from tools.metrics). All
+# results go to a JSON file; pass a previous file as --baseline to see what
+# changed.
+#
+#   python -m benchmarks.suite --jobs 20 --repeat 3 --output before.json
+#   python -m benchmarks.suite --jobs 20 --repeat 3 --output after.json --baseline before.json
+#
+# search_jobs and the full graph need Chrome; without it they are reported
+# as skipped. search_jobs[http] uses the HTTP backend and always runs.
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import yaml
+
+from benchmarks.fake_ollama import start_server, RESUME_JSON, LETTER_TEXT
+from benchmarks.fixture_site import start_site
+from benchmarks.bench_cover_letters import make_jobs
+from benchmarks.resumes import make_resumes
+from tools.records import Application
+
+
+def suite_config(site_url, args):
+    return {
+        "job_search": {
+            "keywords": [f"Data Analyst {i}" for i in range(args.searches)],
+            "locations": ["Dubai"],
+            "max_jobs_per_search": args.jobs,
+        },
+        "llm": {"model": "mistral", "concurrency": args.concurrency},
+        # Every run pays for real work: no response cache, no job index.
+        "llm_cache": {"enabled": False},
+        "job_index": {"enabled": False},
+        "pdf": {"cache_dir": "cache/pdf", "per_job_dir": "applications"},
+        "metrics": {"enabled": True},
+        "selenium": {"headless": True, "pool_size": args.pool_size},
+        "scraping": {
+            "base_url": site_url,
+            "min_delay_seconds": 0,
+            "max_delay_seconds": 0,
+            "login_wait_seconds": 0,
+        },
+    }
+
+
+def percentiles(values):
+    values = sorted(values)
+    if not values:
+        return {}
+
+    def at(q):
+        return round(values[min(len(values) - 1, int(q * len(values)))], 6)
+
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 6),
+        "p50": at(0.50),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "max": round(values[-1], 6),
+    }
+
+
+def browser_problem(config):
+    """None if Chrome starts against the fixture site, else the reason."""
+    try:
+        from tools.linkedin_scraper import start_browser
+        browser = start_browser(config)
+    except Exception as e:
+        return f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+    if browser is None:
+        return "login check failed"
+    browser.quit()
+    return None
+
+
+def measure(run, repeat, workdir):
+    """
+    Call run() once as a warm-up with tracemalloc on (for peak memory), then
+    `repeat` more times for timings. run() returns (items, error) and is
+    called inside a fresh working directory each time.
+    """
+    from tools import metrics
+
+    runs, samples, items = [], {}, 0
+    peak_mb = 0.0
+    for attempt in range(repeat + 1):
+        os.chdir(tempfile.mkdtemp(dir=workdir))
+        warmup = attempt == 0
+        if warmup:
+            tracemalloc.start()
+        trace = metrics.start_trace()
+        start = time.perf_counter()
+        try:
+            items, error = run()
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.stop_trace(trace)
+            if warmup:
+                peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+                tracemalloc.stop()
+        if error:
+            return {"error": error}
+        if warmup:
+            continue
+
+        runs.append(elapsed)
+        for event in trace.events:
+            if metrics.METRICS[event["metric"]][0] != "histogram":
+                continue
+            labels = {k: v for k, v in event.items() if k not in ("metric", "value", "thread", "start")}
+            key = event["metric"] + "".join(f"[{v}]" for _, v in sorted(labels.items()))
+            samples.setdefault(key, []).append(event["value"])
+
+    seconds = percentiles(runs)
+    return {
+        "items": items,
+        "seconds": seconds,
+        "throughput_per_sec": round(items / seconds["mean"], 3) if seconds["mean"] else None,
+        "peak_python_mb": round(peak_mb, 2),
+        "latency": {key: percentiles(values) for key, values in sorted(samples.items())},
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def print_report(results, baseline=None):
+    base = (baseline or {}).get("scenarios", {})
+    print(f"\n{'scenario':<28} {'items':>6} {'mean s':>9} {'p95 s':>9} {'items/s':>9} {'peak MB':>8} {'vs base':>8}")
+    for name, result in results["scenarios"].items():
+        if "seconds" not in result:
+            print(f"{name:<28} {result.get('skipped') or result.get('error')}")
+            continue
+        change = ""
+        old = base.get(name, {}).get("seconds", {}).get("mean")
+        if old:
+            change = f"{(result['seconds']['mean'] - old) / old * 100:+.0f}%"
+        print(
+            f"{name:<28} {result['items']:>6} {result['seconds']['mean']:>9.3f} "
+            f"{result['seconds']['p95']:>9.3f} {result['throughput_per_sec'] or 0:>9.2f} "
+            f"{result['peak_python_mb']:>8.1f} {change:>8}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark suite")
+    parser.add_argument("--jobs", type=int, default=10, help="jobs per search")
+    parser.add_argument("--searches", type=int, default=2)
+    parser.add_argument("--letters", type=int, default=20, help="jobs for the letter and PDF nodes")
+    parser.add_argument("--resume-pages", default="1,5,20")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--pool-size", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake Ollama seconds per request")
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0)
+    parser.add_argument("--site-latency", type=float, default=0.0)
+    parser.add_argument("--skip-browser", action="store_true", help="skip search_jobs and the full graph")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    server, ollama_url = start_server(latency=args.latency, tokens_per_sec=args.tokens_per_sec)
+    site, site_url = start_site(jobs_per_search=max(args.jobs, 1), latency=args.site_latency)
+
+    workdir = tempfile.mkdtemp(prefix="bench_suite_")
+    config = suite_config(site_url, args)
+    config_path = os.path.join(workdir, "config.yaml")
+    with open(config_path, "w") as f:
+        yaml.safe_dump(config, f)
+    http_config_path = os.path.join(workdir, "config_http.yaml")
+    with open(http_config_path, "w") as f:
+        yaml.safe_dump({**config, "scraping": {**config["scraping"], "backend": "http"}}, f)
+
+    import graph
+    from tools import metrics
+    graph.OLLAMA_HOST = ollama_url
+    graph.CONFIG_PATH = config_path
+    metrics.enable()
+
+    resumes = make_resumes(os.path.join(workdir, "resumes"), [int(x) for x in args.resume_pages.split(",")])
+    resume = next(iter(resumes.values()))
+    jobs = make_jobs(args.letters)
+
+    def state(**extra):
+        # Without a run_id a node works on its own from what is in state
+        # instead of waiting for the other branches' job stream.
+        return {**graph.create_initial_state(config, resume, "."), "bypass_cache": True, "run_id": None, **extra}
+
+    def run_resume(path):
+        def run():
+            result = graph.parse_resume_node(state(resume_path=path))
+            return 1, result.get("error")
+        return run
+
+    def run_search():
+        result = graph.search_jobs_node(state())
+        return len(result.get("jobs", [])), result.get("error")
+
+    def run_search_http():
+        graph.CONFIG_PATH = http_config_path
+        try:
+            return run_search()
+        finally:
+            graph.CONFIG_PATH = config_path
+
+    def run_letters():
+        result = graph.generate_cover_letters_node(
+            state(jobs=jobs, resume_data={"structured_resume": RESUME_JSON})
+        )
+        return len(result.get("cover_letters", [])), result.get("error")
+
+    def run_pdf():
+        result = graph.generate_pdf_node(state(cover_letters=[Application.from_job(job, LETTER_TEXT) for job in jobs]))
+        return len(jobs), result.get("error")
+
+    def run_graph():
+        final = graph.create_job_bot_graph().invoke(graph.create_initial_state(config, resume, "."))
+        return len(final.get("cover_letters") or []), final.get("error")
+
+    scenarios = [(f"parse_resume[{name}]", run_resume(path)) for name, path in resumes.items()]
+    scenarios += [("generate_cover_letters", run_letters), ("generate_pdf", run_pdf), ("search_jobs[http]", run_search_http)]
+    browser_scenarios = [("search_jobs", run_search), ("graph", run_graph)]
+
+    problem = "--skip-browser" if args.skip_browser else browser_problem(config)
+    results = {
+        "commit": git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "scenarios": {},
+    }
+    for name, run in scenarios + browser_scenarios:
+        if problem and (name, run) in browser_scenarios:
+            results["scenarios"][name] = {"skipped": f"no browser ({problem})"}
+            continue
+        print(f"⏱️ {name}")
+        results["scenarios"][name] = measure(run, args.repeat, workdir)
+
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux.
+    results["peak_rss_mb"] = {"self": round(own / 1024, 1), "children": round(children / 1024, 1)}
+
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print_report(results, baseline)
+    print(f"\nResults written to {output}")
+    server.shutdown()
+    site.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,98 @@
+import copy
+import json
 import operator
 import yaml
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
 from typing import Annotated, List, TypedDict, Union
 
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_ollama import ChatOllama
-from langgraph.graph import END, StateGraph, START
+# LangChain, LangGraph and the numpy-based tools are imported in the
+# functions that use them, so importing this module (the web app does on
+# startup) does not load them.
 
-from tools.linkedin_scraper import scrape_jobs
+from tools.linkedin_scraper import iter_jobs
+from tools.browser_pool import BrowserPool
 from tools.resume_parser import parse_resume
-from tools.pdf_generator import generate_pdf
-import pandas as pd
+from tools.resume_sections import RESUME_KEYS, chunk_resume, load_resume_json, merge_resumes, unfence
+from tools.pdf_generator import render_applications
+from tools.llm_cache import get_llm_cache, make_key
+from tools.job_index import get_job_index
+from tools.job_stream import get_job_stream, drop_job_stream
+from tools.checkpoints import get_run_progress
+from tools.rate_limiter import get_rate_limiter
+from tools.llm_client import get_llm_client, models_to_load
+from tools.records import APPLICATION_FIELDS, JOB_FIELDS, Application, RecordWriter, write_records
+from tools.events import publish, has_listeners
+from tools import metrics
 import os
+import time
+import uuid
 
 OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
 CONFIG_PATH = os.environ.get("CONFIG_PATH", "config/config.yaml")
 
 
+_config_cache = {}    # path -> ((mtime, size), parsed config)
+
+
 def load_config():
-    if os.path.exists(CONFIG_PATH):
+    """config.yaml, parsed again only when the file has changed. Every node
+    calls this, so edits apply to the next step without a restart. Returns
+    a copy that callers may modify."""
+    try:
+        stat = os.stat(CONFIG_PATH)
+    except OSError:
+        return {}
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _config_cache.get(CONFIG_PATH)
+    if cached is None or cached[0] != version:
         with open(CONFIG_PATH, "r") as f:
-            return yaml.safe_load(f)
-    return {}
+            cached = _config_cache[CONFIG_PATH] = (version, yaml.safe_load(f) or {})
+    return copy.deepcopy(cached[1])
+
+
+def ollama_client(config):
+    """The process-wide client for the Ollama endpoints in OLLAMA_HOST or
+    llm.endpoints."""
+    return get_llm_client(OLLAMA_HOST, config)
+
+
+def start_llm_warm_up(config):
+    """Start loading the configured models in the background when
+    llm.warm_up is on. Returns the LLM client, or None with warm-up off."""
+    if not config.get("llm", {}).get("warm_up", True):
+        return None
+    client = ollama_client(config)
+    client.start_warm_up(models_to_load(config))
+    return client
+
+
+def keep_first_error(current, new):
+    # Several branches run in parallel and any of them may fail; the first
+    # error reported is the one the run ends with.
+    return current or new
 
 
 class AgentState(TypedDict):
+    run_id: str
     keywords: List[str]
     locations: List[str]
     resume_path: str
+    output_dir: str
     llm_model: str
+    llm_concurrency: int
+    llm_timeout: float
+    llm_batch_size: int
     max_jobs: int
+    bypass_cache: bool
     jobs: List[dict]
     resume_data: dict
-    cover_letters: List[dict]
+    cover_letters: List[Application]
     final_pdf: str
-    error: str
+    error: Annotated[str, keep_first_error]
 
 
-def create_initial_state(config=None, resume_path=None):
+def create_initial_state(config=None, resume_path=None, output_dir="."):
     if config is None:
         config = load_config()
     
@@ -44,11 +100,17 @@ def create_initial_state(config=None, resume_path=None):
         resume_path = config.get("resume", {}).get("file", "resume.pdf")
     
     return {
+        "run_id": uuid.uuid4().hex,
         "keywords": config.get("job_search", {}).get("keywords", []),
         "locations": config.get("job_search", {}).get("locations", []),
         "resume_path": resume_path,
+        "output_dir": output_dir,
         "llm_model": config.get("llm", {}).get("model", "mistral"),
+        "llm_concurrency": config.get("llm", {}).get("concurrency", 1),
+        "llm_timeout": config.get("llm", {}).get("request_timeout_seconds", 300),
+        "llm_batch_size": config.get("llm", {}).get("letter_batch_size", 1),
         "max_jobs": config.get("job_search", {}).get("max_jobs_per_search", 10),
+        "bypass_cache": config.get("llm_cache", {}).get("bypass", False),
         "jobs": [],
         "resume_data": {},
         "cover_letters": [],
@@ -59,41 +121,253 @@ def create_initial_state(config=None, resume_path=None):
 
 def search_jobs_node(state: AgentState):
     print("--- SEARCHING JOBS ---")
+    stream = get_job_stream(state.get("run_id"))
+    try:
+        return _search_jobs(state, stream)
+    finally:
+        if stream is not None:
+            stream.close()
+
+
+def _search_jobs(state, stream):
     all_jobs = []
     
     config = load_config()
     
     if state.get("jobs") and len(state["jobs"]) > 0:
         print("Jobs already exist in state, skipping search.")
+        if stream is not None:
+            for position, job in enumerate(state["jobs"]):
+                stream.put(job, (0, position))
         return {"jobs": state["jobs"]}
 
     keywords = state.get("keywords", [])
     locations = state.get("locations", [])
     max_jobs = state.get("max_jobs", 10)
+    pool_size = max(1, config.get("selenium", {}).get("pool_size", 1))
+    # The HTTP backend needs no browsers; its searches share one pooled client.
+    uses_browser = config.get("scraping", {}).get("backend", "selenium") != "http"
+    workers = pool_size if uses_browser else max(1, config.get("scraping", {}).get("http_concurrency", 4))
+    job_index = get_job_index(config)
 
-    for keyword in keywords:
-        for location in locations:
-            try:
-                jobs = scrape_jobs(keyword, location, max_jobs, config)
-                all_jobs.extend(jobs)
-            except Exception as e:
-                print(f"Error searching for {keyword} in {location}: {e}")
+    searches = [(keyword, location) for keyword in keywords for location in locations]
+
+    # Overlapping keywords and reposts under new URLs bring back the same
+    # role. While scraping, a copy of a posting already handed on is held
+    # back so it costs no letter; once every search is done, the copy that
+    # comes first in search order is the one kept (see below).
+    dedup_config = config.get("dedup", {})
+    dedup = dedup_config.get("enabled", True)
+
+    def make_index():
+        from tools.near_duplicates import NearDuplicateIndex
+        return NearDuplicateIndex(
+            threshold=dedup_config.get("threshold", 0.8),
+            num_perm=dedup_config.get("num_perm", 128),
+        )
+    near_duplicates = make_index() if dedup else None
+    held_back = set()
+
+    run_id = state.get("run_id")
+    progress = get_run_progress(config) if run_id else None
+
+    def hand_on(job, key):
+        if stream is not None:
+            stream.put(job, key)
+        publish(
+            run_id, "job",
+            job_title=job.get("job_title"), company=job.get("company"), job_link=job.get("job_link"),
+        )
+
+    def run_search(numbered_search):
+        number, (keyword, location) = numbered_search
+        if stream is not None and stream.cancelled:
+            return []
+
+        found = []
+
+        def keep(job):
+            found.append(job)
+            if near_duplicates is not None and near_duplicates.add_job(job) is not None:
+                held_back.add(job["job_link"])
+                return
+            # Hand each job to the letter writer as soon as it is scraped.
+            hand_on(job, (number, len(found)))
+
+        # A resumed run replays the searches it had finished before it was
+        # interrupted; unfinished ones are scraped again.
+        replay = progress.finished_search(run_id, number) if progress is not None else None
+        if replay is not None:
+            for job in replay:
+                keep(job)
+            return found
+        if progress is not None:
+            progress.start_search(run_id, number)
+
+        try:
+            with pool.session() if pool is not None else nullcontext() as browser:
+                for job in iter_jobs(keyword, location, max_jobs, config, browser=browser, job_index=job_index):
+                    if stream is not None and stream.cancelled:
+                        return found
+                    keep(job)
+                    if progress is not None:
+                        progress.add_job(run_id, number, len(found), job)
+        except Exception as e:
+            print(f"Error searching for {keyword} in {location}: {e}")
+            return found
+        if progress is not None:
+            progress.finish_search(run_id, number)
+        return found
+
+    limiter = get_rate_limiter(config)
+    before = limiter.stats()
+
+    # One pool of logged-in browsers serves every search; results are merged
+    # in search order so the CSV is the same whatever the pool size.
+    with BrowserPool(config, size=pool_size) if uses_browser else nullcontext() as pool:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for number, jobs in enumerate(executor.map(run_search, enumerate(searches))):
+                all_jobs.extend(((number, position), job) for position, job in enumerate(jobs, 1))
+
+    after = limiter.stats()
+    requests = after["requests"] - before["requests"]
+    if requests:
+        waited = after["waited_seconds"] - before["waited_seconds"]
+        print(f"Rate limit: {requests} requests, {waited:.1f}s spent waiting for a slot")
     
-    unique_jobs = {job['job_link']: job for job in all_jobs}.values()
+    unique_jobs = {}
+    for key, job in all_jobs:
+        unique_jobs.setdefault(job['job_link'], (key, job))
+    unique_jobs = list(unique_jobs.values())
+
+    # Which copy of a near-duplicate arrived first depends on which search
+    # thread got there first. Going over the postings again in search order
+    # keeps the same copy every run: held-back copies that win are handed
+    # on now, and handed-on ones that lose are withdrawn.
+    if dedup:
+        index = make_index()
+        kept = [(key, job) for key, job in unique_jobs if index.add_job(job) is None]
+        kept_links = {job['job_link'] for _, job in kept}
+        for key, job in kept:
+            if job['job_link'] in held_back:
+                hand_on(job, key)
+        if stream is not None:
+            for _, job in unique_jobs:
+                if job['job_link'] not in kept_links and job['job_link'] not in held_back:
+                    stream.withdraw(job['job_link'])
+        if len(kept) < len(unique_jobs):
+            print(f"Collapsed {len(unique_jobs) - len(kept)} near-duplicate postings")
+        unique_jobs = kept
+    unique_jobs = [job for _, job in unique_jobs]
+
+    if job_index is not None:
+        counts = {"new": 0, "changed": 0, "unchanged": 0}
+        for job in unique_jobs:
+            counts[job_index.upsert(job)] += 1
+        print(f"Job index: {counts['new']} new, {counts['changed']} changed, {counts['unchanged']} unchanged")
     
-    df = pd.DataFrame(unique_jobs)
-    if not df.empty:
-        df.to_csv("jobs.csv", index=False)
-        print(f"Saved {len(df)} jobs to jobs.csv")
-    else:
+    if not unique_jobs:
         print("No jobs found.")
         return {"error": "No jobs found"}
+    write_records(os.path.join(state.get("output_dir", "."), "jobs.csv"), unique_jobs, JOB_FIELDS)
+    print(f"Saved {len(unique_jobs)} jobs to jobs.csv")
 
-    return {"jobs": list(unique_jobs)}
+    return {"jobs": unique_jobs}
 
 
 def parse_resume_node(state: AgentState):
     print("--- PARSING RESUME ---")
+    stream = get_job_stream(state.get("run_id"))
+    result = {}
+    try:
+        result = _structure_resume(state)
+        return result
+    finally:
+        if stream is not None:
+            if "resume_data" in result:
+                stream.set_resume(result["resume_data"])
+            else:
+                stream.fail_resume()
+
+
+def call_llm(llm, messages, call, on_token=None):
+    """Invoke the model (streaming when on_token is given) and record its
+    latency and token counts. Returns the response text. If the endpoint
+    fails the call starts over on another one (see LLMRouter); on_token's
+    second argument is then True for the first token of the new attempt,
+    whose text replaces what was streamed before."""
+    attempts = []
+
+    def attempt(chat):
+        start = time.perf_counter()
+        if on_token is None:
+            response = chat.invoke(messages)
+            return response.content, response.usage_metadata, time.perf_counter() - start
+        restart = bool(attempts)
+        attempts.append(chat)
+        pieces, usage = [], None
+        for chunk in chat.stream(messages):
+            pieces.append(chunk.content)
+            usage = chunk.usage_metadata or usage
+            on_token(chunk.content, restart)
+            restart = False
+        return "".join(pieces), usage, time.perf_counter() - start
+
+    text, usage, seconds = llm.call(attempt)
+    if metrics.enabled():
+        metrics.observe("jobbot_llm_seconds", seconds, call=call)
+        if usage:
+            metrics.count("jobbot_llm_tokens_total", usage.get("input_tokens", 0), call=call, direction="in")
+            metrics.count("jobbot_llm_tokens_total", usage.get("output_tokens", 0), call=call, direction="out")
+            if seconds > 0:
+                metrics.observe("jobbot_llm_tokens_per_second", usage.get("output_tokens", 0) / seconds, call=call)
+    return text
+
+
+RESUME_PROMPT = """You are an expert resume analyzer.
+Given the resume text, extract structured information in JSON format with the following keys:
+- name
+- education (list)
+- skills (list of strings)
+- projects (list)
+- experience (list)
+- summary (short professional summary)
+
+Return ONLY valid JSON."""
+
+RESUME_CHUNK_PROMPT = """You are an expert resume analyzer.
+The text is one part of a longer resume. Extract what THIS part contains in JSON format with the following keys:
+- name (empty string unless the part shows it)
+- education (list)
+- skills (list of strings)
+- projects (list)
+- experience (list)
+- summary (short professional summary of this part, or empty string)
+
+Use an empty list for sections this part does not contain. Return ONLY valid JSON."""
+
+RESUME_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "education": {"type": "array", "items": {"type": "string"}},
+        "skills": {"type": "array", "items": {"type": "string"}},
+        "projects": {"type": "array", "items": {"type": "string"}},
+        "experience": {"type": "array", "items": {"type": "string"}},
+        "summary": {"type": "string"},
+    },
+    "required": list(RESUME_KEYS),
+}
+
+
+def _structure_text(llm, prompt, text, cache, bypass, call):
+    from langchain_core.messages import HumanMessage, SystemMessage
+    messages = [SystemMessage(content=prompt), HumanMessage(content=text)]
+    key = make_key(llm.model, prompt, {"resume": text}, 0)
+    return cache.get_or_create(key, lambda: call_llm(llm, messages, call), bypass=bypass)
+
+
+def _structure_resume(state):
     resume_path = state.get("resume_path")
     model_name = state.get("llm_model", "mistral")
     
@@ -101,7 +375,14 @@ def parse_resume_node(state: AgentState):
         return {"error": f"Resume not found at {resume_path}"}
     
     try:
-        parsed_data = parse_resume(resume_path)
+        config = load_config()
+        parser_config = config.get("resume_parser", {})
+        parsed_data = parse_resume(
+            resume_path,
+            cache_dir=parser_config.get("cache_dir", "cache/resumes"),
+            workers=parser_config.get("workers"),
+            parallel_min_pages=parser_config.get("parallel_min_pages", 8),
+        )
         raw_text = parsed_data["raw_text"]
         
         if len(raw_text.strip()) < 100:
@@ -113,31 +394,32 @@ def parse_resume_node(state: AgentState):
         if text_length < 500:
             print("Warning: Resume may be too short for meaningful analysis")
         
-        llm = ChatOllama(model=model_name, temperature=0, base_url=OLLAMA_HOST)
-        
-        system_msg = """You are an expert resume analyzer.
-Given the resume text, extract structured information in JSON format with the following keys:
-- name
-- education (list)
-- skills (list of strings)
-- projects (list)
-- experience (list)
-- summary (short professional summary)
+        llm_client = ollama_client(config)
+        llm = llm_client.chat(model_name, temperature=0, format=RESUME_SCHEMA)
+        cache = get_llm_cache(config)
+        bypass = state.get("bypass_cache", False)
 
-Return ONLY valid JSON."""
-
-        messages = [
-            SystemMessage(content=system_msg),
-            HumanMessage(content=raw_text)
-        ]
-        
-        response = llm.invoke(messages)
-        structured_resume = response.content
-        
-        if "```json" in structured_resume:
-            structured_resume = structured_resume.split("```json")[1].split("```")[0].strip()
-        elif "```" in structured_resume:
-             structured_resume = structured_resume.split("```")[1].split("```")[0].strip()
+        # Long resumes are structured section by section, in parallel, in
+        # requests of bounded size; the parts are merged into one resume.
+        chunks = chunk_resume(raw_text, parser_config.get("chunk_chars", 6000))
+        if len(chunks) == 1:
+            # With format set Ollama answers bare JSON; answers cached
+            # before may still be wrapped in a code fence.
+            structured_resume = unfence(_structure_text(llm, RESUME_PROMPT, raw_text, cache, bypass, "resume"))
+        else:
+            workers = min(len(chunks), max(1, state.get("llm_concurrency", 1)) * len(llm_client.endpoints))
+            print(f"Structuring the resume in {len(chunks)} parts ({workers} at a time)")
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                answers = list(pool.map(
+                    lambda chunk: _structure_text(llm, RESUME_CHUNK_PROMPT, chunk, cache, bypass, "resume_chunk"),
+                    chunks,
+                ))
+            parts = [load_resume_json(answer) for answer in answers]
+            if not any(parts):
+                return {"error": "Could not read the structured resume from the model's answers"}
+            if not all(parts):
+                print(f"Warning: {parts.count(None)} of {len(parts)} resume parts were not valid JSON")
+            structured_resume = json.dumps(merge_resumes([part for part in parts if part]), indent=2)
 
         return {
             "resume_data": {
@@ -150,26 +432,7 @@ Return ONLY valid JSON."""
         return {"error": f"Error parsing resume: {e}"}
 
 
-def generate_cover_letters_node(state: AgentState):
-    print("--- GENERATING COVER LETTERS ---")
-    jobs = state.get("jobs", [])
-    resume_data = state.get("resume_data", {})
-    model_name = state.get("llm_model", "llama3")
-    
-    if not jobs:
-        return {"error": "No jobs to generate cover letters for."}
-        
-    structured_resume = resume_data.get("structured_resume", "")
-    
-    llm = ChatOllama(model=model_name, temperature=0.7, base_url=OLLAMA_HOST)
-    
-    cover_letters = []
-    
-    for job in jobs:
-        job_title = job.get("job_title", "Job")
-        company = job.get("company", "Company")
-        
-        prompt = f"""Write a professional and personalized cover letter for a {job_title} position at {company.
+COVER_LETTER_PROMPT = """Write a professional and personalized cover letter for a {job_title} position at {company}.
         
 MY RESUME BACKGROUND:
 {structured_resume}
@@ -180,71 +443,439 @@ INSTRUCTIONS:
 3. Use a formal and confident tone.
 4. Do NOT include placeholders like [Your Name] or [Date] if you don't have them, just sign off generically or with the Name from resume.
 """
+
+
+BATCH_COVER_LETTER_PROMPT = """Write a professional and personalized cover letter for each of the jobs below.
+
+MY RESUME BACKGROUND:
+{structured_resume}
+
+JOBS:
+{job_list}
+
+INSTRUCTIONS:
+1. Write one separate letter per job, each concise (3 paragraphs max).
+2. Highlight relevant skills from my background that match each job title.
+3. Use a formal and confident tone.
+4. Do NOT include placeholders like [Your Name] or [Date] if you don't have them, just sign off generically or with the Name from resume.
+5. Answer in JSON as {{"letters": [{{"job": <job number>, "cover_letter": "<letter>"}}]}} with one entry per job.
+"""
+
+# Ollama constrains the batched answer to this shape.
+LETTER_BATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "letters": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"job": {"type": "integer"}, "cover_letter": {"type": "string"}},
+                "required": ["job", "cover_letter"],
+            },
+        },
+    },
+    "required": ["letters"],
+}
+
+MIN_LETTER_WORDS = 40
+
+
+def _letter_inputs(job, structured_resume):
+    return {
+        "job_title": job.get("job_title", "Job"),
+        "company": job.get("company", "Company"),
+        "structured_resume": structured_resume,
+    }
+
+
+def write_cover_letter(llm, job, structured_resume, cache=None, bypass=False, on_token=None):
+    inputs = _letter_inputs(job, structured_resume)
+    prompt = COVER_LETTER_PROMPT.format(**inputs)
+
+    def produce():
+        return call_llm(llm, prompt, "letter", on_token=on_token)
+
+    if cache is None:
+        return produce()
+
+    key = make_key(llm.model, COVER_LETTER_PROMPT, inputs, llm.temperature)
+    return cache.get_or_create(key, produce, bypass=bypass)
+
+
+def parse_letter_batch(text, count):
+    """Letters by job number (1..count) from a batched answer. Entries that
+    are missing, duplicated or too short to be a letter are left out."""
+    try:
+        entries = json.loads(text).get("letters", [])
+    except (ValueError, AttributeError):
+        return {}
+    letters = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
         try:
-            response = llm.invoke(prompt)
-            letter_content = response.content
+            number = int(entry.get("job"))
+        except (TypeError, ValueError):
+            continue
+        letter = entry.get("cover_letter")
+        if 1 <= number <= count and number not in letters and isinstance(letter, str) \
+                and len(letter.split()) >= MIN_LETTER_WORDS:
+            letters[number] = letter.strip()
+    return letters
+
+
+def write_cover_letters_batch(llm, batch_llm, jobs, structured_resume, cache=None, bypass=False):
+    """
+    Write letters for several jobs with one request that carries the resume
+    once. Letters are cached under the same keys as single letters. Jobs
+    whose letter is missing or invalid in the answer are retried one at a
+    time. Returns one letter or exception per job.
+    """
+    keys = [make_key(llm.model, COVER_LETTER_PROMPT, _letter_inputs(job, structured_resume), llm.temperature)
+            for job in jobs]
+    results = [None] * len(jobs)
+    if cache is not None and not bypass:
+        results = [cache.get(key) for key in keys]
+
+    pending = [i for i, letter in enumerate(results) if letter is None]
+    if len(pending) > 1:
+        job_list = "\n".join(
+            f"[job {number}] {jobs[i].get('job_title', 'Job')} at {jobs[i].get('company', 'Company')}"
+            for number, i in enumerate(pending, 1)
+        )
+        prompt = BATCH_COVER_LETTER_PROMPT.format(structured_resume=structured_resume, job_list=job_list)
+        try:
+            letters = parse_letter_batch(call_llm(batch_llm, prompt, "letter_batch"), len(pending))
+        except Exception as e:
+            print(f"Batched letter request failed: {e}")
+            letters = {}
+        if len(letters) < len(pending):
+            print(f"Batch returned {len(letters)} of {len(pending)} letters; writing the rest one by one")
+        for number, i in enumerate(pending, 1):
+            if number in letters:
+                results[i] = letters[number]
+                if cache is not None:
+                    cache.put(keys[i], letters[number])
+
+    for i, letter in enumerate(results):
+        if letter is None:
+            try:
+                results[i] = write_cover_letter(llm, jobs[i], structured_resume, cache, bypass)
+            except Exception as e:
+                results[i] = e
+    return results
+
+
+def _run_letter_batch(llm, batch_llm, jobs, structured_resume, cache, bypass, futures):
+    try:
+        results = write_cover_letters_batch(llm, batch_llm, jobs, structured_resume, cache, bypass)
+    except Exception as e:
+        results = [e] * len(futures)
+    for future, result in zip(futures, results):
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+def generate_cover_letters_node(state: AgentState, pool=None):
+    """Letters for the run's jobs. pool is a shared executor to write them
+    on (batch runs share one across candidates); without it the node uses
+    its own with llm_concurrency workers per Ollama endpoint."""
+    print("--- GENERATING COVER LETTERS ---")
+    model_name = state.get("llm_model", "llama3")
+    timeout = state.get("llm_timeout", 300)
+    batch_size = max(1, state.get("llm_batch_size", 1))
+    bypass = state.get("bypass_cache", False)
+
+    # Inside the graph, jobs arrive from the scraping branch while it is
+    # still running and the resume from the parsing branch; called on its
+    # own, the node works from the jobs and resume already in state.
+    stream = get_job_stream(state.get("run_id"))
+    if stream is not None:
+        resume_data = stream.wait_resume()
+        if resume_data is None:
+            return {}
+        jobs = iter(stream)
+    else:
+        resume_data = state.get("resume_data", {})
+        jobs = state.get("jobs", [])
+        if not jobs:
+            return {"error": "No jobs to generate cover letters for."}
+        
+    structured_resume = resume_data.get("structured_resume", "")
+    config = load_config()
+
+    # Ranking needs every job's description, so with it on the letter
+    # writer waits for scraping to finish and then only writes letters for
+    # the best matches.
+    ranking = config.get("ranking", {})
+    if ranking.get("enabled", False):
+        jobs = list(jobs)
+        if stream is not None:
+            jobs = sorted((stream.record(job) for job in jobs if not stream.withdrawn(job)), key=stream.sort_key)
+        if jobs:
+            jobs = rank_and_select(jobs, structured_resume, ranking, state.get("output_dir", "."), config)
+
+    llm_client = ollama_client(config)
+    concurrency = max(1, state.get("llm_concurrency", 1)) * len(llm_client.endpoints)
+    llm = llm_client.chat(model_name, temperature=0.7, timeout=timeout)
+    batch_llm = None
+    if batch_size > 1:
+        batch_llm = llm_client.chat(
+            model_name, temperature=0.7, timeout=timeout * batch_size, format=LETTER_BATCH_SCHEMA,
+        )
+    cache = get_llm_cache(config)
+    run_id = state.get("run_id")
+    # Letters this run wrote before it was interrupted are not written again.
+    progress = get_run_progress(config) if run_id else None
+    written = progress.letters(run_id) if progress is not None else {}
+    stream_tokens = config.get("web", {}).get("stream_tokens", False)
+
+    def token_sender(job):
+        # Token events are only worth their cost while someone is watching.
+        if not stream_tokens or not has_listeners(run_id):
+            return None
+        return lambda text, restart: publish(
+            run_id, "token", job_link=job.get("job_link"), text=text, restart=restart,
+        )
+
+    def letter_done(job, future):
+        _publish_letter(run_id, job, future)
+        # A letter for a copy that was replaced (see below) is not kept.
+        if stream is not None and stream.record(job) != job:
+            return
+        if progress is not None and future.exception() is None:
+            progress.add_letter(run_id, job, future.result())
+    
+    cover_letters = []
+    # Each letter is appended to the CSV as it is collected, so the results
+    # page shows it while the rest are still being written.
+    # The file is only replaced once there is a letter to put in it.
+    letters_file = RecordWriter(
+        os.path.join(state.get("output_dir", "."), "cover_letters.csv"), APPLICATION_FIELDS, lazy=True,
+    )
+    
+    with letters_file, nullcontext(pool) if pool is not None else ThreadPoolExecutor(max_workers=concurrency) as pool:
+        submitted = []
+        batch = []
+
+        def submit_batch():
+            # One request for the whole batch; each job still gets its own
+            # future so results are collected the same way as single letters.
+            futures = [Future() for _ in batch]
+            for job, future in zip(batch, futures):
+                future.add_done_callback(lambda f, job=job: letter_done(job, f))
+                submitted.append((job, future))
+            pool.submit(_run_letter_batch, llm, batch_llm, list(batch), structured_resume, cache, bypass, futures)
+            batch.clear()
+
+        for job in jobs:
+            if stream is not None and stream.withdrawn(job):
+                continue
+            if job["job_link"] in written:
+                future = Future()
+                future.set_result(written[job["job_link"]])
+                _publish_letter(run_id, job, future)
+                submitted.append((job, future))
+                continue
+            if batch_size > 1:
+                batch.append(job)
+                if len(batch) == batch_size:
+                    submit_batch()
+                continue
+            future = pool.submit(
+                write_cover_letter, llm, job, structured_resume, cache, bypass, token_sender(job)
+            )
+            future.add_done_callback(lambda f, job=job: letter_done(job, f))
+            submitted.append((job, future))
+        if batch:
+            submit_batch()
+
+        # Two searches can return the same link with different card text.
+        # The copy kept is the one first in search order, as in jobs.csv;
+        # a letter written for the other copy is written again for it.
+        if stream is not None:
+            for number, (job, future) in enumerate(submitted):
+                kept = stream.record(job)
+                if kept != job:
+                    future = pool.submit(write_cover_letter, llm, kept, structured_resume, cache, bypass)
+                    future.add_done_callback(lambda f, job=kept: letter_done(job, f))
+                    submitted[number] = (kept, future)
+
+        failed = 0
+        for job, future in submitted:
+            company = job.get("company", "Company")
+            try:
+                letter_content = future.result()
+            except Exception as e:
+                print(f"Failed to generate letter for {company}: {e}")
+                failed += 1
+                continue
             
-            job_record = job.copy()
-            job_record["cover_letter"] = letter_content
-            cover_letters.append(job_record)
+            application = Application.from_job(job, letter_content)
+            cover_letters.append(application)
+            letters_file.write(application)
             
             print(f"Generated letter for {company}")
-        except Exception as e:
-            print(f"Failed to generate letter for {company}: {e}")
-            
-    if cover_letters:
-        df = pd.DataFrame(cover_letters)
-        df.to_csv("cover_letters.csv", index=False)
-    
+
+    # Letters are requested concurrently and, when streaming, in scrape
+    # order; sorting by the search order makes the PDF come out the same
+    # regardless of which request or browser finished first.
+    if stream is not None:
+        cover_letters.sort(key=stream.sort_key)
+        # Duplicates withdrawn after their letter was written are left out.
+        kept = [letter for letter in cover_letters if not stream.withdrawn(letter)]
+        if len(kept) < len(cover_letters):
+            cover_letters = kept
+            write_records(letters_file.path, cover_letters)
+
+    stats = cache.stats()
+    print(f"LLM cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+
+    # Only a run with nothing to write ends quietly without letters.
+    if failed and not cover_letters:
+        return {"cover_letters": [], "error": f"All {failed} cover letter requests failed"}
     return {"cover_letters": cover_letters}
 
 
+def rank_and_select(jobs, structured_resume, ranking, output_dir=".", config=None):
+    """Score jobs against the resume, rewrite jobs.csv with a relevance
+    column and return the jobs that should get letters."""
+    from tools.job_ranker import rank_jobs
+
+    embeddings = None
+    if ranking.get("method", "tfidf") == "embeddings":
+        embeddings = ollama_client(config).embeddings(
+            ranking.get("embedding_model", "nomic-embed-text")
+        )
+    scored, selected = rank_jobs(
+        jobs, structured_resume,
+        top_k=ranking.get("top_k"),
+        threshold=ranking.get("threshold", 0.0),
+        embeddings=embeddings,
+    )
+    write_records(os.path.join(output_dir, "jobs.csv"), scored, JOB_FIELDS + ("relevance",))
+    print(f"Ranking: {len(selected)} of {len(scored)} jobs selected for letters")
+    return selected
+
+
+def _publish_letter(run_id, job, future):
+    details = {"job_title": job.get("job_title"), "company": job.get("company"), "job_link": job.get("job_link")}
+    if future.exception() is not None:
+        publish(run_id, "letter_failed", error=str(future.exception()), **details)
+    else:
+        publish(run_id, "letter", cover_letter=future.result(), **details)
+
+
 def generate_pdf_node(state: AgentState):
     print("--- GENERATING PDF ---")
+    output_dir = state.get("output_dir", ".")
+    # The letters come straight from state, not from re-reading the CSV.
+    applications = state.get("cover_letters") or []
     
     try:
-        if not os.path.exists("cover_letters.csv"):
-             return {"error": "cover_letters.csv not found for PDF generation"}
+        if not applications:
+             return {"error": "No cover letters for PDF generation"}
 
-        output_file = "final_applications.pdf"
-        result_path = generate_pdf("cover_letters.csv", output_file)
+        output_file = os.path.join(output_dir, "final_applications.pdf")
+        pdf_config = load_config().get("pdf", {})
+        result_path, _ = render_applications(
+            applications,
+            output_file,
+            per_job_dir=os.path.join(output_dir, pdf_config.get("per_job_dir", "applications")),
+            cache_dir=pdf_config.get("cache_dir", "cache/pdf"),
+            workers=pdf_config.get("workers"),
+        )
         print(f"PDF Generated at: {result_path}")
         return {"final_pdf": result_path}
     except Exception as e:
         return {"error": f"Error generating PDF: {e}"}
 
 
-def create_job_bot_graph():
+def join_branches_node(state: AgentState):
+    drop_job_stream(state.get("run_id"))
+    return {}
+
+
+def with_progress(name, node):
+    """Wrap a node so listeners of the run see when it starts and ends, and
+    its wall time is recorded."""
+    def run_node(state: AgentState):
+        run_id = state.get("run_id")
+        publish(run_id, "node_start", node=name)
+        start = time.perf_counter()
+        result = node(state)
+        seconds = time.perf_counter() - start
+        metrics.observe("jobbot_node_seconds", seconds, node=name)
+        publish(
+            run_id, "node_end", node=name,
+            seconds=round(seconds, 3),
+            error=(result or {}).get("error", ""),
+        )
+        return result
+    return run_node
+
+
+def thread_config(run_id):
+    return {"configurable": {"thread_id": run_id}}
+
+
+def prepare_resume(bot_graph, run_id):
+    """
+    Get an interrupted run ready to continue from its last checkpoint.
+    Branches that finished before the interruption are not run again, so
+    the job stream the redone branches meet on is refilled from their
+    saved results. Returns False if the run has nothing left to do.
+    """
+    snapshot = bot_graph.get_state(thread_config(run_id))
+    if not snapshot.next:
+        return False
+
+    finished = {task.name: task.result for task in snapshot.tasks if task.result is not None}
+    if "generate_cover_letters" in snapshot.next:
+        stream = get_job_stream(run_id)
+        if "search_jobs" in finished:
+            for position, job in enumerate(finished["search_jobs"].get("jobs") or []):
+                stream.put(job, (0, position))
+            stream.close()
+        if "parse_resume" in finished:
+            resume_data = finished["parse_resume"].get("resume_data")
+            if resume_data:
+                stream.set_resume(resume_data)
+            else:
+                stream.fail_resume()
+    return True
+
+
+def create_job_bot_graph(checkpointer=None):
+    from langgraph.graph import END, StateGraph, START
+
     workflow = StateGraph(AgentState)
     
-    workflow.add_node("search_jobs", search_jobs_node)
-    workflow.add_node("parse_resume", parse_resume_node)
-    workflow.add_node("generate_cover_letters", generate_cover_letters_node)
-    workflow.add_node("generate_pdf", generate_pdf_node)
+    workflow.add_node("search_jobs", with_progress("search_jobs", search_jobs_node))
+    workflow.add_node("parse_resume", with_progress("parse_resume", parse_resume_node))
+    workflow.add_node("generate_cover_letters", with_progress("generate_cover_letters", generate_cover_letters_node))
+    workflow.add_node("join_branches", join_branches_node)
+    workflow.add_node("generate_pdf", with_progress("generate_pdf", generate_pdf_node))
     
+    # Scraping, resume parsing and letter writing start together: letters
+    # are written while later searches are still scraping, as soon as the
+    # resume is ready.
     workflow.add_edge(START, "search_jobs")
+    workflow.add_edge(START, "parse_resume")
+    workflow.add_edge(START, "generate_cover_letters")
+    workflow.add_edge(["search_jobs", "parse_resume", "generate_cover_letters"], "join_branches")
     
-    def check_search_success(state):
-        if state.get("error"):
-            return END
-        return "parse_resume"
-        
-    workflow.add_conditional_edges("search_jobs", check_search_success)
-    
-    def check_parse_success(state):
-        if state.get("error"):
-            return END
-        return "generate_cover_letters"
-        
-    workflow.add_conditional_edges("parse_resume", check_parse_success)
-    
-    def check_letters_success(state):
-        if state.get("error"):
+    def check_branches_success(state):
+        if state.get("error") or not state.get("cover_letters"):
             return END
         return "generate_pdf"
         
-    workflow.add_conditional_edges("generate_cover_letters", check_letters_success)
+    workflow.add_conditional_edges("join_branches", check_branches_success)
     
     workflow.add_edge("generate_pdf", END)
     
-    return workflow.compile()
\ No newline at end of file
+    # With a checkpointer, state is saved after every step under the run's
+    # id, and an interrupted run can be continued with prepare_resume().
+    return workflow.compile(checkpointer=checkpointer)
@@ -1,13 +1,47 @@
 # main.py
 
+import argparse
+import json
 import yaml
-from graph import create_job_bot_graph, load_config, create_initial_state
+from graph import (
+    create_job_bot_graph, load_config, create_initial_state, prepare_resume, thread_config, start_llm_warm_up,
+)
+from batch import run_batch
+from tools.checkpoints import get_checkpointer, forget_run
+from tools import metrics
 from rich.console import Console
 
 console = Console()
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Job Application Agent")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="ignore cached LLM responses and write letters for every posting again",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="continue an interrupted run from its last checkpoint instead of starting a new one",
+    )
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="RESUME",
+        help="write applications for several resumes from one job search, each under candidates/",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="write the run's timings (nodes, scraping, LLM calls, PDF) to PATH as JSON",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     console.print("\n[bold green]🚀 Starting Job Application Agent Pipeline (LangGraph Edition)[/bold green]\n")
 
     try:
@@ -22,11 +56,41 @@ def main():
     console.print(f"📋 Searching for: {', '.join(keywords)}")
     console.print(f"📍 Locations: {', '.join(locations)}\n")
 
-    bot_graph = create_job_bot_graph()
+    # The model loads while jobs are being scraped.
+    start_llm_warm_up(config)
+
+    if args.batch:
+        run_batch_cli(config, args)
+        return
+
+    checkpointer = get_checkpointer(config)
+    bot_graph = create_job_bot_graph(checkpointer)
     initial_state = create_initial_state(config)
+    if args.refresh:
+        initial_state["bypass_cache"] = True
+
+    run_id = initial_state["run_id"]
+    graph_input = initial_state
+    if args.resume:
+        if checkpointer is None:
+            console.print("[bold red]❌ Checkpoints are disabled in config.yaml; nothing to resume.[/bold red]")
+            return
+        run_id, graph_input = args.resume, None
+        if not prepare_resume(bot_graph, run_id):
+            console.print(f"[bold red]❌ Run {run_id} has no unfinished checkpoint to resume.[/bold red]")
+            return
+        console.print(f"⏯️ Resuming run {run_id}\n")
+    elif checkpointer is not None:
+        console.print(f"🆔 Run id: {run_id} (continue it with --resume {run_id} if it is interrupted)\n")
+
+    metrics.configure(config)
+    trace = None
+    if args.trace:
+        metrics.enable()
+        trace = metrics.start_trace()
 
     try:
-        final_state = bot_graph.invoke(initial_state)
+        final_state = bot_graph.invoke(graph_input, thread_config(run_id))
         
         if final_state.get("error"):
             console.print(f"[bold red]❌ Pipeline Error: {final_state['error']}[/bold red]")
@@ -34,9 +98,46 @@ def main():
             console.print("\n[bold green]✅ Pipeline completed successfully![/bold green]")
             if final_state.get("final_pdf"):
                 console.print(f"📄 Applications saved to: [bold underline]{final_state['final_pdf']}[/bold underline]")
+        forget_run(config, run_id)
 
     except Exception as e:
          console.print(f"[bold red]❌ Runtime Error: {e}[/bold red]")
+         if checkpointer is not None:
+             console.print(f"⏯️ Continue this run with: python main.py --resume {run_id}")
+
+    if trace is not None:
+        metrics.stop_trace(trace)
+        with open(args.trace, "w") as f:
+            json.dump(trace.to_dict(run_id=run_id), f, indent=2)
+        console.print(f"⏱️ Trace saved to: {args.trace}")
+
+def run_batch_cli(config, args):
+    console.print(f"👥 Candidates: {', '.join(args.batch)}\n")
+    metrics.configure(config)
+    trace = None
+    if args.trace:
+        metrics.enable()
+        trace = metrics.start_trace()
+
+    try:
+        result = run_batch(config, args.batch, bypass_cache=args.refresh)
+        if result["error"]:
+            console.print(f"[bold red]❌ Pipeline Error: {result['error']}[/bold red]")
+        else:
+            console.print("\n[bold green]✅ Batch completed![/bold green]")
+        for candidate in result["candidates"]:
+            if candidate["final_pdf"]:
+                console.print(f"📄 {candidate['name']}: [bold underline]{candidate['final_pdf']}[/bold underline]")
+            else:
+                console.print(f"[bold red]❌ {candidate['name']}: {candidate['error'] or 'no letters'}[/bold red]")
+    except Exception as e:
+        console.print(f"[bold red]❌ Runtime Error: {e}[/bold red]")
+
+    if trace is not None:
+        metrics.stop_trace(trace)
+        with open(args.trace, "w") as f:
+            json.dump(trace.to_dict(candidates=args.batch), f, indent=2)
+        console.print(f"⏱️ Trace saved to: {args.trace}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
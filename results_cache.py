@@ -0,0 +1,87 @@
+# results_cache.py
+
+import os
+import threading
+
+from tools.records import read_records
+
+RESULT_FIELDS = ("job_title", "company", "relevance", "job_link", "job_description", "date_applied", "cover_letter", "has_letter")
+
+
+def _version(path):
+    # Size as well as mtime: cover_letters.csv grows a row at a time while
+    # a run is writing letters.
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ResultsCache:
+    """
+    Parsed jobs joined with their cover letters for each run directory,
+    kept in memory.
+    An entry is rebuilt only when jobs.csv or cover_letters.csv changed on
+    disk (checked by mtime and size) or after invalidate(), so serving a page costs
+    two stat calls instead of two CSV parses.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, output_dir):
+        jobs_csv = os.path.join(output_dir, "jobs.csv")
+        letters_csv = os.path.join(output_dir, "cover_letters.csv")
+        signature = (_version(jobs_csv), _version(letters_csv))
+
+        with self._lock:
+            entry = self._entries.get(output_dir)
+            if entry and entry[0] == signature:
+                return entry[1]
+
+        results = self._build(read_records(jobs_csv), read_records(letters_csv))
+        with self._lock:
+            self._entries[output_dir] = (signature, results)
+        return results
+
+    def invalidate(self, output_dir):
+        with self._lock:
+            self._entries.pop(output_dir, None)
+
+    @staticmethod
+    def _build(jobs, letters):
+        letters_by_link = {letter.get("job_link"): letter.get("cover_letter", "") for letter in letters}
+        records = []
+        for job in jobs:
+            letter = letters_by_link.get(job.get("job_link"), "")
+            records.append({
+                **{field: job.get(field, "") for field in RESULT_FIELDS},
+                "relevance": float(job["relevance"]) if job.get("relevance") else "",
+                "cover_letter": letter,
+                "has_letter": bool(letter),
+            })
+        return {"records": records, "letters": sum(1 for r in records if r["has_letter"])}
+
+
+def paginate(results, page=1, per_page=25, fields=None):
+    records = results["records"]
+    per_page = max(1, min(per_page, 200))
+    page = max(1, page)
+    total = len(records)
+    start = (page - 1) * per_page
+    selected = [f for f in (fields or RESULT_FIELDS) if f in RESULT_FIELDS]
+
+    items = [
+        {"index": start + offset, **{field: record[field] for field in selected}}
+        for offset, record in enumerate(records[start:start + per_page])
+    ]
+    return {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "pages": (total + per_page - 1) // per_page,
+        "letters": results["letters"],
+        "items": items,
+    }
@@ -0,0 +1,286 @@
+# runs.py
+
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from batch import candidate_dirs, run_batch
+from graph import create_job_bot_graph, create_initial_state, load_config, prepare_resume, thread_config
+from tools.checkpoints import get_checkpointer, forget_run
+from tools.job_stream import get_job_stream, drop_job_stream
+from tools.events import open_channel, get_channel, drop_channel, publish
+
+
+class QueueFull(Exception):
+    pass
+
+
+class NothingToResume(Exception):
+    pass
+
+
+class Run:
+    def __init__(self, run_id, output_dir):
+        self.id = run_id
+        self.output_dir = output_dir
+        self.resume_path = ""
+        # A batch run has several resumes and one entry per candidate in
+        # candidates; its jobs are searched once for all of them.
+        self.resume_paths = []
+        self.candidates = []
+        self.status = "Queued"
+        self.error = ""
+        self.final_pdf = ""
+        self.jobs_found = 0
+        self.letters_written = 0
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = threading.Event()
+        # Set when the run stopped part-way and its checkpoint was kept;
+        # resuming continues it instead of starting over.
+        self.resumable = False
+        self.resuming = False
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+    def to_dict(self):
+        return {
+            "run_id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "jobs_found": self.jobs_found,
+            "letters_written": self.letters_written,
+            "has_pdf": bool(self.final_pdf),
+            "resumable": self.resumable,
+            "candidates": [
+                {"name": c["name"], "letters": c["letters"], "has_pdf": bool(c["final_pdf"]), "error": c["error"]}
+                for c in self.candidates
+            ],
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class RunQueue:
+    """
+    Runs pipelines for the web app on a fixed number of worker threads.
+    Each run gets its own id and output directory. At most max_queued runs
+    wait for a worker; beyond that submit() raises QueueFull so the caller
+    can push back instead of piling up work.
+    """
+
+    def __init__(self, runs_dir="results", workers=2, max_queued=10, history=200, on_finish=None):
+        self.runs_dir = runs_dir
+        self.history = history
+        self.on_finish = on_finish
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._runs = OrderedDict()
+        self._lock = threading.Lock()
+        self._active = 0
+        os.makedirs(runs_dir, exist_ok=True)
+
+        for i in range(max(1, workers)):
+            threading.Thread(target=self._worker, name=f"run-worker-{i}", daemon=True).start()
+
+    def new_run(self):
+        run_id = uuid.uuid4().hex[:12]
+        run = Run(run_id, os.path.join(self.runs_dir, run_id))
+        os.makedirs(run.output_dir, exist_ok=True)
+        return run
+
+    def set_batch(self, run, resume_paths, names):
+        """Make run a batch run over several resumes, one per candidate name."""
+        run.resume_paths = list(resume_paths)
+        run.candidates = [
+            {"name": name, "output_dir": directory, "letters": 0, "final_pdf": "", "error": ""}
+            for name, directory in zip(names, candidate_dirs(names, run.output_dir))
+        ]
+
+    def submit(self, run):
+        try:
+            self._queue.put_nowait(run)
+        except queue.Full:
+            raise QueueFull(f"{self._queue.maxsize} runs are already waiting")
+        open_channel(run.id)
+        with self._lock:
+            self._runs[run.id] = run
+            while len(self._runs) > self.history:
+                oldest = next(iter(self._runs.values()))
+                if not oldest.finished:
+                    break
+                self._runs.popitem(last=False)
+                drop_channel(oldest.id)
+        self._publish_status(run)
+        return run
+
+    def resume(self, run_id):
+        """Queue an interrupted run again to continue from its last
+        checkpoint. Runs from before a restart of the app are picked up
+        from their output directory. Returns the run, or None if there is
+        no such run or it has nothing to resume."""
+        run = self.get(run_id)
+        if run is None:
+            output_dir = os.path.join(self.runs_dir, run_id)
+            if not run_id.isalnum() or not os.path.isdir(output_dir):
+                return None
+            run = Run(run_id, output_dir)
+        elif not run.resumable:
+            return None
+
+        previous = run.status, run.error, run.finished_at, run.resumable
+        run.status, run.error, run.finished_at, run.resumable = "Queued", "", None, False
+        run.cancel_requested.clear()
+        run.resuming = True
+        # The finished run's event channel is closed; listeners start over.
+        drop_channel(run.id)
+        try:
+            self.submit(run)
+        except QueueFull:
+            run.status, run.error, run.finished_at, run.resumable = previous
+            run.resuming = False
+            raise
+        return run
+
+    def get(self, run_id):
+        with self._lock:
+            return self._runs.get(run_id)
+
+    def latest(self):
+        with self._lock:
+            return next(reversed(self._runs.values()), None)
+
+    def runs(self):
+        with self._lock:
+            return list(self._runs.values())
+
+    def stats(self):
+        with self._lock:
+            active = self._active
+        return {
+            "queued": self._queue.qsize(),
+            "max_queued": self._queue.maxsize,
+            "running": active,
+        }
+
+    def cancel(self, run_id):
+        """Cancel a queued run, or ask a running one to stop at the next step."""
+        run = self.get(run_id)
+        if run is None or run.finished:
+            return False
+        run.cancel_requested.set()
+        stream = get_job_stream(run.id) if run.status == "Running" else None
+        if stream is not None:
+            stream.cancel()
+        return True
+
+    def _publish_status(self, run):
+        publish(run.id, "status", **run.to_dict())
+        if run.finished:
+            channel = get_channel(run.id)
+            if channel is not None:
+                channel.close()
+
+    def _worker(self):
+        while True:
+            run = self._queue.get()
+            try:
+                if run.cancel_requested.is_set():
+                    run.status = "Cancelled"
+                    run.finished_at = time.time()
+                    self._publish_status(run)
+                    continue
+                with self._lock:
+                    self._active += 1
+                try:
+                    self._execute(run)
+                finally:
+                    with self._lock:
+                        self._active -= 1
+            finally:
+                self._queue.task_done()
+
+    def _execute(self, run):
+        run.status = "Running"
+        run.started_at = time.time()
+        self._publish_status(run)
+        checkpointer = None
+        try:
+            config = load_config()
+            if run.resume_paths:
+                self._execute_batch(run, config)
+                return
+            checkpointer = get_checkpointer(config)
+            bot_graph = create_job_bot_graph(checkpointer)
+            state = None
+            if run.resuming:
+                if checkpointer is None or not prepare_resume(bot_graph, run.id):
+                    raise NothingToResume("nothing to resume")
+                print(f"⏯️ Resuming run {run.id}")
+            else:
+                state = create_initial_state(config, run.resume_path, run.output_dir)
+                state["run_id"] = run.id
+
+            final_state = state or bot_graph.get_state(thread_config(run.id)).values
+            for final_state in bot_graph.stream(state, thread_config(run.id), stream_mode="values"):
+                if run.cancel_requested.is_set():
+                    break
+
+            run.jobs_found = len(final_state.get("jobs") or [])
+            run.letters_written = len(final_state.get("cover_letters") or [])
+            run.final_pdf = final_state.get("final_pdf", "")
+            if run.cancel_requested.is_set():
+                run.status = "Cancelled"
+            elif final_state.get("error"):
+                run.error = final_state["error"]
+                run.status = f"Failed: {run.error}"
+            else:
+                run.status = "Completed"
+            if run.cancel_requested.is_set():
+                run.resumable = checkpointer is not None
+            elif checkpointer is not None:
+                forget_run(config, run.id)
+            print(f"✅ Run {run.id} finished: {run.status}")
+
+        except Exception as e:
+            run.error = str(e)
+            run.status = f"Failed: {e}"
+            # The checkpoint is kept, so the run can go on from its last step.
+            run.resumable = checkpointer is not None and not isinstance(e, NothingToResume)
+            print(f"❌ Run {run.id} failed: {e}")
+        finally:
+            run.resuming = False
+            drop_job_stream(run.id)
+            run.finished_at = time.time()
+            if self.on_finish:
+                self.on_finish(run)
+            self._publish_status(run)
+
+    def _execute_batch(self, run, config):
+        # Batch runs are not checkpointed, so they cannot be resumed.
+        def candidate_done(candidate):
+            run.candidates[run.resume_paths.index(candidate["resume_path"])].update(
+                letters=candidate["letters"], final_pdf=candidate["final_pdf"], error=candidate["error"],
+            )
+            run.letters_written = sum(c["letters"] for c in run.candidates)
+
+        result = run_batch(
+            config, run.resume_paths, run.output_dir, run_id=run.id,
+            should_stop=run.cancel_requested.is_set, on_candidate=candidate_done,
+            names=[c["name"] for c in run.candidates],
+        )
+        run.jobs_found = len(result["jobs"])
+        if run.cancel_requested.is_set():
+            run.status = "Cancelled"
+        elif result["error"]:
+            run.error = result["error"]
+            run.status = f"Failed: {run.error}"
+        else:
+            run.status = "Completed"
+        print(f"✅ Run {run.id} finished: {run.status}")
@@ -0,0 +1,157 @@
+# tools/browser_pool.py
+
+import queue
+import threading
+from contextlib import contextmanager
+
+from tools.linkedin_scraper import start_browser
+
+_STARTING = object()
+_NOT_LOGGED_IN = object()
+
+# Chrome profile directories are leased process-wide so that pools of
+# concurrent runs never open the same profile twice.
+_profiles_in_use = set()
+_profiles_lock = threading.Lock()
+
+
+def _lease_profile():
+    with _profiles_lock:
+        index = 0
+        while index in _profiles_in_use:
+            index += 1
+        _profiles_in_use.add(index)
+        return index
+
+
+def _return_profile(index):
+    with _profiles_lock:
+        _profiles_in_use.discard(index)
+
+
+def _is_alive(browser):
+    try:
+        browser.current_url
+        return True
+    except Exception:
+        return False
+
+
+class BrowserPool:
+    """
+    Up to `size` logged-in Chrome sessions shared by all searches of a run.
+    Browsers are started lazily on first use and reused until close(), so a
+    run pays for one cold start and one login check per browser instead of
+    one per (keyword, location) search.
+    """
+
+    def __init__(self, config, size=1):
+        self.config = config
+        self.size = max(1, size)
+        self._idle = queue.Queue()
+        # One entry per browser slot: None (free), _STARTING, a driver, or
+        # _NOT_LOGGED_IN for a profile whose login failed; the searches go on
+        # with the other browsers rather than starting that one again.
+        self._slots = [None] * self.size
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def acquire(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                if all(slot is _NOT_LOGGED_IN for slot in self._slots):
+                    raise RuntimeError("No browser of the pool is logged in to LinkedIn")
+                index = self._slots.index(None) if None in self._slots else None
+                if index is not None:
+                    # Reserve the slot before the slow start so other threads wait instead.
+                    self._slots[index] = _STARTING
+
+            if index is not None:
+                browser = self._start(index)
+                if browser is not None:
+                    return browser
+                continue
+
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _start(self, index):
+        browser = None
+        started = False
+        profile = _lease_profile()
+        try:
+            browser = start_browser(self.config, profile_index=profile)
+            started = True
+        finally:
+            with self._lock:
+                closed = self._closed
+                if not closed:
+                    # start_browser returns None when the login check fails.
+                    self._slots[index] = _NOT_LOGGED_IN if started and browser is None else browser
+                if browser is not None:
+                    self._profiles[id(browser)] = profile
+            if browser is None:
+                _return_profile(profile)
+        if closed and browser is not None:
+            self._quit(browser)
+            raise RuntimeError("Browser pool is closed")
+        return browser
+
+    def _quit(self, browser):
+        try:
+            browser.quit()
+        except Exception as e:
+            print(f"⚠️ Error closing browser: {e}")
+        with self._lock:
+            profile = self._profiles.pop(id(browser), None)
+        if profile is not None:
+            _return_profile(profile)
+
+    def release(self, browser):
+        self._idle.put(browser)
+
+    def discard(self, browser):
+        """Drop a broken browser so its slot is restarted on the next acquire()."""
+        with self._lock:
+            if browser in self._slots:
+                self._slots[self._slots.index(browser)] = None
+        self._quit(browser)
+
+    @contextmanager
+    def session(self):
+        browser = self.acquire()
+        healthy = True
+        try:
+            yield browser
+        except Exception:
+            healthy = _is_alive(browser)
+            raise
+        finally:
+            if healthy:
+                self.release(browser)
+            else:
+                self.discard(browser)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            browsers = [b for b in self._slots if b is not None and b is not _STARTING and b is not _NOT_LOGGED_IN]
+            self._slots = [None] * self.size
+        for browser in browsers:
+            self._quit(browser)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,158 @@
+# tools/checkpoints.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class RunProgress:
+    """
+    Per-job progress of graph runs, stored next to the LangGraph
+    checkpoints. A run that is resumed after a crash or a kill replays the
+    searches it finished and the letters it wrote instead of doing them
+    again; only the unit of work that was interrupted is redone.
+    """
+
+    def __init__(self, path="cache/checkpoints.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = _connect(path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS scraped_jobs (
+                run_id TEXT NOT NULL,
+                search INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                job TEXT NOT NULL,
+                PRIMARY KEY (run_id, search, position)
+            );
+            CREATE TABLE IF NOT EXISTS finished_searches (
+                run_id TEXT NOT NULL,
+                search INTEGER NOT NULL,
+                finished_at REAL NOT NULL,
+                PRIMARY KEY (run_id, search)
+            );
+            CREATE TABLE IF NOT EXISTS written_letters (
+                run_id TEXT NOT NULL,
+                job_link TEXT NOT NULL,
+                cover_letter TEXT NOT NULL,
+                written_at REAL NOT NULL,
+                PRIMARY KEY (run_id, job_link)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def _write(self, sql, params):
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def start_search(self, run_id, search):
+        # Jobs of an unfinished search are scraped again from the start.
+        self._write("DELETE FROM scraped_jobs WHERE run_id = ? AND search = ?", (run_id, search))
+
+    def add_job(self, run_id, search, position, job):
+        self._write("INSERT OR REPLACE INTO scraped_jobs VALUES (?, ?, ?, ?)",
+                    (run_id, search, position, json.dumps(job)))
+
+    def finish_search(self, run_id, search):
+        self._write("INSERT OR REPLACE INTO finished_searches VALUES (?, ?, ?)", (run_id, search, time.time()))
+
+    def finished_search(self, run_id, search):
+        """Jobs of a search this run already finished, in scrape order, or
+        None if it has not finished it."""
+        with self._lock:
+            finished = self._conn.execute(
+                "SELECT 1 FROM finished_searches WHERE run_id = ? AND search = ?", (run_id, search)
+            ).fetchone()
+            if finished is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT job FROM scraped_jobs WHERE run_id = ? AND search = ? ORDER BY position",
+                (run_id, search),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def add_letter(self, run_id, job, cover_letter):
+        self._write("INSERT OR REPLACE INTO written_letters VALUES (?, ?, ?, ?)",
+                    (run_id, job["job_link"], cover_letter, time.time()))
+
+    def letters(self, run_id):
+        """Letters this run already wrote, by job_link."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_link, cover_letter FROM written_letters WHERE run_id = ?", (run_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def forget(self, run_id):
+        with self._lock:
+            for table in ("scraped_jobs", "finished_searches", "written_letters"):
+                self._conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+            self._conn.commit()
+
+
+def _connect(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    # The graph checkpointer and RunProgress write to the same file from
+    # several threads.
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+_progress = None
+_checkpointer = None
+_lock = threading.Lock()
+
+
+def _path(config):
+    return (config or {}).get("checkpoints", {}).get("path", "cache/checkpoints.sqlite")
+
+
+def _enabled(config):
+    return (config or {}).get("checkpoints", {}).get("enabled", True)
+
+
+def get_run_progress(config=None):
+    """Process-wide RunProgress built from the `checkpoints` section of
+    config.yaml, or None when checkpoints are disabled."""
+    global _progress
+    if not _enabled(config):
+        return None
+    with _lock:
+        if _progress is None:
+            _progress = RunProgress(_path(config))
+        return _progress
+
+
+def get_checkpointer(config=None):
+    """Process-wide LangGraph checkpointer in the same SQLite file, or None
+    when checkpoints are disabled."""
+    global _checkpointer
+    if not _enabled(config):
+        return None
+    with _lock:
+        if _checkpointer is None:
+            from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+            from langgraph.checkpoint.sqlite import SqliteSaver
+
+            # Letters are kept in state as Application records.
+            serde = JsonPlusSerializer(allowed_msgpack_modules=[("tools.records", "Application")])
+            _checkpointer = SqliteSaver(_connect(_path(config)), serde=serde)
+        return _checkpointer
+
+
+def forget_run(config, run_id):
+    """Drop the checkpoints and progress of a run that finished."""
+    checkpointer = get_checkpointer(config)
+    if checkpointer is not None:
+        checkpointer.delete_thread(run_id)
+    progress = get_run_progress(config)
+    if progress is not None:
+        progress.forget(run_id)
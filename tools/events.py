@@ -0,0 +1,104 @@
+# tools/events.py
+
+import threading
+import time
+from collections import deque
+
+
+class EventChannel:
+    """
+    Progress events of one run. Keeps the most recent events so a listener
+    that connects late (or reconnects with Last-Event-ID) can catch up.
+    Streamed letter tokens come by the hundred per letter, so they are kept
+    in a small buffer of their own instead of pushing status, job and letter
+    events out of the history.
+    """
+
+    def __init__(self, history=1000, token_history=200):
+        self._events = deque(maxlen=history)
+        self._tokens = deque(maxlen=token_history)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._listeners = 0
+        self.closed = False
+
+    @property
+    def listeners(self):
+        return self._listeners
+
+    def publish(self, event_type, data):
+        with self._cond:
+            self._seq += 1
+            events = self._tokens if event_type == "token" else self._events
+            events.append((self._seq, event_type, data))
+            self._cond.notify_all()
+
+    def _pending(self, after):
+        return sorted(e for events in (self._events, self._tokens) for e in events if e[0] > after)
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def listen(self, after=0, heartbeat=15):
+        """Yield (id, type, data) for events after `after`, waiting for new
+        ones until the channel is closed. Yields None every `heartbeat`
+        seconds without events so the caller can keep the connection alive."""
+        with self._cond:
+            self._listeners += 1
+        try:
+            while True:
+                with self._cond:
+                    pending = self._pending(after)
+                    if not pending:
+                        if self.closed:
+                            return
+                        self._cond.wait(heartbeat)
+                        pending = self._pending(after)
+                if not pending:
+                    yield None
+                    continue
+                for event in pending:
+                    after = event[0]
+                    yield event
+        finally:
+            with self._cond:
+                self._listeners -= 1
+
+
+_channels = {}
+_channels_lock = threading.Lock()
+
+
+def open_channel(run_id):
+    with _channels_lock:
+        if run_id not in _channels:
+            _channels[run_id] = EventChannel()
+        return _channels[run_id]
+
+
+def get_channel(run_id):
+    if not run_id:
+        return None
+    with _channels_lock:
+        return _channels.get(run_id)
+
+
+def drop_channel(run_id):
+    with _channels_lock:
+        _channels.pop(run_id, None)
+
+
+def publish(run_id, event_type, /, **data):
+    """Send an event to the run's listeners. A no-op for runs without a
+    channel, e.g. CLI runs."""
+    channel = get_channel(run_id)
+    if channel is not None:
+        data.setdefault("time", time.time())
+        channel.publish(event_type, data)
+
+
+def has_listeners(run_id):
+    channel = get_channel(run_id)
+    return channel is not None and channel.listeners > 0
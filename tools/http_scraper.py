@@ -0,0 +1,201 @@
+# tools/http_scraper.py
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import httpx
+from lxml import html as lxml_html
+
+from tools import metrics
+from tools.rate_limiter import get_rate_limiter
+from tools.linkedin_scraper import get_base_url, known_description, make_job
+
+# LinkedIn's public job pages, served without a login.
+SEARCH_PATH = "/jobs-guest/jobs/api/seeMoreJobPostings/search"
+POSTING_PATH = "/jobs-guest/jobs/api/jobPosting/"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+)
+JOB_ID = re.compile(r"(\d{5,})")
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class JobSiteClient:
+    """One keep-alive connection pool shared by every search of the
+    process. Requests take their turn from the shared rate limiter, so
+    concurrent requests only overlap their latency, they never raise the
+    request rate."""
+
+    def __init__(self, config):
+        scraping_config = config.get("scraping", {})
+        self.settings = client_settings(config)
+        self.base_url = get_base_url(config)
+        self.concurrency = max(1, scraping_config.get("http_concurrency", 4))
+        self.retries = scraping_config.get("http_retries", 3)
+        self.limiter = get_rate_limiter(config)
+        self.client = httpx.Client(
+            base_url=self.base_url,
+            headers={"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"},
+            timeout=scraping_config.get("http_timeout_seconds", 30),
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+            follow_redirects=True,
+        )
+
+    def get(self, path, **params):
+        """Text of the page, or "" when it does not exist."""
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            response = self.client.get(path, params=params or None)
+            if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                break
+            # Rate limited or briefly unavailable: every thread holds off,
+            # for as long as the server asks if it says.
+            retry_after = response.headers.get("Retry-After", "")
+            delay = float(retry_after) if retry_after.isdigit() else 5 * 2 ** attempt
+            print(f"⚠️ {response.status_code} from {path}, retrying in {delay:.0f}s")
+            self.limiter.back_off(delay)
+        if response.status_code in (400, 404):
+            return ""
+        response.raise_for_status()
+        return response.text
+
+    def close(self):
+        self.client.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def client_settings(config):
+    scraping_config = config.get("scraping", {})
+    keys = (
+        "http_concurrency", "http_retries", "http_timeout_seconds",
+        "min_delay_seconds", "max_delay_seconds", "requests_per_minute", "burst",
+    )
+    return (get_base_url(config),) + tuple(scraping_config.get(key) for key in keys)
+
+
+def get_client(config):
+    """Process-wide client for the `scraping` section of config.yaml,
+    rebuilt when that section changes."""
+    global _client
+    with _client_lock:
+        if _client is None or _client.settings != client_settings(config):
+            # The old client is not closed: searches of other runs may
+            # still be using it. It is dropped once they are done with it.
+            _client = JobSiteClient(config)
+        return _client
+
+
+def _text(element):
+    for br in element.iter("br"):
+        br.tail = "\n" + (br.tail or "")
+    for block in element.iter("p", "li", "div"):
+        block.tail = "\n" + (block.tail or "")
+    lines = (line.strip() for line in element.text_content().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _first_text(tree, xpath):
+    found = tree.xpath(xpath)
+    return _text(found[0]) if found else ""
+
+
+def parse_search_page(text):
+    """Cards of one public search results page as dicts with job_id,
+    job_title and company."""
+    if not text.strip():
+        return []
+    cards = []
+    tree = lxml_html.fromstring(text)
+    for card in tree.xpath("//div[contains(@class, 'base-card')]"):
+        urn = card.get("data-entity-urn", "")
+        links = card.xpath(".//a[contains(@class, 'base-card__full-link')]/@href")
+        match = JOB_ID.search(urn) or (JOB_ID.search(links[0].split("?")[0]) if links else None)
+        if not match:
+            continue
+        cards.append({
+            "job_id": match.group(1),
+            "job_title": _first_text(card, ".//h3[contains(@class, 'base-search-card__title')]"),
+            "company": _first_text(card, ".//h4[contains(@class, 'base-search-card__subtitle')]"),
+        })
+    return cards
+
+
+def parse_posting(text):
+    if not text.strip():
+        return ""
+    tree = lxml_html.fromstring(text)
+    return _first_text(tree, "//div[contains(@class, 'show-more-less-html__markup')]")
+
+
+def scrape_jobs(keyword, location, max_jobs=25, config=None, job_index=None, on_job=None):
+    jobs = []
+    for job in iter_jobs(keyword, location, max_jobs, config, job_index):
+        jobs.append(job)
+        if on_job:
+            on_job(job)
+    return jobs
+
+
+def iter_jobs(keyword, location, max_jobs=25, config=None, job_index=None):
+    """Like linkedin_scraper.iter_jobs, but over plain HTTP: results pages
+    are read in order and the descriptions of each page are fetched
+    concurrently over the shared client."""
+    config = config or {"scraping": {}}
+    client = get_client(config)
+
+    print(f"🔍 Searching '{keyword}' in '{location}' (HTTP)")
+    seen_links = set()
+    found = 0
+    start = 0
+
+    executor = ThreadPoolExecutor(max_workers=client.concurrency)
+    try:
+        while found < max_jobs:
+            with metrics.timer("jobbot_page_load_seconds"):
+                cards = parse_search_page(client.get(
+                    SEARCH_PATH, keywords=keyword, location=location, start=start,
+                ))
+            if not cards:
+                break
+            start += len(cards)
+
+            batch = []
+            for card in cards:
+                link = f"{client.base_url}/jobs/view/{card['job_id']}/"
+                if link in seen_links or found + len(batch) >= max_jobs:
+                    continue
+                seen_links.add(link)
+                description = known_description(job_index, link, card["job_title"], card["company"])
+                if description is None:
+                    description = executor.submit(_fetch_description, client, card["job_id"])
+                batch.append((card, link, description))
+
+            for card, link, description in batch:
+                found += 1
+                if not isinstance(description, str):
+                    description = description.result()
+                yield make_job(card["job_title"], card["company"], link, description)
+    finally:
+        # A caller that stops early does not wait for descriptions it will not read.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    print(f"✅ Extracted {found} jobs")
+
+
+def _fetch_description(client, job_id):
+    try:
+        with metrics.timer("jobbot_description_wait_seconds"):
+            return parse_posting(client.get(POSTING_PATH + quote(job_id)))
+    except Exception as e:
+        print(f"⚠️ Could not read job {job_id}: {e}")
+        return ""
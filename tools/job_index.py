@@ -0,0 +1,115 @@
+# tools/job_index.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+def posting_hash(job):
+    """Hash of the parts of a posting a cover letter depends on."""
+    parts = [job.get("job_title") or "", job.get("company") or "", job.get("job_description") or ""]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class JobIndex:
+    """
+    Persistent SQLite index of every posting seen across runs.
+    The scraper uses it to skip reading descriptions it already has, as
+    long as they were read less than description_max_age_days ago; older
+    ones are read again so edited postings are picked up.
+    Letters need no index of their own: a posting whose title, company and
+    description are unchanged gets its letter from the LLM cache.
+    """
+
+    def __init__(self, path="cache/jobs.sqlite", description_max_age_days=7):
+        self.path = path
+        self.description_max_age = description_max_age_days * 86400
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_link TEXT PRIMARY KEY,
+                job_title TEXT,
+                company TEXT,
+                job_description TEXT,
+                content_hash TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                described_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs(last_seen);
+            """
+        )
+        # Indexes from before descriptions expired; their rows count as stale.
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "described_at" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN described_at REAL")
+        self._conn.commit()
+
+    def get(self, job_link):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_link = ?", (job_link,)).fetchone()
+        return dict(row) if row else None
+
+    def description_is_fresh(self, row):
+        """Whether a stored posting's description may be used instead of
+        opening the posting again."""
+        return row["described_at"] is not None and time.time() - row["described_at"] < self.description_max_age
+
+    def upsert(self, job):
+        """Record a posting seen in this run. Returns 'new', 'changed' or 'unchanged'."""
+        content_hash = posting_hash(job)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, described_at FROM jobs WHERE job_link = ?", (job["job_link"],)
+            ).fetchone()
+            if row is None:
+                status = "new"
+                self._conn.execute(
+                    "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job["job_link"], job.get("job_title"), job.get("company"),
+                     job.get("job_description"), content_hash, now, now, now),
+                )
+            else:
+                status = "unchanged" if row["content_hash"] == content_hash else "changed"
+                # The scraper only reuses fresh descriptions, so a changed or
+                # stale one was just read from the posting.
+                described_at = row["described_at"]
+                if status == "changed" or not self.description_is_fresh(row):
+                    described_at = now
+                self._conn.execute(
+                    "UPDATE jobs SET job_title = ?, company = ?, job_description = ?, "
+                    "content_hash = ?, last_seen = ?, described_at = ? WHERE job_link = ?",
+                    (job.get("job_title"), job.get("company"), job.get("job_description"),
+                     content_hash, now, described_at, job["job_link"]),
+                )
+            self._conn.commit()
+        return status
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_job_index(config=None):
+    """Process-wide index built from the `job_index` section of config.yaml,
+    or None when the index is disabled."""
+    global _index
+    index_config = (config or {}).get("job_index", {})
+    if not index_config.get("enabled", True):
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = JobIndex(
+                index_config.get("path", "cache/jobs.sqlite"),
+                description_max_age_days=index_config.get("description_max_age_days", 7),
+            )
+        return _index
@@ -0,0 +1,103 @@
+# tools/job_ranker.py
+
+import json
+import re
+
+import numpy as np
+
+TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def tokenize(text):
+    # Keeps "c++", "c#" and "node.js" whole; drops sentence-final dots.
+    return [token.rstrip(".") for token in TOKEN.findall(str(text or "").lower())]
+
+
+def resume_query(structured_resume):
+    """The text jobs are scored against: the resume's skills, or the whole
+    structured resume when it is not valid JSON or lists no skills."""
+    try:
+        data = json.loads(structured_resume)
+    except (TypeError, ValueError):
+        return str(structured_resume or "")
+    skills = data.get("skills") if isinstance(data, dict) else None
+    if not skills:
+        return str(structured_resume)
+    if isinstance(skills, dict):
+        skills = [item for group in skills.values() for item in (group if isinstance(group, list) else [group])]
+    return " ".join(str(skill) for skill in skills)
+
+
+def tfidf_scores(documents, query):
+    """
+    Cosine similarity between each document and the query over sublinear
+    TF-IDF weights, with document frequencies taken from `documents`.
+    Works on (document, term) pairs, so memory grows with the text, not
+    with documents x vocabulary.
+    """
+    if not documents:
+        return np.zeros(0)
+
+    vocabulary = {}
+    rows, cols = [], []
+    for row, text in enumerate(documents):
+        for token in tokenize(text):
+            rows.append(row)
+            cols.append(vocabulary.setdefault(token, len(vocabulary)))
+    query_cols = [vocabulary[token] for token in tokenize(query) if token in vocabulary]
+    if not rows or not query_cols:
+        return np.zeros(len(documents))
+
+    size = len(vocabulary)
+    pairs, counts = np.unique(np.array(rows) * size + np.array(cols), return_counts=True)
+    pair_rows, pair_cols = pairs // size, pairs % size
+
+    idf = np.log((1 + len(documents)) / (1 + np.bincount(pair_cols, minlength=size))) + 1
+    weights = np.log1p(counts) * idf[pair_cols]
+    norms = np.sqrt(np.bincount(pair_rows, weights=weights ** 2, minlength=len(documents)))
+
+    query_weights = np.log1p(np.bincount(query_cols, minlength=size)) * idf
+    query_weights /= np.linalg.norm(query_weights)
+
+    dots = np.bincount(pair_rows, weights=weights * query_weights[pair_cols], minlength=len(documents))
+    return np.divide(dots, norms, out=np.zeros(len(documents)), where=norms > 0)
+
+
+def embedding_scores(documents, query, embeddings):
+    """Cosine similarity using a LangChain embeddings model (e.g. OllamaEmbeddings)."""
+    if not documents:
+        return np.zeros(0)
+    vectors = np.asarray(embeddings.embed_documents([str(d or "") for d in documents]), dtype=float)
+    target = np.asarray(embeddings.embed_query(query), dtype=float)
+    norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(target)
+    return np.divide(vectors @ target, norms, out=np.zeros(len(documents)), where=norms > 0)
+
+
+def select(scores, top_k=None, threshold=0.0):
+    """Boolean mask of the jobs that should get letters: score at least
+    `threshold` and, with top_k, among the top_k best (earlier jobs win ties)."""
+    keep = scores >= threshold
+    if top_k is not None and keep.sum() > top_k:
+        order = np.argsort(-scores, kind="stable")
+        best = np.zeros(len(scores), dtype=bool)
+        best[order[:top_k]] = True
+        keep &= best
+    return keep
+
+
+def rank_jobs(jobs, structured_resume, top_k=None, threshold=0.0, embeddings=None):
+    """
+    Score every job's description against the resume and return
+    (scored_jobs, selected_jobs), both in the original order. Each job is a
+    copy carrying its score under "relevance".
+    """
+    query = resume_query(structured_resume)
+    descriptions = [f"{job.get('job_title', '')} {job.get('job_description', '')}" for job in jobs]
+    if embeddings is not None:
+        scores = embedding_scores(descriptions, query, embeddings)
+    else:
+        scores = tfidf_scores(descriptions, query)
+
+    scored = [{**job, "relevance": round(float(score), 4)} for job, score in zip(jobs, scores)]
+    keep = select(scores, top_k, threshold)
+    return scored, [job for job, kept in zip(scored, keep) if kept]
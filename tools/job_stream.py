@@ -0,0 +1,110 @@
+# tools/job_stream.py
+
+import queue
+import threading
+
+_DONE = object()
+
+
+class JobStream:
+    """
+    Hands jobs from the scraping branch of the graph to the letter-writing
+    branch while both are running, and the parsed resume from the resume
+    branch to the letter writer.
+    """
+
+    def __init__(self):
+        self._jobs = queue.Queue()
+        self._keys = {}
+        self._records = {}
+        self._withdrawn = set()
+        self._lock = threading.Lock()
+        self._resume_ready = threading.Event()
+        self._resume = None
+        self.cancelled = False
+
+    def put(self, job, key):
+        """Publish a scraped job. key orders the job in the final output. A
+        job_link already published is not handed out again, but a copy with
+        a lower key becomes its record (see record()). Returns False for
+        duplicates."""
+        link = job["job_link"]
+        with self._lock:
+            if link in self._keys:
+                if key < self._keys[link]:
+                    self._keys[link] = key
+                    self._records[link] = job
+                return False
+            self._keys[link] = key
+            self._records[link] = job
+        self._jobs.put(job)
+        return True
+
+    def record(self, job):
+        """The copy of job kept for its link: the one that comes first in
+        search order, which may not be the copy that was handed out."""
+        with self._lock:
+            return self._records.get(job["job_link"], job)
+
+    def withdraw(self, link):
+        """Take back a published job that turned out to be a duplicate;
+        its letter, if one was written, is left out of the output."""
+        with self._lock:
+            self._withdrawn.add(link)
+
+    def withdrawn(self, job):
+        link = job["job_link"] if isinstance(job, dict) else job.job_link
+        with self._lock:
+            return link in self._withdrawn
+
+    def close(self):
+        self._jobs.put(_DONE)
+
+    def __iter__(self):
+        while True:
+            job = self._jobs.get()
+            if job is _DONE:
+                return
+            yield job
+
+    def sort_key(self, job):
+        """Output position of a job dict or an Application."""
+        link = job["job_link"] if isinstance(job, dict) else job.job_link
+        with self._lock:
+            return self._keys.get(link, ())
+
+    def set_resume(self, resume_data):
+        self._resume = resume_data
+        self._resume_ready.set()
+
+    def fail_resume(self):
+        # Nothing to write letters with; tell the scraper to stop early.
+        self.cancel()
+        self._resume_ready.set()
+
+    def cancel(self):
+        """Stop starting new searches; jobs already published still get letters."""
+        self.cancelled = True
+
+    def wait_resume(self):
+        self._resume_ready.wait()
+        return self._resume
+
+
+_streams = {}
+_streams_lock = threading.Lock()
+
+
+def get_job_stream(run_id):
+    """The stream for a graph run, created on first use. None without a run_id."""
+    if not run_id:
+        return None
+    with _streams_lock:
+        if run_id not in _streams:
+            _streams[run_id] = JobStream()
+        return _streams[run_id]
+
+
+def drop_job_stream(run_id):
+    with _streams_lock:
+        _streams.pop(run_id, None)
@@ -1,38 +1,77 @@
 # tools/linkedin_scraper.py
 
+import json
 import os
+import re
+import sys
+import threading
 import time
-import random
-from urllib.parse import quote
+from urllib.parse import quote, urlparse, urlunparse
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
+from tools import metrics
+from tools.rate_limiter import get_rate_limiter
 
+# Selenium is imported where a browser is used, so the HTTP backend and
+# importers of the helpers below do not load it.
+
+
+DEFAULT_BASE_URL = "https://www.linkedin.com"
+
+
+def get_base_url(config):
+    return config.get("scraping", {}).get("base_url", DEFAULT_BASE_URL).rstrip("/")
+
+
+# Pooled browsers start from several threads; their login prompts take turns.
+_login_prompt_lock = threading.Lock()
+
+
+def login_to_linkedin(browser, config=None, profile_index=0):
+    config = config or {}
+    base_url = get_base_url(config)
 
-def login_to_linkedin(browser):
     print("🌐 Opening LinkedIn...")
-    browser.get("https://www.linkedin.com/")
-    time.sleep(5)
+    browser.get(f"{base_url}/")
+    time.sleep(config.get("scraping", {}).get("login_wait_seconds", 5))
 
     if "login" in browser.current_url:
-        print("🔐 Please log in manually.")
-        input("Press Enter after logging in...")
+        profile = profile_path(config, profile_index) or "the default profile"
+        if sys.stdin is None or not sys.stdin.isatty():
+            # No one can answer a prompt (the web app, a service): fail
+            # instead of blocking the search.
+            print(f"❌ Chrome profile {profile} is not logged in to LinkedIn. "
+                  f"Run python main.py from a terminal once to log it in.")
+            return False
+        with _login_prompt_lock:
+            print(f"🔐 Please log in manually in the Chrome window for {profile}.")
+            input("Press Enter after logging in...")
+
+    return urlparse(base_url).netloc in browser.current_url
 
-    return "linkedin.com" in browser.current_url
+
+def profile_path(config, profile_index=0):
+    chrome_path = config.get("selenium", {}).get("chrome_profile_path")
+    # Chrome locks a profile directory, so extra pooled browsers get their own.
+    if chrome_path and profile_index:
+        chrome_path = f"{chrome_path}-{profile_index}"
+    return chrome_path
 
 
-def get_driver_options(config):
+def get_driver_options(config, profile_index=0):
+    from selenium.webdriver.chrome.options import Options
+
     options = Options()
+    selenium_config = config.get("selenium", {})
     
-    chrome_path = config.get("selenium", {}).get("chrome_profile_path")
+    chrome_path = profile_path(config, profile_index)
     if chrome_path:
         options.add_argument(f"--user-data-dir={chrome_path}")
     
     options.add_argument("--profile-directory=Default")
     options.add_argument("--start-maximized")
+
+    if selenium_config.get("headless", False):
+        options.add_argument("--headless=new")
     
     if config.get("scraping", {}).get("anti_detection", True):
         options.add_argument("--disable-blink-features=AutomationControlled")
@@ -44,20 +83,24 @@ def get_driver_options(config):
     return options
 
 
-def human_delay(config):
-    scraping_config = config.get("scraping", {})
-    min_delay = scraping_config.get("min_delay_seconds", 2.0)
-    max_delay = scraping_config.get("max_delay_seconds", 4.0)
-    time.sleep(random.uniform(min_delay, max_delay))
+def normalize_job_link(link):
+    # LinkedIn appends per-visit tracking parameters; drop them so the same
+    # posting has the same link in every run.
+    parts = urlparse(link)
+    return urlunparse(parts._replace(query="", fragment=""))
 
 
-def scrape_jobs(keyword, location, max_jobs=25, config=None):
-    if config is None:
-        config = {"scraping": {}, "selenium": {}}
-    
-    print(f"🔍 Searching '{keyword}' in '{location}'")
+def start_browser(config, profile_index=0):
+    """Launch Chrome and make sure the LinkedIn session is logged in.
+    Returns None if login fails."""
+    with metrics.timer("jobbot_browser_start_seconds"):
+        return _start_browser(config, profile_index)
+
 
-    options = get_driver_options(config)
+def _start_browser(config, profile_index):
+    from selenium import webdriver
+
+    options = get_driver_options(config, profile_index)
     browser = webdriver.Chrome(options=options)
     
     if config.get("scraping", {}).get("anti_detection", True):
@@ -68,78 +111,268 @@ def scrape_jobs(keyword, location, max_jobs=25, config=None):
                 Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
             """
         })
-    
-    wait = WebDriverWait(browser, 30)
 
-    if not login_to_linkedin(browser):
+    if not login_to_linkedin(browser, config, profile_index):
         print("❌ Login failed")
         browser.quit()
-        return []
+        return None
 
-    search_url = (
-        "https://www.linkedin.com/jobs/search/"
-        f"?keywords={quote(keyword)}&location={quote(location)}"
-    )
-    browser.get(search_url)
+    return browser
+
+
+# One round trip for every card on the page instead of a find_element,
+# .text and get_attribute call per card.
+CARDS_SCRIPT = """
+var cards = [];
+document.querySelectorAll("div.job-card-container").forEach(function (card, index) {
+    var link = card.querySelector("a[href*='/jobs/view']");
+    if (!link) return;
+    var company = card.querySelector("h4 > a");
+    cards.push({
+        index: index,
+        title: (link.innerText || link.textContent).trim().split("\\n")[0],
+        company: company ? (company.innerText || company.textContent).trim() : "",
+        link: link.href
+    });
+});
+return JSON.stringify({
+    cards: cards,
+    has_next: !!document.querySelector(".jobs-search-pagination__button--next:not([disabled])")
+});
+"""
+
+CLICK_SCRIPT = """
+var card = document.querySelectorAll("div.job-card-container")[arguments[0]];
+card.scrollIntoView(true);
+(card.querySelector("a[href*='/jobs/view']") || card).click();
+"""
+
+DESCRIPTION_SCRIPT = """
+var desc = document.querySelector("div.jobs-description-content__text");
+return desc ? (desc.innerText || desc.textContent).trim() : null;
+"""
+
+
+def _description_loaded(link, previous):
+    """Wait condition for the detail pane after a card click. The pane
+    keeps showing the posting opened before until the click lands, so its
+    text only counts once it differs from previous, or once the page URL
+    names the clicked job (two postings can share a description)."""
+    job_id = re.search(r"/jobs/view/(\d+)", link)
+    marker = f"currentJobId={job_id.group(1)}" if job_id else None
+
+    def loaded(driver):
+        text = driver.execute_script(DESCRIPTION_SCRIPT)
+        if text and (text != previous or (marker and marker in driver.current_url)):
+            return text
+        return None
+    return loaded
+
+
+def scrape_jobs(keyword, location, max_jobs=25, config=None, browser=None, job_index=None, on_job=None):
+    jobs = []
+    for job in iter_jobs(keyword, location, max_jobs, config, browser, job_index):
+        jobs.append(job)
+        if on_job:
+            on_job(job)
+    return jobs
+
+
+def iter_jobs(keyword, location, max_jobs=25, config=None, browser=None, job_index=None):
+    """Yield each job as soon as it is read, so callers can start on it
+    while the rest of the search is still being scraped."""
+    if config is None:
+        config = {"scraping": {}, "selenium": {}}
+
+    if config.get("scraping", {}).get("backend", "selenium") == "http":
+        from tools.http_scraper import iter_jobs as iter_jobs_http
+        yield from iter_jobs_http(keyword, location, max_jobs, config, job_index)
+        return
     
-    page_wait = config.get("scraping", {}).get("page_load_wait_seconds", 3)
-    time.sleep(page_wait)
+    print(f"🔍 Searching '{keyword}' in '{location}'")
+
+    # A browser passed in belongs to the caller (usually a BrowserPool) and is
+    # left open; otherwise this search starts and quits its own.
+    owns_browser = browser is None
+    if owns_browser:
+        browser = start_browser(config)
+        if browser is None:
+            return
 
-    wait.until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, "div.job-card-container"))
+    try:
+        if config.get("scraping", {}).get("bulk_extract", True):
+            yield from _iter_search_pages(browser, keyword, location, max_jobs, config, job_index)
+        else:
+            yield from _iter_search_results(browser, keyword, location, max_jobs, config, job_index)
+    finally:
+        if owns_browser:
+            browser.quit()
+
+
+def _search_url(config, keyword, location, start=0):
+    url = (
+        f"{get_base_url(config)}/jobs/search/"
+        f"?keywords={quote(keyword)}&location={quote(location)}"
     )
+    return f"{url}&start={start}" if start else url
+
+
+def _load_search_page(browser, wait, url, config):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+
+    get_rate_limiter(config).acquire()
+    with metrics.timer("jobbot_page_load_seconds"):
+        browser.get(url)
+        wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "div.job-card-container"))
+        )
+
+
+def known_description(job_index, link, title, company):
+    # Postings already in the index with the same card details keep
+    # their stored description instead of being opened again, until it
+    # is old enough that the posting may have been edited.
+    known = job_index.get(link) if job_index else None
+    if (known and known["job_title"] == title and known["company"] == company
+            and job_index.description_is_fresh(known)):
+        return known["job_description"] or ""
+    return None
+
+
+def make_job(title, company, link, description):
+    return {
+        "job_title": title,
+        "company": company,
+        "job_link": link,
+        "job_description": description,
+        "date_applied": time.strftime("%Y-%m-%d"),
+        "status": "pending"
+    }
+
+
+def _iter_search_pages(browser, keyword, location, max_jobs, config, job_index=None):
+    """Read the card list of each results page with one script call, open
+    only the cards whose description is not already known, and follow the
+    results pages until max_jobs jobs have been read."""
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    wait = WebDriverWait(browser, 30)
+    seen_links = set()
+    found = 0
+    start = 0
+    page_number = 1
+
+    while found < max_jobs:
+        try:
+            _load_search_page(browser, wait, _search_url(config, keyword, location, start), config)
+        except Exception:
+            if not start:
+                raise
+            print(f"⚠️ Results page {page_number} did not load, stopping")
+            break
+        results = json.loads(browser.execute_script(CARDS_SCRIPT))
+        cards = results["cards"]
+        print(f"🔍 Found {len(cards)} job cards on results page {page_number}")
+
+        for card in cards:
+            if found >= max_jobs:
+                break
+            try:
+                link = normalize_job_link(card["link"])
+                if link in seen_links:
+                    continue
+                seen_links.add(link)
+
+                title, company = card["title"], card["company"]
+                description = known_description(job_index, link, title, company)
+                if description is None:
+                    description = _read_description_at(browser, card["index"], link, wait, config)
+
+                found += 1
+                yield make_job(title, company, link, description)
+
+            except Exception as e:
+                print(f"⚠️ Skipped job: {e}")
+
+        if not cards or not results["has_next"]:
+            break
+        start += len(cards)
+        page_number += 1
+
+    print(f"✅ Extracted {found} jobs")
+
+
+def _read_description_at(browser, index, link, wait, config):
+    previous = browser.execute_script(DESCRIPTION_SCRIPT)
+    # Each click loads a posting, so it waits for its turn like a page load.
+    get_rate_limiter(config).acquire()
+    with metrics.timer("jobbot_card_click_seconds"):
+        browser.execute_script(CLICK_SCRIPT, index)
+
+    try:
+        with metrics.timer("jobbot_description_wait_seconds"):
+            return wait.until(_description_loaded(link, previous))
+    except Exception:
+        return ""
+
+
+def _iter_search_results(browser, keyword, location, max_jobs, config, job_index=None):
+    # Per-card WebDriver calls on the first results page only; kept for
+    # pages where CARDS_SCRIPT's selectors do not match.
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    wait = WebDriverWait(browser, 30)
+    _load_search_page(browser, wait, _search_url(config, keyword, location), config)
 
     job_cards = browser.find_elements(By.CSS_SELECTOR, "div.job-card-container")
     print(f"🔍 Found {len(job_cards)} job cards")
 
-    jobs = []
+    found = 0
     seen_links = set()
 
     for card in job_cards[:max_jobs]:
         try:
             link_el = card.find_element(By.XPATH, ".//a[contains(@href,'/jobs/view')]")
             title = link_el.text.strip().split("\n")[0]
-            link = link_el.get_attribute("href")
+            link = normalize_job_link(link_el.get_attribute("href"))
 
             if link in seen_links:
                 continue
             seen_links.add(link)
 
-            browser.execute_script("arguments[0].scrollIntoView(true);", card)
-            card.click()
-            human_delay(config)
-
-            try:
-                desc_el = wait.until(
-                    EC.presence_of_element_located(
-                        (By.CSS_SELECTOR, "div.jobs-description-content__text")
-                    )
-                )
-                description = desc_el.text.strip()
-            except Exception:
-                description = ""
-
             try:
                 company_el = card.find_element(By.CSS_SELECTOR, "h4 > a")
                 company = company_el.text.strip()
             except Exception:
                 company = ""
 
-            jobs.append({
-                "job_title": title,
-                "company": company,
-                "job_link": link,
-                "job_description": description,
-                "date_applied": time.strftime("%Y-%m-%d"),
-                "status": "pending"
-            })
+            description = known_description(job_index, link, title, company)
+            if description is None:
+                description = _read_description(browser, card, link, wait, config)
+
+            found += 1
+            yield make_job(title, company, link, description)
 
         except Exception as e:
             print(f"⚠️ Skipped job: {e}")
 
-    browser.quit()
-    print(f"✅ Extracted {len(jobs)} jobs")
-    return jobs
+    print(f"✅ Extracted {found} jobs")
+
+
+def _read_description(browser, card, link, wait, config):
+    previous = browser.execute_script(DESCRIPTION_SCRIPT)
+    get_rate_limiter(config).acquire()
+    with metrics.timer("jobbot_card_click_seconds"):
+        browser.execute_script("arguments[0].scrollIntoView(true);", card)
+        card.click()
+
+    try:
+        with metrics.timer("jobbot_description_wait_seconds"):
+            return wait.until(_description_loaded(link, previous))
+    except Exception:
+        return ""
 
 
 if __name__ == "__main__":
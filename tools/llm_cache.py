@@ -0,0 +1,159 @@
+# tools/llm_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def make_key(model, template, inputs, temperature):
+    """Content hash identifying one LLM call: same key, same answer."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "template": template,
+            "inputs": inputs,
+            "temperature": temperature,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Persistent SQLite cache of LLM responses.
+    Entries older than max_age_days are dropped, and once the stored responses
+    exceed max_size_mb the least recently used ones are evicted.
+    """
+
+    EVICT_EVERY = 50
+
+    def __init__(self, path="cache/llm_cache.sqlite", max_size_mb=100, max_age_days=30, enabled=True):
+        self.path = path
+        self.max_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else 0
+        self.max_age = max_age_days * 86400 if max_age_days else 0
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if enabled:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses(last_used)")
+            self._conn.commit()
+            self.evict()
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.max_age and now - row[1] > self.max_age):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            self._conn.commit()
+            self._puts += 1
+            due = self._puts % self.EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def get_or_create(self, key, produce, bypass=False):
+        """Return the cached response for key, calling produce() on a miss.
+        With bypass=True the cache is not read but the fresh result is stored."""
+        if bypass:
+            with self._lock:
+                self.misses += 1
+        else:
+            value = self.get(key)
+            if value is not None:
+                return value
+        value = produce()
+        self.put(key, value)
+        return value
+
+    def evict(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self.max_age:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age,)
+                )
+            if self.max_bytes:
+                total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+                if total > self.max_bytes:
+                    rows = self._conn.execute(
+                        "SELECT key, size FROM responses ORDER BY last_used ASC"
+                    ).fetchall()
+                    stale = []
+                    for key, size in rows:
+                        if total <= self.max_bytes:
+                            break
+                        stale.append((key,))
+                        total -= size
+                    self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+            self._conn.commit()
+
+    def stats(self):
+        entries, size = 0, 0
+        if self.enabled:
+            with self._lock:
+                entries, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache(config=None):
+    """Process-wide cache built from the `llm_cache` section of config.yaml."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            cache_config = (config or {}).get("llm_cache", {})
+            _cache = LLMCache(
+                path=cache_config.get("path", "cache/llm_cache.sqlite"),
+                max_size_mb=cache_config.get("max_size_mb", 100),
+                max_age_days=cache_config.get("max_age_days", 30),
+                enabled=cache_config.get("enabled", True),
+            )
+        return _cache
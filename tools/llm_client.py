@@ -0,0 +1,383 @@
+# tools/llm_client.py
+
+import threading
+import time
+
+from tools import metrics
+
+
+class LLMClient:
+    """
+    Everything the process sends to one Ollama server goes through here.
+    Chat and embedding models share one pooled HTTP transport, so requests
+    reuse open connections instead of each node opening its own; every
+    request asks Ollama to keep the model loaded for keep_alive seconds;
+    and warm_up() loads the models ahead of the first real request, so no
+    run pays the cold load.
+    """
+
+    def __init__(self, host, keep_alive=1800, max_connections=16):
+        self.host = host.rstrip("/")
+        self.keep_alive = keep_alive
+        self.max_connections = max_connections
+        self._transport = None
+        self._http = None
+        self._lock = threading.Lock()
+        self._models = {}     # model -> "loading", "ready" or the last error
+        self._warm_up_thread = None
+
+    def _connections(self):
+        # Made on first use, so importing the app does not import httpx.
+        with self._lock:
+            if self._transport is None:
+                import httpx
+                self._transport = httpx.HTTPTransport(limits=httpx.Limits(
+                    max_connections=self.max_connections, max_keepalive_connections=self.max_connections,
+                ))
+                # No timeout: loading a large model can take minutes.
+                self._http = httpx.Client(base_url=self.host, transport=self._transport, timeout=None)
+            return self._transport, self._http
+
+    @property
+    def transport(self):
+        return self._connections()[0]
+
+    def chat(self, model, temperature=0.7, timeout=None, **kwargs):
+        from langchain_ollama import ChatOllama
+        return ChatOllama(
+            model=model,
+            temperature=temperature,
+            base_url=self.host,
+            keep_alive=self.keep_alive,
+            client_kwargs={"timeout": timeout},
+            # The async client cannot use a sync transport, so only the
+            # sync one shares the pool.
+            sync_client_kwargs={"transport": self.transport},
+            **kwargs,
+        )
+
+    def embeddings(self, model):
+        from langchain_ollama import OllamaEmbeddings
+        return OllamaEmbeddings(
+            model=model,
+            base_url=self.host,
+            keep_alive=self.keep_alive,
+            sync_client_kwargs={"transport": self.transport},
+        )
+
+    def _load(self, model, kind):
+        http = self._connections()[1]
+        # A request without a prompt (or with empty input) only loads the model.
+        if kind == "embed":
+            payload = {"model": model, "input": "", "keep_alive": self.keep_alive}
+            response = http.post("/api/embed", json=payload)
+        else:
+            payload = {"model": model, "keep_alive": self.keep_alive, "stream": False}
+            response = http.post("/api/generate", json=payload)
+        response.raise_for_status()
+
+    def ping(self, timeout=5.0):
+        """True when the server answers."""
+        try:
+            self._connections()[1].get("/", timeout=timeout).raise_for_status()
+            return True
+        except Exception:
+            return False
+
+    def warm_up(self, models):
+        """Load each (model, kind) pair now; kind is "chat" or "embed".
+        Returns True when all of them are loaded."""
+        loaded = True
+        for model, kind in models:
+            with self._lock:
+                if self._models.get(model) != "ready":
+                    self._models[model] = "loading"
+            start = time.perf_counter()
+            try:
+                self._load(model, kind)
+            except Exception as e:
+                with self._lock:
+                    repeated = self._models.get(model, "").startswith("error")
+                    self._models[model] = f"error: {e}"
+                if not repeated:
+                    print(f"⚠️ Could not load {model} on {self.host}: {e}")
+                loaded = False
+                continue
+            seconds = time.perf_counter() - start
+            metrics.observe("jobbot_llm_warm_up_seconds", seconds, model=model)
+            with self._lock:
+                self._models[model] = "ready"
+            print(f"🔥 {model} loaded in {seconds:.1f}s (kept for {self.keep_alive}s)")
+        return loaded
+
+    def start_warm_up(self, models, retry_seconds=10):
+        """Warm up in a background thread, retrying until every model has
+        loaded (Ollama may still be starting up next to the app)."""
+        models = list(models)
+        with self._lock:
+            if self._warm_up_thread is not None and self._warm_up_thread.is_alive():
+                return self._warm_up_thread
+            for model, _ in models:
+                self._models.setdefault(model, "loading")
+
+            def run():
+                while not self.warm_up(models):
+                    time.sleep(retry_seconds)
+
+            self._warm_up_thread = threading.Thread(target=run, name="llm-warm-up", daemon=True)
+            self._warm_up_thread.start()
+            return self._warm_up_thread
+
+    def status(self):
+        with self._lock:
+            models = dict(self._models)
+        return {
+            "host": self.host,
+            "ready": bool(models) and all(state == "ready" for state in models.values()),
+            "models": models,
+        }
+
+    def ready(self):
+        return self.status()["ready"]
+
+
+def models_to_load(config):
+    """The (model, kind) pairs a run will use with this config."""
+    models = [(config.get("llm", {}).get("model", "mistral"), "chat")]
+    ranking = config.get("ranking", {})
+    if ranking.get("enabled", False) and ranking.get("method", "tfidf") == "embeddings":
+        models.append((ranking.get("embedding_model", "nomic-embed-text"), "embed"))
+    return models
+
+
+def endpoint_failed(error):
+    """True for errors that say the endpoint is down or broken rather than
+    that the request was bad: the connection failed or dropped, or the
+    server answered 5xx. A request that merely timed out is not retried."""
+    import httpx
+    if isinstance(error, (ConnectionError, httpx.ConnectError, httpx.ConnectTimeout,
+                          httpx.RemoteProtocolError, httpx.ReadError, httpx.WriteError)):
+        return True
+    return getattr(error, "status_code", 0) >= 500
+
+
+class LLMRouter:
+    """
+    Spreads LLM calls over one or more Ollama endpoints. Each call goes to
+    the healthy endpoint with the fewest requests in flight. An endpoint
+    whose call fails with endpoint_failed() is ejected and the call is
+    retried on another; a background check pings every endpoint each
+    health_check_seconds, ejects the ones that stop answering and takes
+    them back (warming their models up again) once they answer. With every
+    endpoint ejected, calls still try them rather than fail outright. A
+    single endpoint is never ejected by a failed call, since there is
+    nowhere else to send the next one; only the health check takes it out.
+
+    It stands in for a single LLMClient: chat() and embeddings() return
+    models whose calls are routed, and warm-up and readiness cover all
+    endpoints.
+    """
+
+    def __init__(self, endpoints, health_check_seconds=10):
+        self.endpoints = list(endpoints)
+        if not self.endpoints:
+            raise ValueError("No Ollama endpoints configured")
+        self.health_check_seconds = health_check_seconds
+        self.models = []
+        self._lock = threading.Lock()
+        self._outstanding = {endpoint.host: 0 for endpoint in self.endpoints}
+        self._requests = {endpoint.host: 0 for endpoint in self.endpoints}
+        self._ejected = set()
+        self._closed = threading.Event()
+        if health_check_seconds:
+            threading.Thread(target=self._check_health, name="llm-health", daemon=True).start()
+
+    def _pick(self, tried):
+        with self._lock:
+            candidates = [e for e in self.endpoints if e not in tried]
+            healthy = [e for e in candidates if e.host not in self._ejected]
+            pool = healthy or candidates
+            if not pool:
+                return None
+            endpoint = min(pool, key=lambda e: (self._outstanding[e.host], self._requests[e.host]))
+            self._outstanding[endpoint.host] += 1
+            self._requests[endpoint.host] += 1
+            return endpoint
+
+    def _release(self, endpoint, failed=False):
+        with self._lock:
+            self._outstanding[endpoint.host] -= 1
+            newly_ejected = False
+            if not failed:
+                self._ejected.discard(endpoint.host)
+            elif len(self.endpoints) > 1:
+                newly_ejected = endpoint.host not in self._ejected
+                self._ejected.add(endpoint.host)
+        metrics.count("jobbot_llm_endpoint_requests_total", endpoint=endpoint.host,
+                      outcome="failed" if failed else "ok")
+        return newly_ejected
+
+    def call(self, fn):
+        """fn(endpoint) on the least busy healthy endpoint, retried on the
+        next one while endpoints fail. Other errors are raised as they are."""
+        tried = []
+        last_error = None
+        while True:
+            endpoint = self._pick(tried)
+            if endpoint is None:
+                if last_error is None:
+                    raise RuntimeError("No Ollama endpoints configured")
+                raise last_error
+            try:
+                result = fn(endpoint)
+            except Exception as e:
+                if not endpoint_failed(e):
+                    self._release(endpoint)
+                    raise
+                if self._release(endpoint, failed=True):
+                    print(f"⚠️ Ollama endpoint {endpoint.host} failed ({e}); ejected")
+                tried.append(endpoint)
+                last_error = e
+                continue
+            self._release(endpoint)
+            return result
+
+    def close(self):
+        """Stop the health checks."""
+        self._closed.set()
+
+    def _check_health(self):
+        while not self._closed.wait(self.health_check_seconds):
+            for endpoint in self.endpoints:
+                alive = endpoint.ping()
+                with self._lock:
+                    was_ejected = endpoint.host in self._ejected
+                    if alive:
+                        self._ejected.discard(endpoint.host)
+                    else:
+                        self._ejected.add(endpoint.host)
+                if alive and was_ejected:
+                    print(f"✅ Ollama endpoint {endpoint.host} is back")
+                    if self.models:
+                        endpoint.start_warm_up(self.models)
+                elif not alive and not was_ejected:
+                    print(f"⚠️ Ollama endpoint {endpoint.host} is not answering; ejected")
+
+    def chat(self, model, temperature=0.7, timeout=None, **kwargs):
+        return RoutedChat(self, model, temperature, timeout=timeout, **kwargs)
+
+    def embeddings(self, model):
+        return RoutedEmbeddings(self, model)
+
+    def warm_up(self, models):
+        self.models = list(models)
+        return all([endpoint.warm_up(self.models) for endpoint in self.endpoints])
+
+    def start_warm_up(self, models, retry_seconds=10):
+        self.models = list(models)
+        for endpoint in self.endpoints:
+            endpoint.start_warm_up(self.models, retry_seconds)
+
+    def status(self):
+        """Ready as soon as one endpoint that is not ejected has every model
+        loaded."""
+        endpoints = []
+        with self._lock:
+            for endpoint in self.endpoints:
+                endpoints.append({
+                    **endpoint.status(),
+                    "ejected": endpoint.host in self._ejected,
+                    "outstanding": self._outstanding[endpoint.host],
+                    "requests": self._requests[endpoint.host],
+                })
+        return {
+            "ready": any(e["ready"] and not e["ejected"] for e in endpoints),
+            "endpoints": endpoints,
+        }
+
+    def ready(self):
+        return self.status()["ready"]
+
+
+class RoutedChat:
+    """A chat model whose calls go through an LLMRouter. call(fn) runs
+    fn(chat_model) with the ChatOllama of the endpoint picked, so a caller
+    that streams can start over cleanly when the endpoint fails."""
+
+    def __init__(self, router, model, temperature=0.7, **kwargs):
+        self.router = router
+        self.model = model
+        self.temperature = temperature
+        self._kwargs = kwargs
+        self._models = {}    # host -> ChatOllama
+        self._lock = threading.Lock()
+
+    def _on(self, endpoint):
+        with self._lock:
+            if endpoint.host not in self._models:
+                self._models[endpoint.host] = endpoint.chat(self.model, self.temperature, **self._kwargs)
+            return self._models[endpoint.host]
+
+    def call(self, fn):
+        return self.router.call(lambda endpoint: fn(self._on(endpoint)))
+
+    def invoke(self, messages):
+        return self.call(lambda llm: llm.invoke(messages))
+
+
+class RoutedEmbeddings:
+    """OllamaEmbeddings whose calls go through an LLMRouter."""
+
+    def __init__(self, router, model):
+        self.router = router
+        self.model = model
+        self._models = {}    # host -> OllamaEmbeddings
+        self._lock = threading.Lock()
+
+    def _on(self, endpoint):
+        with self._lock:
+            if endpoint.host not in self._models:
+                self._models[endpoint.host] = endpoint.embeddings(self.model)
+            return self._models[endpoint.host]
+
+    def embed_documents(self, texts):
+        return self.router.call(lambda endpoint: self._on(endpoint).embed_documents(texts))
+
+    def embed_query(self, text):
+        return self.router.call(lambda endpoint: self._on(endpoint).embed_query(text))
+
+
+def endpoint_hosts(host, config=None):
+    """The Ollama endpoints to use: llm.endpoints from config.yaml when set,
+    otherwise host, which may list several separated by commas (as
+    OLLAMA_HOST can)."""
+    hosts = (config or {}).get("llm", {}).get("endpoints") or host.split(",")
+    return tuple(h.strip().rstrip("/") for h in hosts if h and h.strip())
+
+
+_router = None
+_hosts = None
+_router_lock = threading.Lock()
+
+
+def get_llm_client(host, config=None):
+    """Process-wide router over the Ollama endpoints for host and config
+    (see endpoint_hosts), rebuilt when they change. keep_alive follows the
+    `llm` section of config.yaml; each endpoint's connection pool is sized
+    once, from llm.concurrency when the router is made."""
+    global _router, _hosts
+    llm_config = (config or {}).get("llm", {})
+    hosts = endpoint_hosts(host, config)
+    with _router_lock:
+        if _router is None or hosts != _hosts:
+            if _router is not None:
+                _router.close()
+            max_connections = max(16, 4 * llm_config.get("concurrency", 1))
+            _router = LLMRouter(
+                [LLMClient(h, max_connections=max_connections) for h in hosts],
+                health_check_seconds=llm_config.get("health_check_seconds", 10),
+            )
+            _hosts = hosts
+        for endpoint in _router.endpoints:
+            endpoint.keep_alive = llm_config.get("keep_alive_seconds", 1800)
+        return _router
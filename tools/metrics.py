@@ -0,0 +1,192 @@
+# tools/metrics.py
+
+import threading
+import time
+
+SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+RATE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# name: (type, help, buckets)
+METRICS = {
+    "jobbot_node_seconds": ("histogram", "Wall time of each graph node.", SECONDS_BUCKETS),
+    "jobbot_browser_start_seconds": ("histogram", "Chrome start plus LinkedIn login check.", SECONDS_BUCKETS),
+    "jobbot_page_load_seconds": ("histogram", "Search page load until job cards are present.", SECONDS_BUCKETS),
+    "jobbot_card_click_seconds": ("histogram", "Scrolling to and clicking one job card.", SECONDS_BUCKETS),
+    "jobbot_description_wait_seconds": ("histogram", "Wait for a job description after the click.", SECONDS_BUCKETS),
+    "jobbot_rate_limit_wait_seconds": ("histogram", "Time a scraper request queued for the shared rate limit.", SECONDS_BUCKETS),
+    "jobbot_llm_warm_up_seconds": ("histogram", "Loading a model into Ollama before the first run.", SECONDS_BUCKETS),
+    "jobbot_llm_endpoint_requests_total": ("counter", "LLM calls per Ollama endpoint and outcome.", None),
+    "jobbot_llm_seconds": ("histogram", "Latency of one LLM call.", SECONDS_BUCKETS),
+    "jobbot_llm_tokens_per_second": ("histogram", "Output tokens per second of one LLM call.", RATE_BUCKETS),
+    "jobbot_llm_tokens_total": ("counter", "Tokens sent to and generated by the LLM.", None),
+    "jobbot_pdf_seconds": ("histogram", "PDF rendering and merging.", SECONDS_BUCKETS),
+    "jobbot_pdf_documents_total": ("counter", "Application PDFs rendered or taken from the cache.", None),
+}
+
+_enabled = False
+_lock = threading.Lock()
+_values = {}    # (name, labels) -> [count, sum, bucket counts] or counter value
+_traces = []
+
+
+def configure(config):
+    enable(config.get("metrics", {}).get("enabled", True))
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = bool(on)
+
+
+def enabled():
+    return _enabled
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def observe(name, value, **labels):
+    """Record one measurement of a histogram (e.g. seconds of a call)."""
+    if not _enabled:
+        return
+    buckets = METRICS[name][2]
+    now = time.time()
+    with _lock:
+        entry = _values.get(_key(name, labels))
+        if entry is None:
+            entry = _values[_key(name, labels)] = [0, 0.0, [0] * len(buckets)]
+        entry[0] += 1
+        entry[1] += value
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                entry[2][i] += 1
+        for trace in _traces:
+            trace.add(name, value, labels, now)
+
+
+def count(name, amount=1, **labels):
+    if not _enabled:
+        return
+    with _lock:
+        key = _key(name, labels)
+        _values[key] = _values.get(key, 0) + amount
+        for trace in _traces:
+            trace.add(name, amount, labels, None)
+
+
+class _Timer:
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
+        observe(self.name, self.seconds, **self.labels)
+        return False
+
+
+class _NoTimer:
+    seconds = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_TIMER = _NoTimer()
+
+
+def timer(name, **labels):
+    """`with timer("jobbot_pdf_seconds", stage="merge"): ...` observes the
+    block's wall time. Returns a shared no-op when metrics are disabled."""
+    if not _enabled:
+        return _NO_TIMER
+    return _Timer(name, labels)
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    with _lock:
+        values = {key: (list(v[:2]) + [list(v[2])] if isinstance(v, list) else v) for key, v in _values.items()}
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        series = sorted((labels, v) for (n, labels), v in values.items() if n == name)
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in series:
+            if kind == "counter":
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+                continue
+            total, value_sum, bucket_counts = value
+            for bound, bucket_count in zip(buckets, bucket_counts):
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', f'{bound:g}')])} {bucket_count}")
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {total}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {value_sum:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {total}")
+    return "\n".join(lines) + "\n"
+
+
+class Trace:
+    """Every measurement taken while the trace is open, in order, plus
+    per-metric totals. Used by the CLI to write one JSON file per run."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.events = []
+        self.seconds = None
+
+    def add(self, name, value, labels, ended_at):
+        event = {"metric": name, "value": round(value, 6), **labels, "thread": threading.current_thread().name}
+        if ended_at is not None:
+            event["start"] = round(ended_at - value - self.started_at, 6)
+        self.events.append(event)
+
+    def summary(self):
+        totals = {}
+        for event in self.events:
+            labels = {k: v for k, v in event.items() if k not in ("metric", "value", "thread", "start")}
+            key = event["metric"] + _format_labels(sorted(labels.items()))
+            entry = totals.setdefault(key, {"count": 0, "sum": 0.0})
+            entry["count"] += 1
+            entry["sum"] = round(entry["sum"] + event["value"], 6)
+        return totals
+
+    def to_dict(self, **info):
+        return {
+            **info,
+            "started_at": self.started_at,
+            "seconds": self.seconds,
+            "summary": self.summary(),
+            "events": self.events,
+        }
+
+
+def start_trace():
+    trace = Trace()
+    with _lock:
+        _traces.append(trace)
+    return trace
+
+
+def stop_trace(trace):
+    with _lock:
+        if trace in _traces:
+            _traces.remove(trace)
+    trace.seconds = round(time.time() - trace.started_at, 6)
+    return trace
@@ -0,0 +1,95 @@
+# tools/near_duplicates.py
+
+import re
+import threading
+import zlib
+
+import numpy as np
+
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+WORD = re.compile(r"\w+")
+
+
+def posting_text(job):
+    return " ".join(str(job.get(field) or "") for field in ("job_title", "company", "job_description"))
+
+
+def shingles(text, size=3):
+    """Hashes of the overlapping word `size`-grams of text."""
+    words = WORD.findall(text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return np.array(sorted({zlib.crc32(gram.encode("utf-8")) for gram in grams}), dtype=np.uint64)
+
+
+def lsh_bands(threshold, num_perm, recall=0.95):
+    """Split num_perm into bands x rows. Picks the most selective split
+    (most rows per band, fewest candidates to verify) under which a pair
+    with Jaccard similarity `threshold` still shares a band with
+    probability `recall`."""
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+
+    def hit_rate(option):
+        bands, rows = option
+        return 1 - (1 - threshold ** rows) ** bands
+
+    good = [option for option in options if hit_rate(option) >= recall]
+    if not good:
+        return max(options, key=hit_rate)
+    return max(good, key=lambda option: option[1])
+
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures of postings, bucketed by LSH bands, so each new
+    posting is only compared with the few earlier ones that share a band
+    instead of with all of them.
+    add() returns the key of an earlier posting whose estimated Jaccard
+    similarity is at least `threshold`, or None if the posting is new.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._signatures = {}
+        self._lock = threading.Lock()
+
+    def signature(self, text):
+        hashes = shingles(text)
+        if len(hashes) == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        # (a * x + b) mod p for every permutation and shingle, min per permutation.
+        with np.errstate(over="ignore"):
+            permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME & _MAX_HASH
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key, text):
+        signature = self.signature(text)
+        band_keys = self._band_keys(signature)
+        with self._lock:
+            if key in self._signatures:
+                return None
+            candidates = []
+            for bucket, band_key in zip(self._buckets, band_keys):
+                candidates.extend(bucket.get(band_key, ()))
+            for candidate in dict.fromkeys(candidates):
+                if np.mean(self._signatures[candidate] == signature) >= self.threshold:
+                    return candidate
+            self._signatures[key] = signature
+            for bucket, band_key in zip(self._buckets, band_keys):
+                bucket.setdefault(band_key, []).append(key)
+        return None
+
+    def add_job(self, job):
+        return self.add(job["job_link"], posting_text(job))
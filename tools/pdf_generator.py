@@ -1,108 +1,207 @@
-from weasyprint import HTML, CSS
-import pandas as pd
+import hashlib
+import html
+import io
 import os
+import re
+import tempfile
 
+from tools import metrics
+from tools.process_pool import process_pool
+from tools.records import Application, read_records
+
+# WeasyPrint, pypdf and reportlab are imported by the functions that use
+# them; WeasyPrint alone takes longer to import than the rest of the app.
+
+
+STYLE = """
+    @page {
+        size: A4;
+        margin: 2cm;
+    }
+    body {
+        font-family: Helvetica, Arial, sans-serif;
+        font-size: 11pt;
+        line-height: 1.5;
+        color: #333;
+    }
+    .job-entry {
+        margin-bottom: 30px;
+        padding-bottom: 20px;
+        border-bottom: 1px solid #ddd;
+    }
+    .job-title {
+        font-size: 14pt;
+        font-weight: bold;
+        color: #1a1a1a;
+        margin-bottom: 5px;
+    }
+    .company {
+        font-size: 12pt;
+        color: #555;
+        margin-bottom: 10px;
+    }
+    .cover-letter {
+        font-size: 11pt;
+        line-height: 1.6;
+        text-align: justify;
+        white-space: pre-wrap;
+    }
+    .date-applied {
+        font-size: 9pt;
+        color: #888;
+        margin-top: 10px;
+    }
+    h1 {
+        font-size: 18pt;
+        color: #0066cc;
+        margin-bottom: 20px;
+    }
+    .index li {
+        margin-bottom: 6px;
+    }
+"""
+
+
+def _document(body):
+    return (
+        '<!DOCTYPE html><html><head><meta charset="UTF-8">'
+        f"<style>{STYLE}</style></head><body>{body}</body></html>"
+    )
+
+
+def application_html(record):
+    parts = [
+        '<div class="job-entry">',
+        f'<div class="job-title">{html.escape(record.job_title or "Unknown Position")}</div>',
+        f'<div class="company">{html.escape(record.company or "Unknown Company")}</div>',
+        f'<div class="cover-letter">{html.escape(record.cover_letter)}</div>',
+    ]
+    if record.date_applied:
+        parts.append(f'<div class="date-applied">Applied: {html.escape(record.date_applied)}</div>')
+    parts.append("</div>")
+    return _document("".join(parts))
+
+
+def index_html(records):
+    items = "".join(
+        f"<li><b>{html.escape(r.job_title or 'Unknown Position')}</b> — "
+        f"{html.escape(r.company or 'Unknown Company')}</li>"
+        for r in records
+    )
+    return _document(f'<h1>Job Applications</h1><ol class="index">{items}</ol>')
+
+
+def _cache_path(document, cache_dir):
+    digest = hashlib.sha256(document.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.pdf")
+
+
+def _render_cached(document, cache_dir):
+    """Render an HTML document to a PDF under cache_dir, named by the hash of
+    the HTML, and return its path. Identical documents are rendered once."""
+    path = _cache_path(document, cache_dir)
+    if not os.path.exists(path):
+        from weasyprint import HTML
+
+        # A temp name of its own per call: threads of one process can
+        # render the same document at once.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        os.close(fd)
+        HTML(string=document).write_pdf(tmp_path)
+        os.replace(tmp_path, path)
+    return path
+
+
+def _slug(text, limit=40):
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(text or "")).strip("_")[:limit] or "untitled"
 
-def generate_pdf(input_csv="cover_letters.csv", output_pdf="final_applications.pdf"):
-    if not os.path.exists(input_csv):
-        raise FileNotFoundError(f"The file {input_csv} does not exist yet.")
 
-    df = pd.read_csv(input_csv)
-    
-    title_col = next((c for c in df.columns if 'title' in c.lower()), 'job_title')
-    comp_col = next((c for c in df.columns if 'company' in c.lower()), 'company')
-    letter_col = next((c for c in df.columns if 'letter' in c.lower()), 'cover_letter')
-    date_col = next((c for c in df.columns if 'date' in c.lower()), 'date_applied')
-    
-    html_content = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <style>
-            @page {
-                size: A4;
-                margin: 2cm;
-                @bottom-right {
-                    content: "Page " counter(page) " of " counter(pages);
-                    font-size: 10pt;
-                    font-family: Helvetica, Arial, sans-serif;
-                }
-            }
-            body {
-                font-family: Helvetica, Arial, sans-serif;
-                font-size: 11pt;
-                line-height: 1.5;
-                color: #333;
-            }
-            .job-entry {
-                margin-bottom: 30px;
-                padding-bottom: 20px;
-                border-bottom: 1px solid #ddd;
-                page-break-inside: avoid;
-            }
-            .job-title {
-                font-size: 14pt;
-                font-weight: bold;
-                color: #1a1a1a;
-                margin-bottom: 5px;
-            }
-            .company {
-                font-size: 12pt;
-                color: #555;
-                margin-bottom: 10px;
-            }
-            .cover-letter {
-                font-size: 11pt;
-                line-height: 1.6;
-                text-align: justify;
-                white-space: pre-wrap;
-            }
-            .date-applied {
-                font-size: 9pt;
-                color: #888;
-                margin-top: 10px;
-            }
-            h1 {
-                font-size: 18pt;
-                color: #0066cc;
-                margin-bottom: 20px;
-            }
-        </style>
-    </head>
-    <body>
-        <h1>Job Applications</h1>
+def _page_number_overlay(sizes):
+    from pypdf import PdfReader
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    total = len(sizes)
+    for number, (width, height) in enumerate(sizes, 1):
+        pdf.setPageSize((width, height))
+        pdf.setFont("Helvetica", 10)
+        # Bottom-right corner, inside the 2cm page margin.
+        pdf.drawRightString(width - 56.7, 28, f"Page {number} of {total}")
+        pdf.showPage()
+    pdf.save()
+    buffer.seek(0)
+    return PdfReader(buffer)
+
+
+def merge_pdfs(paths, output_pdf):
+    """Concatenate PDFs and stamp 'Page X of Y' over the combined document."""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for path in paths:
+        writer.append(path)
+
+    sizes = [(float(p.mediabox.width), float(p.mediabox.height)) for p in writer.pages]
+    overlay = _page_number_overlay(sizes)
+    for page, numbers in zip(writer.pages, overlay.pages):
+        page.merge_page(numbers)
+
+    with open(output_pdf, "wb") as f:
+        writer.write(f)
+    return output_pdf
+
+
+def render_applications(records, output_pdf="final_applications.pdf", per_job_dir=None,
+                        cache_dir="cache/pdf", workers=None):
     """
-    
-    for _, row in df.iterrows():
-        job_title = row.get(title_col, 'Unknown Position')
-        company = row.get(comp_col, 'Unknown Company')
-        cover_letter = row.get(letter_col, '')
-        date_applied = row.get(date_col, '')
-        
-        html_content += f"""
-        <div class="job-entry">
-            <div class="job-title">{job_title}</div>
-            <div class="company">{company}</div>
-            <div class="cover-letter">{cover_letter}</div>
-            {f'<div class="date-applied">Applied: {date_applied}</div>' if date_applied else ''}
-        </div>
-        """
-    
-    html_content += """
-    </body>
-    </html>
+    Render each Application to its own PDF (in parallel, reusing cached
+    renders of unchanged letters) and merge them behind an index page into
+    output_pdf. Returns the merged path and the per-application paths.
     """
-    
-    css = CSS(string="""
-        @page { size: A4; margin: 2cm; }
-    """)
-    
-    HTML(string=html_content).write_pdf(output_pdf, stylesheets=[css])
-    
+    os.makedirs(cache_dir, exist_ok=True)
+    documents = [index_html(records)] + [application_html(r) for r in records]
+
+    pending = [d for d in documents if not os.path.exists(_cache_path(d, cache_dir))]
+    metrics.count("jobbot_pdf_documents_total", len(pending), source="rendered")
+    metrics.count("jobbot_pdf_documents_total", len(documents) - len(pending), source="cache")
+    with metrics.timer("jobbot_pdf_seconds", stage="render"):
+        if len(pending) > 1 and workers != 1:
+            max_workers = min(len(pending), workers or os.cpu_count() or 1)
+            with process_pool(max_workers) as pool:
+                list(pool.map(_render_cached, pending, [cache_dir] * len(pending)))
+
+        paths = [_render_cached(d, cache_dir) for d in documents]
+    with metrics.timer("jobbot_pdf_seconds", stage="merge"):
+        merge_pdfs(paths, output_pdf)
+
+    job_pdfs = []
+    if per_job_dir:
+        os.makedirs(per_job_dir, exist_ok=True)
+        for name in os.listdir(per_job_dir):
+            if re.match(r"\d{3}_.*\.pdf$", name):
+                os.remove(os.path.join(per_job_dir, name))
+        for number, (record, path) in enumerate(zip(records, paths[1:]), 1):
+            name = f"{number:03d}_{_slug(record.company)}_{_slug(record.job_title)}.pdf"
+            target = os.path.join(per_job_dir, name)
+            with open(path, "rb") as src, open(target, "wb") as dst:
+                dst.write(src.read())
+            job_pdfs.append(target)
+
+    return output_pdf, job_pdfs
+
+
+def generate_pdf(input_csv="cover_letters.csv", output_pdf="final_applications.pdf", **kwargs):
+    """PDF from a cover_letters.csv saved by an earlier run. The graph
+    renders the letters it has in memory with render_applications()."""
+    if not os.path.exists(input_csv):
+        raise FileNotFoundError(f"The file {input_csv} does not exist yet.")
+
+    records = [Application.from_job(row) for row in read_records(input_csv)]
+    output_pdf, _ = render_applications(records, output_pdf, **kwargs)
     return output_pdf
 
 
 if __name__ == "__main__":
     result = generate_pdf()
-    print(f"✅ PDF generated: {result}")
\ No newline at end of file
+    print(f"✅ PDF generated: {result}")
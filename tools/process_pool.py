@@ -0,0 +1,17 @@
+# tools/process_pool.py
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def process_pool(max_workers):
+    """
+    A ProcessPoolExecutor whose workers do not start as forks of this
+    process. Pools are created from web run-worker threads while other
+    threads (SQLite, metrics, warm-up, health checks) may hold locks, and a
+    forked child would inherit those locks held forever. forkserver forks
+    from a clean single-threaded server; Windows, which has no forkserver,
+    always spawns.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(method))
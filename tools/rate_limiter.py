@@ -0,0 +1,84 @@
+# tools/rate_limiter.py
+
+import random
+import threading
+import time
+
+from tools import metrics
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every scraping thread of the process: requests
+    to the site start on average `interval` seconds apart, however many
+    searches and browsers are running. Time a caller already spent (a page
+    load, parsing) counts toward the next slot, so nobody waits for a slot
+    that has already come; after an idle spell up to `burst` requests may
+    start back to back. jitter spreads each slot by ±that fraction of the
+    interval so the pace does not look machine-made.
+    """
+
+    def __init__(self, interval, burst=1, jitter=0.0):
+        self.interval = max(0.0, interval)
+        self.burst = max(1, int(burst))
+        self.jitter = min(max(0.0, jitter), 1.0)
+        # Theoretical arrival time: when the bucket will be empty again.
+        self._tat = 0.0
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._waited = 0.0
+
+    def acquire(self):
+        """Block until this request may start. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            start = max(now, tat - (self.burst - 1) * self.interval)
+            self._tat = tat + self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            waited = start - now
+            self._requests += 1
+            self._waited += waited
+        if waited > 0:
+            time.sleep(waited)
+        metrics.observe("jobbot_rate_limit_wait_seconds", waited)
+        return waited
+
+    def back_off(self, seconds):
+        """Hold every request off for at least `seconds`, e.g. after a 429."""
+        with self._lock:
+            self._tat = max(self._tat, time.monotonic() + seconds + (self.burst - 1) * self.interval)
+
+    def stats(self):
+        with self._lock:
+            return {"requests": self._requests, "waited_seconds": self._waited}
+
+
+def limiter_settings(config):
+    """(interval, burst, jitter) from the `scraping` section of config.yaml.
+    Without requests_per_minute the rate follows the old per-click delays:
+    one request per (min_delay + max_delay) / 2 seconds on average."""
+    scraping_config = config.get("scraping", {})
+    min_delay = scraping_config.get("min_delay_seconds", 2.0)
+    max_delay = max(min_delay, scraping_config.get("max_delay_seconds", 4.0))
+    interval = (min_delay + max_delay) / 2
+    jitter = (max_delay - min_delay) / (max_delay + min_delay) if interval else 0.0
+    per_minute = scraping_config.get("requests_per_minute")
+    if per_minute:
+        interval = 60.0 / per_minute
+    return interval, scraping_config.get("burst", 1), jitter
+
+
+_limiter = None
+_settings = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter(config):
+    """Process-wide limiter for the `scraping` section of config.yaml,
+    rebuilt when its settings change."""
+    global _limiter, _settings
+    settings = limiter_settings(config)
+    with _limiter_lock:
+        if _limiter is None or settings != _settings:
+            _limiter, _settings = RateLimiter(*settings), settings
+        return _limiter
@@ -0,0 +1,105 @@
+# tools/records.py
+
+import csv
+from dataclasses import asdict, dataclass, fields
+from typing import Optional
+
+JOB_FIELDS = ("job_title", "company", "job_link", "job_description", "date_applied", "status")
+
+
+@dataclass(slots=True)
+class Application:
+    """A scraped job with the cover letter written for it. The letter node
+    hands these to the PDF node in graph state; the CSV files are written
+    from them and only read back by the web app."""
+
+    job_title: str = ""
+    company: str = ""
+    job_link: str = ""
+    job_description: str = ""
+    date_applied: str = ""
+    status: str = ""
+    relevance: Optional[float] = None
+    cover_letter: str = ""
+
+    @classmethod
+    def from_job(cls, job, cover_letter=""):
+        """From a job dict as the scrapers return it, ignoring unknown keys.
+        Missing values and the "" of a CSV cell become the defaults."""
+        values = {}
+        for field in fields(cls):
+            value = job.get(field.name)
+            if value is None or value == "":
+                continue
+            values[field.name] = float(value) if field.name == "relevance" else str(value)
+        if cover_letter:
+            values["cover_letter"] = cover_letter
+        return cls(**values)
+
+    def as_dict(self):
+        return asdict(self)
+
+
+APPLICATION_FIELDS = tuple(field.name for field in fields(Application))
+
+
+class RecordWriter:
+    """
+    Writes records to a CSV file one row at a time as they are produced,
+    flushing each, so the file is readable (by the results page) while a
+    run is still going and nothing needs the whole set in memory to save
+    it. Records may be dicts or Applications; missing fields are left
+    empty and unknown keys are dropped. A lazy writer only replaces the
+    file when the first record comes, so with nothing to write the
+    previous file is left alone.
+    """
+
+    def __init__(self, path, fieldnames=APPLICATION_FIELDS, lazy=False):
+        self.path = path
+        self.fieldnames = fieldnames
+        self.count = 0
+        self._file = None
+        if not lazy:
+            self._open()
+
+    def _open(self):
+        self._file = open(self.path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore")
+        self._writer.writeheader()
+        self._file.flush()
+
+    def write(self, record):
+        if self._file is None:
+            self._open()
+        if isinstance(record, Application):
+            record = record.as_dict()
+        self._writer.writerow({key: value for key, value in record.items() if value is not None})
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_records(path, records, fieldnames=APPLICATION_FIELDS):
+    with RecordWriter(path, fieldnames) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.count
+
+
+def read_records(path):
+    """Rows of a CSV written by RecordWriter as dicts of strings, or [] if
+    the file does not exist or cannot be parsed."""
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+    except (OSError, csv.Error, UnicodeDecodeError):
+        return []
@@ -1,33 +1,91 @@
-import pdfplumber
-from docx import Document
+import hashlib
 import os
+import tempfile
 
-def parse_resume(file_path: str) -> dict:
+from tools.process_pool import process_pool
+
+# pdfplumber and python-docx are imported by the function for their format.
+
+
+def _file_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _extract_pages(file_path, start, stop):
+    """Text of pages [start, stop) of a PDF. Runs in a worker process, so it
+    opens the file itself."""
+    import pdfplumber
+
+    with pdfplumber.open(file_path) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages[start:stop]]
+
+
+def _pdf_text(file_path, workers=None, parallel_min_pages=8):
+    import pdfplumber
+
+    with pdfplumber.open(file_path) as pdf:
+        page_count = len(pdf.pages)
+        workers = min(workers or os.cpu_count() or 1, page_count)
+        if page_count < parallel_min_pages or workers < 2:
+            pages = [page.extract_text() or "" for page in pdf.pages]
+            return "\n".join(p for p in pages if p)
+
+    # Each worker extracts one contiguous range of pages.
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+    with process_pool(workers) as pool:
+        chunks = pool.map(_extract_pages, [file_path] * workers, bounds[:-1], bounds[1:])
+        pages = [page for chunk in chunks for page in chunk]
+    return "\n".join(p for p in pages if p)
+
+
+def _docx_text(file_path):
+    from docx import Document
+
+    return "\n".join(para.text for para in Document(file_path).paragraphs)
+
+
+def parse_resume(file_path: str, cache_dir=None, workers=None, parallel_min_pages=8) -> dict:
     """
     Extract raw text from a resume file and return structured data.
     Supports PDF and DOCX.
+    PDFs with at least parallel_min_pages pages are split across `workers`
+    processes. With cache_dir, the text is stored under the hash of the
+    file's content, so the same file is only parsed once.
     """
 
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Resume not found: {file_path}")
 
-    text = ""
-
-    if file_path.lower().endswith(".pdf"):
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+    is_pdf = file_path.lower().endswith(".pdf")
+    if not is_pdf and not file_path.lower().endswith(".docx"):
+        raise ValueError("Unsupported resume format. Use PDF or DOCX.")
 
-    elif file_path.lower().endswith(".docx"):
-        doc = Document(file_path)
-        for para in doc.paragraphs:
-            text += para.text + "\n"
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, f"{_file_hash(file_path)}.txt")
+        if os.path.exists(cache_path):
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return {"raw_text": f.read()}
 
+    if is_pdf:
+        text = _pdf_text(file_path, workers, parallel_min_pages)
     else:
-        raise ValueError("Unsupported resume format. Use PDF or DOCX.")
+        text = _docx_text(file_path)
+    text = text.strip()
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        # A temp file of its own: threads of one process can parse the same
+        # resume at once.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, cache_path)
 
     return {
-        "raw_text": text.strip()
+        "raw_text": text
     }
@@ -0,0 +1,142 @@
+# tools/resume_sections.py
+
+import json
+import re
+
+RESUME_KEYS = ("name", "education", "skills", "projects", "experience", "summary")
+
+SECTION_WORDS = {
+    "summary", "profile", "objective", "about", "education", "experience", "experiences", "employment",
+    "work", "history", "career", "skills", "competencies", "expertise", "projects", "publications",
+    "research", "teaching", "certifications", "certificates", "awards", "honors", "honours", "languages",
+    "interests", "volunteering", "volunteer", "activities", "references", "courses", "coursework",
+    "training", "achievements", "grants", "presentations", "talks", "patents", "leadership",
+    "memberships", "affiliations", "qualifications", "positions", "appointments", "service",
+}
+FILLER_WORDS = {
+    "and", "&", "of", "professional", "technical", "relevant", "selected", "academic", "key", "core",
+    "other", "additional", "personal", "work", "industry", "teaching", "conference", "journal",
+}
+
+
+def is_heading(line):
+    """A line like "Experience", "WORK HISTORY" or "Technical Skills:" that
+    starts a resume section. Lines such as "Research Assistant" are not."""
+    words = re.findall(r"[a-z&]+", line.strip().rstrip(":").lower())
+    if not words or len(words) > 5 or len(line.strip()) > 50:
+        return False
+    return all(w in SECTION_WORDS or w in FILLER_WORDS for w in words) and any(w in SECTION_WORDS for w in words)
+
+
+def split_sections(text):
+    """[(heading, text)] in order; the lines before the first heading
+    (name, contact details) come first with an empty heading."""
+    sections = [("", [])]
+    for line in text.splitlines():
+        if is_heading(line):
+            sections.append((line.strip().rstrip(":"), [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(heading, "\n".join(lines).strip()) for heading, lines in sections if "\n".join(lines).strip()]
+
+
+def _split_long(heading, text, max_chars):
+    # Cut at line breaks; each later piece is labelled with its section so
+    # the model knows what it is reading.
+    pieces, current = [], ""
+    for line in text.splitlines():
+        while len(line) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if current and len(current) + 1 + len(line) > max_chars:
+            pieces.append(current)
+            current = f"{heading} (continued)" if heading else ""
+        current = f"{current}\n{line}" if current else line
+    if current.strip():
+        pieces.append(current)
+    return pieces
+
+
+def chunk_resume(text, max_chars=6000):
+    """Split a resume into chunks of at most about max_chars, at section
+    boundaries where possible. Neighbouring short sections share a chunk;
+    a section longer than max_chars is cut at line breaks. A resume that
+    fits is returned whole."""
+    if not max_chars or len(text) <= max_chars:
+        return [text]
+    pieces = []
+    for heading, section in split_sections(text):
+        pieces.extend(_split_long(heading, section, max_chars) if len(section) > max_chars else [section])
+
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + 2 + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def unfence(text):
+    """The inside of the first code fence in text, or text itself."""
+    fence = FENCE.search(text)
+    return fence.group(1).strip() if fence else text
+
+
+def load_resume_json(text):
+    """The JSON object in a model's answer, also when it is wrapped in a
+    code fence or prose. None if there is none."""
+    text = str(text or "").strip()
+    candidates = [text, unfence(text)]
+    if "{" in text:
+        candidates.append(text[text.index("{"):text.rindex("}") + 1])
+    for candidate in candidates:
+        try:
+            data = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def _identity(item):
+    if isinstance(item, str):
+        return " ".join(item.lower().split())
+    return json.dumps(item, sort_keys=True)
+
+
+def merge_resumes(parts):
+    """
+    One structured resume from the partial ones extracted chunk by chunk,
+    in chunk order. Lists (education, skills, ...) are concatenated without
+    repeats; for text fields (name, summary) the first non-empty value
+    wins, which is the top of the resume. Every RESUME_KEYS key is present.
+    """
+    merged = {key: [] for key in RESUME_KEYS}
+    merged["name"] = merged["summary"] = ""
+    seen = {}
+    for part in parts:
+        for key, value in part.items():
+            if isinstance(value, str) and isinstance(merged.get(key), list):
+                value = [value]
+            if isinstance(value, list):
+                if not isinstance(merged.get(key), list):
+                    merged[key] = []
+                known = seen.setdefault(key, set())
+                for item in value:
+                    if item in ("", None) or _identity(item) in known:
+                        continue
+                    known.add(_identity(item))
+                    merged[key].append(item)
+            elif value not in ("", None) and not merged.get(key):
+                merged[key] = value
+    return merged